@@ -1,6 +1,7 @@
 from collections.abc import Collection
 from contextlib import contextmanager
 from copy import copy
+from dataclasses import dataclass
 from typing import Optional
 
 import attrs
@@ -143,6 +144,67 @@ def test_asdict_unknown_fields():
         assert adapter.asdict() == input_dict
 
 
+def test_adapter_asdict():
+    product = Product(**_PRODUCT_ALL_KWARGS)
+    with configured_adapter():
+        expected = ItemAdapter(product).asdict()
+    assert ZyteItemAdapter(product).asdict() == expected
+
+    input_dict = dict(
+        a={"b": 1, "c": 2},
+        additionalProperties=[{"name": "a", "value": "b", "max": 10}],
+        aggregateRating={"ratingValue": 4.5, "reviewCount": 10},
+        name="Foo",
+        url="https://example.com/",
+    )
+    product = Product.from_dict(input_dict)
+    adapter = ZyteItemAdapter(product)
+    assert adapter.asdict() == input_dict
+    assert adapter.asdict(fields="url") == {"url": "https://example.com/"}
+    assert adapter.asdict(
+        fields=[
+            "a.b",
+            "additionalProperties.max",
+            "aggregateRating.ratingValue",
+            "brand",
+            "name",
+        ]
+    ) == {
+        "a": {"b": 1},
+        "additionalProperties": [{"max": 10}],
+        "aggregateRating": {"ratingValue": 4.5},
+        "name": "Foo",
+    }
+    assert adapter.asdict(fields=[]) == {}
+
+    item = attrs.evolve(product, aggregateRating=None, additionalProperties=[])
+    item._unknown_fields_dict = {}
+    assert ZyteItemKeepEmptyAdapter(item).asdict(
+        fields=["aggregateRating", "additionalProperties"]
+    ) == {"additionalProperties": [], "aggregateRating": None}
+
+
+def test_asdict_dataclass():
+    @dataclass
+    class Size:
+        width: int
+        height: int
+
+    product = Product.from_dict(
+        {"url": "https://example.com/", "size": Size(1, 2), "sizes": [Size(3, 4)]}
+    )
+    adapter = ZyteItemAdapter(product)
+    assert adapter.asdict() == {
+        "url": "https://example.com/",
+        "size": {"width": 1, "height": 2},
+        "sizes": [{"width": 3, "height": 4}],
+    }
+    assert adapter.asdict(fields=["size.width", "sizes.height"]) == {
+        "size": {"width": 1},
+        "sizes": [{"height": 4}],
+    }
+
+
 def test_field_meta():
     metadata = {"b": "c"}
 
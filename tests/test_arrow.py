@@ -0,0 +1,160 @@
+import io
+import json
+from typing import List, Optional
+
+import attrs
+import pytest
+
+from zyte_common_items import (
+    Article,
+    Brand,
+    CustomAttributes,
+    Image,
+    Product,
+    ProductMetadata,
+)
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from zyte_common_items.arrow import (
+    get_arrow_schema,
+    iter_record_batches,
+    to_record_batch,
+    write_parquet,
+)
+from zyte_common_items.base import Item
+
+
+def _products():
+    product = Product.from_dict(
+        {
+            "url": "https://example.com/1",
+            "name": "Foo",
+            "price": "1.00",
+            "brand": {"name": "Bar", "logo": "unknown"},
+            "aggregateRating": {"ratingValue": 4.5, "reviewCount": 3},
+            "images": [{"url": "https://example.com/1.png"}],
+            "gtin": [{"type": "ean13", "value": "9780201379624"}],
+            "metadata": {
+                "probability": 0.9,
+                "validationMessages": {"name": ["too short"]},
+            },
+            "foo": {"bar": [1]},
+        }
+    )
+    return [product, Product(url="https://example.com/2")]
+
+
+def test_schema():
+    schema = get_arrow_schema(Product)
+    assert schema.names[:-1] == [field.name for field in attrs.fields(Product)]
+    assert schema.names[-1] == "_unknown_fields"
+    assert schema.field("url").type == pa.string()
+    assert schema.field("brand").type == pa.struct(
+        [pa.field("name", pa.string()), pa.field("_unknown_fields", pa.string())]
+    )
+    assert schema.field("aggregateRating").type.field("ratingValue").type == (
+        pa.float64()
+    )
+    assert schema.field("aggregateRating").type.field("reviewCount").type == (
+        pa.int64()
+    )
+    image_type = pa.struct(list(get_arrow_schema(Image)))
+    assert schema.field("mainImage").type == image_type
+    assert schema.field("images").type == pa.list_(image_type)
+    assert get_arrow_schema(ProductMetadata).field("validationMessages").type == (
+        pa.map_(pa.string(), pa.list_(pa.string()))
+    )
+    assert get_arrow_schema(CustomAttributes).field("values").type == pa.string()
+    assert get_arrow_schema(Brand) == get_arrow_schema(Brand)
+
+
+def test_record_batch():
+    batch = to_record_batch(_products())
+    assert batch.schema == get_arrow_schema(Product)
+    assert batch.num_rows == 2
+    rows = batch.to_pylist()
+    assert rows[0]["name"] == "Foo"
+    assert rows[0]["brand"] == {
+        "name": "Bar",
+        "_unknown_fields": json.dumps({"logo": "unknown"}),
+    }
+    assert rows[0]["aggregateRating"]["ratingValue"] == 4.5
+    assert rows[0]["images"] == [
+        {"url": "https://example.com/1.png", "_unknown_fields": None}
+    ]
+    assert rows[0]["gtin"][0]["value"] == "9780201379624"
+    assert rows[0]["metadata"]["validationMessages"] == [("name", ["too short"])]
+    assert json.loads(rows[0]["_unknown_fields"]) == {"foo": {"bar": [1]}}
+    assert rows[1]["url"] == "https://example.com/2"
+    assert rows[1]["brand"] is None
+    assert rows[1]["images"] is None
+    assert rows[1]["_unknown_fields"] is None
+
+
+def test_record_batch_item_cls():
+    batch = to_record_batch([], item_cls=Article)
+    assert batch.num_rows == 0
+    assert batch.schema == get_arrow_schema(Article)
+    with pytest.raises(ValueError):
+        to_record_batch([])
+    with pytest.raises(ValueError):
+        to_record_batch(_products(), item_cls=Article)
+
+
+def test_iter_record_batches():
+    products = _products() * 3
+    batches = list(iter_record_batches(iter(products), batch_size=4))
+    assert [batch.num_rows for batch in batches] == [4, 2]
+
+
+@pytest.mark.parametrize("count", [0, 5])
+def test_write_parquet(count):
+    products = (_products() * 3)[:count]
+    output = io.BytesIO()
+    assert (
+        write_parquet(iter(products), output, item_cls=Product, batch_size=2) == count
+    )
+    output.seek(0)
+    parquet_file = pq.ParquetFile(output)
+    assert parquet_file.schema_arrow == get_arrow_schema(Product)
+    assert parquet_file.metadata.num_rows == count
+    assert parquet_file.metadata.num_row_groups == (count + 1) // 2
+    table = parquet_file.read()
+    assert table.to_pylist() == to_record_batch(products, item_cls=Product).to_pylist()
+
+
+def test_write_parquet_no_items():
+    with pytest.raises(ValueError):
+        write_parquet([], io.BytesIO())
+
+
+@attrs.define(kw_only=True)
+class Category(Item):
+    name: str
+    parent: Optional["Category"] = None
+    children: List["Category"] = attrs.Factory(list)
+    brand: Optional[Brand] = None
+
+
+def test_recursive_item_class():
+    schema = get_arrow_schema(Category)
+    assert schema.field("parent").type == pa.string()
+    assert schema.field("children").type == pa.list_(pa.string())
+    assert schema.field("brand").type == pa.struct(list(get_arrow_schema(Brand)))
+
+    category = Category(
+        name="b",
+        parent=Category(name="a", brand=Brand(name="x")),
+        children=[Category(name="c")],
+    )
+    row = to_record_batch([category]).to_pylist()[0]
+    assert json.loads(row["parent"]) == {"name": "a", "brand": {"name": "x"}}
+    assert [json.loads(child) for child in row["children"]] == [{"name": "c"}]
+
+    from zyte_common_items.ae import AEProduct
+
+    assert get_arrow_schema(AEProduct).field("hasVariants").type == (
+        pa.list_(pa.string())
+    )
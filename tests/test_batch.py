@@ -0,0 +1,136 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from zyte_common_items import AggregateRating, Product, ProductFromList
+
+np = pytest.importorskip("numpy")
+
+from zyte_common_items.batch import ProductBatch
+
+PRODUCTS: List[Dict[str, Any]] = [
+    {
+        "url": "https://a.example",
+        "price": "8.00",
+        "regularPrice": "10.00",
+        "currency": "USD",
+        "availability": "InStock",
+        "aggregateRating": {"ratingValue": 4.5, "bestRating": 5, "reviewCount": 10},
+    },
+    {
+        "url": "https://b.example",
+        "price": "foo",
+        "currency": "EUR",
+        "availability": "OutOfStock",
+    },
+    {
+        "url": "https://c.example",
+        "price": "3.333",
+        "regularPrice": "0",
+        "aggregateRating": {"ratingValue": 3},
+    },
+]
+
+
+def test_arrays():
+    batch = ProductBatch(PRODUCTS)
+    assert len(batch) == 3
+    np.testing.assert_array_equal(batch.price, [8.0, np.nan, 3.333])
+    np.testing.assert_array_equal(batch.price_valid, [True, False, True])
+    np.testing.assert_array_equal(batch.price_scaled, [800, 0, 333])
+    assert batch.price_scaled.dtype == np.int64
+    np.testing.assert_array_equal(batch.regularPrice, [10.0, np.nan, 0.0])
+    np.testing.assert_array_equal(batch.regularPrice_valid, [True, False, True])
+    assert batch.currency_categories == ("EUR", "USD")
+    np.testing.assert_array_equal(batch.currency, [1, 0, -1])
+    assert batch.availability_categories == ("InStock", "OutOfStock")
+    np.testing.assert_array_equal(batch.availability, [0, 1, -1])
+    assert [batch.get_currency(i) for i in range(3)] == ["USD", "EUR", None]
+    assert batch.get_availability(1) == "OutOfStock"
+    np.testing.assert_array_equal(batch.ratingValue, [4.5, np.nan, 3.0])
+    np.testing.assert_array_equal(batch.bestRating, [5.0, np.nan, np.nan])
+    np.testing.assert_array_equal(batch.reviewCount, [10, -1, -1])
+    np.testing.assert_allclose(batch.discount(), [0.2, np.nan, np.nan])
+
+    batch = ProductBatch(PRODUCTS, scale=3)
+    np.testing.assert_array_equal(batch.price_scaled, [8000, 0, 3333])
+
+
+def test_items():
+    products: List[Any] = [
+        Product(
+            url="https://a.example",
+            price="1.50",
+            aggregateRating=AggregateRating(reviewCount=2),
+        ),
+        PRODUCTS[0],
+    ]
+    batch = ProductBatch(products)
+    np.testing.assert_array_equal(batch.price, [1.5, 8.0])
+    np.testing.assert_array_equal(batch.reviewCount, [2, 10])
+    assert batch[0] is products[0]
+    item = batch[1]
+    assert isinstance(item, Product)
+    assert item.url == "https://a.example"
+    assert batch[-1] is item
+    assert list(batch) == [products[0], item]
+
+    batch = ProductBatch(
+        [{"url": "https://a.example", "price": "1.00"}], item_cls=ProductFromList
+    )
+    assert isinstance(batch[0], ProductFromList)
+    np.testing.assert_array_equal(batch.availability, [-1])
+    assert batch.availability_categories == ()
+
+
+def test_filter_and_sort():
+    batch = ProductBatch(PRODUCTS)
+    subset = batch.filter(batch.price_valid)
+    assert [product.url for product in subset] == [
+        "https://a.example",
+        "https://c.example",
+    ]
+    np.testing.assert_array_equal(subset.price_scaled, [800, 333])
+    assert subset.currency_categories == batch.currency_categories
+    assert subset[1] is batch[2]
+    assert [product.url for product in batch[1:]] == [
+        "https://b.example",
+        "https://c.example",
+    ]
+
+    def urls(batch):
+        return [product.url[8] for product in batch]
+
+    assert urls(batch.sort("price")) == ["c", "a", "b"]
+    assert urls(batch.sort("price", descending=True)) == ["a", "c", "b"]
+    assert urls(batch.sort("currency")) == ["b", "a", "c"]
+    assert urls(batch.sort("reviewCount", descending=True)) == ["a", "b", "c"]
+    assert urls(batch.sort("price_valid")) == ["b", "a", "c"]
+    np.testing.assert_array_equal(batch.argsort("ratingValue"), [2, 0, 1])
+    with pytest.raises(ValueError):
+        batch.argsort("url")
+
+
+def test_empty():
+    batch = ProductBatch([])
+    assert len(batch) == 0
+    assert batch.price.shape == (0,)
+    assert batch.currency_categories == ()
+    assert len(batch.sort("price")) == 0
+
+
+def test_out_of_range():
+    batch = ProductBatch(
+        [
+            {"url": "https://a.example", "price": "1e17"},
+            {"url": "https://b.example", "price": "1e16"},
+            {
+                "url": "https://c.example",
+                "aggregateRating": {"reviewCount": 10**20},
+            },
+        ]
+    )
+    np.testing.assert_array_equal(batch.price_valid, [False, True, False])
+    np.testing.assert_array_equal(batch.price_scaled, [0, 10**18, 0])
+    assert np.isnan(batch.price[0])
+    np.testing.assert_array_equal(batch.reviewCount, [-1, -1, -1])
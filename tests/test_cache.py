@@ -0,0 +1,239 @@
+from copy import copy
+
+import attrs
+import pytest
+from web_poet import HttpResponse, PageParams, RequestUrl, Returns, field
+
+from zyte_common_items import (
+    BaseProductPage,
+    CustomAttributes,
+    CustomAttributesMetadata,
+    CustomAttributesValues,
+    Page,
+    Product,
+    ProductPage,
+    ZyteItemAdapter,
+)
+from zyte_common_items.cache import (
+    ExtractionCache,
+    disable_extraction_cache,
+    enable_extraction_cache,
+    get_extraction_cache,
+)
+
+HTML = b"""
+<!DOCTYPE html>
+<html>
+    <body>
+        <h1>Foo</h1>
+        <div class="price">$13.2</div>
+    </body>
+</html>
+"""
+
+calls = []
+
+
+class CustomProductPage(ProductPage):
+    @field
+    def name(self):
+        calls.append(self.url)
+        return self.css("h1::text").get()
+
+    @field
+    def price(self):
+        return self.css(".price")
+
+
+class OtherProductPage(CustomProductPage):
+    pass
+
+
+class RequestUrlPage(BaseProductPage):
+    @field
+    def name(self):
+        calls.append(self.url)
+        return "Foo"
+
+
+@attrs.define
+class PageParamsProductPage(CustomProductPage):
+    page_params: PageParams
+
+
+class CustomAttributesPage(Page, Returns[CustomAttributes], skip_nonitem_fields=True):
+    @field
+    def values(self):
+        calls.append(self.url)
+        return CustomAttributesValues()
+
+    @field
+    def metadata(self):
+        return CustomAttributesMetadata()
+
+
+class UnserializablePage(CustomAttributesPage):
+    @field
+    def values(self):
+        calls.append(self.url)
+        return CustomAttributesValues({"foo": object()})
+
+
+def _page(page_cls=CustomProductPage, url="https://example.com", body=HTML):
+    return page_cls(response=HttpResponse(url=url, body=body))
+
+
+@pytest.mark.asyncio
+async def test_extraction_cache(tmp_path):
+    calls.clear()
+    assert get_extraction_cache() is None
+    expected_item = await _page().to_item()
+    assert len(calls) == 1
+
+    path = str(tmp_path / "cache.sqlite3")
+    cache = enable_extraction_cache(path=path)
+    try:
+        assert get_extraction_cache() is cache
+        item = await _page().to_item()
+        assert cache.misses == 1
+        assert cache.hits == 0
+        cached_item = await _page().to_item()
+        assert cache.hits == 1
+        assert len(calls) == 2
+
+        await _page(url="https://example.com/other").to_item()
+        await _page(body=HTML + b" ").to_item()
+        await _page(OtherProductPage).to_item()
+        assert cache.misses == 4
+        assert len(calls) == 5
+        assert len(cache) == 4
+
+        await RequestUrlPage(request_url=RequestUrl("https://example.com")).to_item()
+        assert cache.misses == 4
+        assert len(calls) == 6
+
+        # Pages with inputs that are not part of the key are not cached.
+        for _ in range(2):
+            await PageParamsProductPage(
+                response=HttpResponse(url="https://example.com", body=HTML),
+                page_params=PageParams({"foo": "bar"}),
+            ).to_item()
+        assert cache.misses == 4
+        assert len(calls) == 8
+    finally:
+        assert disable_extraction_cache() is cache
+    assert get_extraction_cache() is None
+
+    assert type(cached_item) is Product
+    assert cached_item == Product.from_dict(ZyteItemAdapter(item).asdict())
+    assert cached_item.metadata is not None
+    assert expected_item.metadata is not None
+    assert cached_item.metadata.dateDownloaded is not None
+    cached_item.metadata.dateDownloaded = expected_item.metadata.dateDownloaded
+    assert ZyteItemAdapter(cached_item).asdict() == (
+        ZyteItemAdapter(expected_item).asdict()
+    )
+    assert cached_item.price == "13.20"
+    cache.close()
+
+    # The cache persists on disk.
+    cache = enable_extraction_cache(ExtractionCache(path))
+    try:
+        await _page().to_item()
+    finally:
+        disable_extraction_cache()
+        cache.close()
+    assert cache.hits == 1
+    assert len(calls) == 8
+
+
+@pytest.mark.asyncio
+async def test_extraction_cache_empty_required_field():
+    calls.clear()
+    cache = enable_extraction_cache()
+    try:
+        item = await _page(CustomAttributesPage).to_item()
+        cached_item = await _page(CustomAttributesPage).to_item()
+    finally:
+        disable_extraction_cache()
+        cache.close()
+    assert cache.hits == 1
+    assert len(calls) == 1
+    assert cached_item == item
+    assert cached_item.values == {}
+
+
+@pytest.mark.asyncio
+async def test_extraction_cache_unserializable():
+    calls.clear()
+    cache = enable_extraction_cache()
+    try:
+        await _page(UnserializablePage).to_item()
+        await _page(UnserializablePage).to_item()
+        assert len(cache) == 0
+    finally:
+        disable_extraction_cache()
+        cache.close()
+    assert cache.misses == 2
+    assert len(calls) == 2
+
+
+def test_eviction():
+    cache = ExtractionCache(max_size=100)
+    for index in range(10):
+        cache.set(b"%d" % index, {"url": "https://example.com", "index": index})
+    assert cache.size <= 100
+    assert 0 < len(cache) < 10
+    assert cache.get(b"9") == {"url": "https://example.com", "index": 9}
+    assert cache.get(b"0") is None
+    cache.set(b"9", {"url": "https://example.com", "index": 10})
+    assert cache.get(b"9") == {"url": "https://example.com", "index": 10}
+    assert cache.to_stats() == {
+        "extraction_cache/hits": 2,
+        "extraction_cache/misses": 1,
+        "extraction_cache/size": cache.size,
+    }
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+    cache.close()
+
+    with pytest.raises(ValueError):
+        ExtractionCache(max_size=0)
+
+
+@pytest.mark.asyncio
+async def test_extraction_cache_addon(tmp_path, monkeypatch):
+    pytest.importorskip("scrapy", minversion="2.10")
+    from itemadapter import ItemAdapter
+    from scrapy.exceptions import NotConfigured
+    from scrapy.utils.test import get_crawler
+
+    from zyte_common_items import Addon
+    from zyte_common_items._addon import _ExtractionCacheExtension
+
+    # The add-on changes the global itemadapter configuration.
+    monkeypatch.setattr(
+        ItemAdapter, "ADAPTER_CLASSES", copy(ItemAdapter.ADAPTER_CLASSES)
+    )
+    crawler = get_crawler(settings_dict={"ADDONS": {Addon: 400}})
+    assert _ExtractionCacheExtension in crawler.settings.getdict("EXTENSIONS")
+    with pytest.raises(NotConfigured):
+        _ExtractionCacheExtension.from_crawler(crawler)
+
+    crawler = get_crawler(
+        settings_dict={
+            "ADDONS": {Addon: 400},
+            "ZYTE_COMMON_ITEMS_EXTRACTION_CACHE": str(tmp_path / "cache.sqlite3"),
+        }
+    )
+    extension = _ExtractionCacheExtension.from_crawler(crawler)
+    extension.spider_opened(None)
+    await _page().to_item()
+    await _page().to_item()
+    extension.spider_closed(None)
+    assert get_extraction_cache() is None
+    assert crawler.stats is not None
+    assert crawler.stats.get_value("extraction_cache/hits") == 1
+    assert crawler.stats.get_value("extraction_cache/misses") == 1
+    assert crawler.stats.get_value("extraction_cache/size") > 0
@@ -0,0 +1,252 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+import subprocess
+import sys
+
+import attrs
+import pytest
+from web_poet import HttpResponse, RequestUrl, WebPage, field
+
+from zyte_common_items import Product
+from zyte_common_items._cli import _process, main
+
+RECORDS = [
+    {"url": "https://a.example", "name": "A", "images": [], "foo": "bar"},
+    {"name": "B"},
+    {"url": "https://c.example", "brand": "C"},
+    {"url": "https://d.example", "images": [{"url": "https://d.example/1.png"}]},
+]
+LINES = [json.dumps(record) for record in RECORDS]
+
+
+def _write(path, lines, open_=open):
+    with open_(path, "wt") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+def _read_lines(path, open_=open):
+    with open_(path, "rt") as file:
+        return [json.loads(line) for line in file]
+
+
+@pytest.mark.parametrize(
+    ("suffix", "open_"),
+    [("", open), (".gz", gzip.open), (".bz2", bz2.open), (".xz", lzma.open)],
+)
+def test_validate(tmp_path, capsys, suffix, open_):
+    input = tmp_path / f"input.jsonl{suffix}"
+    _write(input, [LINES[0], "", "[]", LINES[1], LINES[2]], open_)
+    errors = tmp_path / "errors.jsonl"
+    assert main(["validate", str(input), "-e", str(errors)]) == 1
+    assert _read_lines(errors) == [
+        {"input": str(input), "line": 3, "error": "Expected a JSON object, got []."},
+        {
+            "input": str(input),
+            "line": 4,
+            "error": (
+                "Product.__init__() missing 1 required keyword-only argument: 'url'"
+            ),
+        },
+        {
+            "input": str(input),
+            "line": 5,
+            "error": (
+                "Expected brand to be a dict with fields from "
+                "zyte_common_items.components.brand.Brand, got 'C'."
+            ),
+        },
+    ]
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Processed 4 records (3 failed)" in captured.err
+    assert "records/s" in captured.err
+
+    input = tmp_path / "valid.jsonl"
+    _write(input, [LINES[0], LINES[3]])
+    assert main(["validate", "-q", str(input)]) == 0
+    assert capsys.readouterr().err == ""
+
+
+def test_validate_type(tmp_path, capsys):
+    input = tmp_path / "input.jsonl"
+    _write(input, [json.dumps({"url": "https://a.example", "headline": "A"})])
+    assert main(["validate", "-q", "-t", "Article", str(input)]) == 0
+    assert main(["validate", "-q", "-t", "zyte_common_items.Article", str(input)]) == 0
+    for type in ("Foo", "foo.Product", "zyte_common_items.Request.url"):
+        with pytest.raises(SystemExit):
+            main(["validate", "-t", type, str(input)])
+        assert "--type" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_normalize(tmp_path, capsys, jobs):
+    input = tmp_path / "input.jsonl"
+    _write(input, LINES * 5)
+    output = tmp_path / "output.jsonl.gz"
+    args = ["normalize", str(input), "-o", str(output), "-j", str(jobs)]
+    assert main(args + ["--chunk-size", "2"]) == 1
+    expected = [
+        {"url": "https://a.example", "name": "A", "foo": "bar"},
+        {"url": "https://d.example", "images": [{"url": "https://d.example/1.png"}]},
+    ]
+    assert _read_lines(output, gzip.open) == expected * 5
+    err = capsys.readouterr().err
+    assert [json.loads(line)["line"] for line in err.splitlines()[:-1]] == [
+        line for line in range(1, 21) if line % 4 in {2, 3}
+    ]
+
+
+def test_process_error():
+    def function(item):
+        raise KeyError("foo")
+
+    record = ("input.jsonl", 1, LINES[0])
+    path, line, output, error, _ = _process(function, Product, record)
+    assert (path, line, output, error) == ("input.jsonl", 1, None, "KeyError: 'foo'")
+
+
+def test_convert(tmp_path, capsys):
+    input = tmp_path / "input.jsonl"
+    _write(input, [LINES[0], LINES[3]])
+    output = tmp_path / "output.jsonl"
+    assert main(["convert", "-q", str(input), "-o", str(output)]) == 0
+    assert _read_lines(output) == [
+        {"url": "https://a.example", "name": "A", "foo": "bar", "probability": 1.0},
+        {
+            "url": "https://d.example",
+            "images": ["https://d.example/1.png"],
+            "probability": 1.0,
+        },
+    ]
+
+
+def test_stdin():
+    result = subprocess.run(
+        [sys.executable, "-m", "zyte_common_items", "normalize", "-q"],
+        input=gzip.compress("\n".join(LINES).encode()),
+        capture_output=True,
+        check=False,
+    )
+    assert result.returncode == 1
+    assert [json.loads(line)["url"] for line in result.stdout.splitlines()] == [
+        "https://a.example",
+        "https://d.example",
+    ]
+    assert [json.loads(line)["line"] for line in result.stderr.splitlines()] == [2, 3]
+
+
+@attrs.define
+class TitlePage(WebPage[Product]):
+    request_url: RequestUrl
+
+    @field
+    def url(self):
+        return str(self.request_url)
+
+    @field
+    def name(self):
+        name = self.css("h1::text").get()
+        if name is None:
+            raise ValueError("No title")
+        return name
+
+
+PAGE = f"{__name__}.TitlePage"
+RESPONSES = [
+    {"url": "https://a.example", "body": "<h1>A</h1>"},
+    {"url": "https://b.example", "browserHtml": "<p>B</p>"},
+    {
+        "url": "https://c.example",
+        "httpResponseBody": "PGgxPkM8L2gxPg==",
+        "httpResponseHeaders": [{"name": "Content-Type", "value": "text/html"}],
+        "statusCode": 200,
+    },
+    {"body": "<h1>D</h1>"},
+]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_extract(tmp_path, capsys, jobs):
+    input = tmp_path / "responses.jsonl.gz"
+    _write(input, [json.dumps(response) for response in RESPONSES] * 3, gzip.open)
+    output = tmp_path / "output.jsonl"
+    args = ["extract", "-p", PAGE, str(input), "-o", str(output), "-j", str(jobs)]
+    assert main(args + ["--chunk-size", "1"]) == 1
+    assert (
+        _read_lines(output)
+        == [
+            {"url": "https://a.example", "name": "A"},
+            {"url": "https://c.example", "name": "C"},
+        ]
+        * 3
+    )
+    err = capsys.readouterr().err.splitlines()
+    errors = [json.loads(line) for line in err[:-2]]
+    assert [error["line"] for error in errors] == [2, 4, 6, 8, 10, 12]
+    assert errors[0]["error"] == "ValueError: No title"
+    assert errors[1]["error"].startswith("ValueError: Expected a URL")
+    assert err[-2].startswith("Processed 12 records (6 failed)")
+    assert err[-1].startswith("Latency per page: p50 ")
+
+
+def test_extract_fixtures(tmp_path, capsys):
+    from web_poet.testing import Fixture
+
+    for index, body in enumerate((b"<h1>A</h1>", b"<h1>B</h1>")):
+        Fixture.save(
+            tmp_path / "fixtures" / PAGE,
+            inputs=[
+                HttpResponse(f"https://{index}.example", body),
+                RequestUrl(f"https://{index}.example"),
+            ],
+            fixture_name=f"test-{index}",
+        )
+    args = ["extract", "-q", "-p", PAGE, str(tmp_path / "fixtures")]
+    assert main(args) == 0
+    assert [json.loads(line) for line in capsys.readouterr().out.splitlines()] == [
+        {"url": "https://0.example", "name": "A"},
+        {"url": "https://1.example", "name": "B"},
+    ]
+
+
+def test_extract_page(tmp_path, capsys):
+    input = tmp_path / "responses.jsonl"
+    _write(input, [json.dumps(RESPONSES[0])])
+    for page in ("Foo", "foo.Page", "zyte_common_items.Product"):
+        with pytest.raises(SystemExit):
+            main(["extract", "-p", page, str(input)])
+        assert "--page" in capsys.readouterr().err
+
+    # Page inputs that cannot be built from a response are reported per page.
+    args = ["extract", "-q", "-p", "zyte_common_items.AutoProductPage", str(input)]
+    assert main(args) == 1
+    error = json.loads(capsys.readouterr().err)["error"]
+    assert error.startswith("ValueError: Cannot build the product input")
+
+
+def test_extract_warc(tmp_path, capsys):
+    pytest.importorskip("warcio")
+    from warcio.statusandheaders import StatusAndHeaders
+    from warcio.warcwriter import WARCWriter
+
+    input = tmp_path / "responses.warc.gz"
+    with open(input, "wb") as file:
+        writer = WARCWriter(file, gzip=True)
+        for url, body in (
+            ("https://a.example", b"<h1>A</h1>"),
+            ("https://b.example", b"<p>B</p>"),
+        ):
+            headers = StatusAndHeaders(
+                "200 OK", [("Content-Type", "text/html")], protocol="HTTP/1.1"
+            )
+            record = writer.create_warc_record(
+                url, "response", payload=io.BytesIO(body), http_headers=headers
+            )
+            writer.write_record(record)
+    assert main(["extract", "-q", "-p", PAGE, str(input)]) == 1
+    captured = capsys.readouterr()
+    assert json.loads(captured.out) == {"url": "https://a.example", "name": "A"}
+    assert json.loads(captured.err)["line"] == 2
@@ -4,6 +4,10 @@ import pytest
 
 from zyte_common_items import Header, ProbabilityRequest, Request
 from zyte_common_items.components import request_list_processor
+from zyte_common_items.components.request import (
+    request_fingerprints,
+    to_scrapy_requests,
+)
 from zyte_common_items.processors import probability_request_list_processor
 
 
@@ -78,6 +82,104 @@ def test_request_to_scrapy_headers_with_the_same_name():
     assert scrapy_req.headers.getlist("name") == [b"value1", b"value2"]
 
 
+FINGERPRINT_REQUESTS = [
+    Request("http://example.com/a?b=1&a=2#c"),
+    Request("http://example.com/ü path", method="post", body="YWJj"),
+    Request(
+        "http://example.com",
+        headers=[
+            Header(name="X-A", value="1"),
+            Header(name="x-a", value="ü"),
+            Header(name="B", value="2"),
+        ],
+    ),
+]
+
+
+@pytest.mark.parametrize("request_", FINGERPRINT_REQUESTS)
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"keep_fragments": True}, {"include_headers": ["x-A", "b", "C"]}],
+)
+def test_request_fingerprint(request_, kwargs):
+    pytest.importorskip("scrapy", minversion="2.7.0")
+    from scrapy.utils.request import fingerprint
+
+    expected = fingerprint(request_.to_scrapy(callback=None), **kwargs)
+    assert request_.request_fingerprint(**kwargs) == expected
+    # Cached
+    assert request_.request_fingerprint(**kwargs) == expected
+
+
+def test_request_fingerprint_no_scrapy():
+    request = Request("http://example.com/?b=1&a=2")
+    assert request.request_fingerprint() == bytes.fromhex(
+        "c9dcc338e95f68e624469bcddc159b198591f538"
+    )
+    assert (
+        request.request_fingerprint()
+        == Request("http://example.com/?a=2&b=1#c").request_fingerprint()
+    )
+    assert request.request_fingerprint() != Request(
+        "http://example.com/?a=2&b=1#c"
+    ).request_fingerprint(keep_fragments=True)
+    # The cache is not part of the request data.
+    assert request == Request("http://example.com/?b=1&a=2")
+    assert "fingerprint" not in repr(request)
+
+
+def test_request_fingerprints():
+    requests = FINGERPRINT_REQUESTS + [ProbabilityRequest(url="http://example.com")]
+    assert request_fingerprints(requests, include_headers=iter(["x-a"])) == [
+        request.request_fingerprint(include_headers=["x-a"]) for request in requests
+    ]
+    fingerprints = request_fingerprints(requests)
+    assert fingerprints[2] == fingerprints[3]
+    assert len(set(fingerprints)) == 3
+
+
+def test_to_scrapy_requests():
+    pytest.importorskip("scrapy", minversion="2.7.0")
+
+    def callback(response):
+        pass
+
+    headers = [Header(name="a", value="1"), Header(name="a", value="2")]
+    requests = [
+        Request("http://example.com/1"),
+        Request("http://example.com/2", headers=headers),
+        Request(
+            "http://example.com/3",
+            method="POST",
+            body=base64.b64encode(b"body").decode(),
+            headers=list(headers),
+        ),
+    ]
+    scrapy_requests = to_scrapy_requests(requests, callback, meta={"foo": "bar"})
+    assert not isinstance(scrapy_requests, list)
+    for request, scrapy_req in zip(requests, scrapy_requests):
+        expected = request.to_scrapy(callback, meta={"foo": "bar"})
+        assert scrapy_req.url == expected.url
+        assert scrapy_req.method == expected.method
+        assert scrapy_req.body == expected.body
+        assert scrapy_req.headers == expected.headers
+        assert scrapy_req.callback is callback
+        assert scrapy_req.meta == {"foo": "bar"}
+        assert scrapy_req.priority == 0
+
+
+def test_to_scrapy_requests_priority_fn():
+    pytest.importorskip("scrapy")
+    requests = [Request(f"http://example.com/{i}") for i in range(3)]
+    scrapy_requests = to_scrapy_requests(
+        requests, None, priority_fn=lambda request: int(request.url[-1]) * 10
+    )
+    assert [request.priority for request in scrapy_requests] == [0, 10, 20]
+
+    with pytest.raises(ValueError):
+        list(to_scrapy_requests(requests, None, priority=1, priority_fn=lambda r: 1))
+
+
 def test_probability_request_list_processor_dict():
     assert probability_request_list_processor([{"url": "http://example.com"}]) == [
         ProbabilityRequest(url="http://example.com", headers=[])
@@ -0,0 +1,91 @@
+from typing import Any, Dict
+
+import attrs
+import pytest
+
+from zyte_common_items import (
+    Product,
+    ProductList,
+    ProductNavigation,
+    ZyteItemAdapter,
+)
+from zyte_common_items.envelope import (
+    DEFAULT_ITEM_TYPES,
+    from_envelope,
+    get_item_types,
+    register_item_type,
+)
+
+RESPONSE: Dict[str, Any] = {
+    "url": "https://example.com/a",
+    "statusCode": 200,
+    "product": {
+        "url": "https://example.com/a",
+        "name": "A",
+        "metadata": {"probability": 0.9},
+        "foo": "bar",
+    },
+    "productList": {
+        "url": "https://example.com/a",
+        "products": [{"url": "https://example.com/b"}],
+    },
+    "productNavigation": None,
+}
+
+
+@attrs.define
+class CustomProduct(Product):
+    color: str = "red"
+
+
+def test_from_envelope():
+    items = from_envelope(RESPONSE)
+    assert list(items) == ["product", "productList"]
+    assert items["product"] == Product.from_dict(RESPONSE["product"])
+    assert items["product"]._unknown_fields_dict == {"foo": "bar"}
+    assert items["productList"] == ProductList.from_dict(RESPONSE["productList"])
+
+    items = from_envelope(RESPONSE, trusted=True)
+    assert ZyteItemAdapter(items["product"]).asdict() == (
+        ZyteItemAdapter(Product.from_dict(RESPONSE["product"])).asdict()
+    )
+
+    product_list = from_envelope(RESPONSE, lazy=True)["productList"]
+    assert isinstance(product_list, ProductList)
+    assert product_list.products is not None
+    assert product_list.products[0].url == "https://example.com/b"
+
+    items = from_envelope(
+        RESPONSE, item_types={"product": None, "productList": ProductNavigation}
+    )
+    assert list(items) == ["productList"]
+    assert type(items["productList"]) is ProductNavigation
+
+
+def test_from_envelope_errors():
+    response = {"product": {"url": "https://example.com", "breadcrumbs": 3}}
+    with pytest.raises(ValueError, match="Expected product.breadcrumbs to be"):
+        from_envelope(response)
+    with pytest.raises(ValueError, match="Expected product to be"):
+        from_envelope({"product": "https://example.com"})
+
+
+def test_register_item_type():
+    assert get_item_types() == DEFAULT_ITEM_TYPES
+    assert register_item_type("product", CustomProduct) is Product
+    try:
+        assert register_item_type("customProduct", CustomProduct) is None
+        items = from_envelope({**RESPONSE, "customProduct": RESPONSE["product"]})
+        assert type(items["product"]) is CustomProduct
+        assert items["customProduct"] == items["product"]
+        assert items["product"].color == "red"
+        assert register_item_type("customProduct", None) is CustomProduct
+        assert "customProduct" not in get_item_types()
+    finally:
+        register_item_type("product", Product)
+    assert get_item_types() == DEFAULT_ITEM_TYPES
+
+    with pytest.raises(ValueError):
+        register_item_type("product", dict)  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        register_item_type("product", Product(url="https://example.com"))  # type: ignore[arg-type]
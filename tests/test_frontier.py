@@ -0,0 +1,157 @@
+import pytest
+
+from zyte_common_items import (
+    JobPostingNavigation,
+    ProbabilityRequest,
+    ProductNavigation,
+    Request,
+)
+from zyte_common_items.frontier import RequestFrontier
+from zyte_common_items.urls import canonicalize_url
+
+URL = "https://example.com"
+
+
+def _navigation(cls=ProductNavigation, **kwargs):
+    return cls.from_dict({"url": f"{URL}/c", **kwargs})
+
+
+def _request(url, probability=None):
+    data = {"url": url}
+    if probability is not None:
+        data["metadata"] = {"probability": probability}
+    return data
+
+
+def _urls(requests):
+    return [(request.url, priority) for request, priority in requests]
+
+
+def test_add():
+    frontier = RequestFrontier(min_probability=0.2)
+    navigation = _navigation(
+        items=[
+            _request(f"{URL}/1", 0.95),
+            _request(f"{URL}/2", 0.1),
+            _request(f"{URL}/3", 0.2),
+            _request(f"{URL}/4"),
+        ],
+        subCategories=[_request(f"{URL}/1", 0.7), _request(f"{URL}/s", 0.55)],
+        nextPage={"url": f"{URL}/c?page=2"},
+    )
+    requests = frontier.add(navigation)
+    assert _urls(requests.items) == [
+        (f"{URL}/1", 90),
+        (f"{URL}/3", 20),
+        (f"{URL}/4", 100),
+    ]
+    assert _urls(requests.navigation) == [(f"{URL}/s", 50), (f"{URL}/c?page=2", 100)]
+    assert isinstance(requests.items[0][0], ProbabilityRequest)
+    assert isinstance(requests.navigation[-1][0], Request)
+    assert frontier.to_stats("f") == {
+        "f/seen": 7,
+        "f/accepted": 5,
+        "f/dropped": 1,
+        "f/duplicates": 1,
+    }
+
+    # Iterables of navigation items, and navigation items without
+    # subCategories.
+    navigations = [
+        _navigation(JobPostingNavigation, items=[_request(f"{URL}/5", 0.5)]),
+        _navigation(nextPage={"url": f"{URL}/c?page=2"}),
+        _navigation(nextPage={"url": f"{URL}/c?page=3"}),
+    ]
+    requests = frontier.add(navigations)
+    assert _urls(requests.items) == [(f"{URL}/5", 50)]
+    assert _urls(requests.navigation) == [(f"{URL}/c?page=3", 100)]
+
+
+def test_priorities():
+    frontier = RequestFrontier(
+        priority_buckets=4, max_priority=10, next_page_priority=-1
+    )
+    assert [frontier.get_priority(p) for p in (-1, 0, 0.24, 0.25, 0.99, 1, 2)] == [
+        0,
+        0,
+        0,
+        2,
+        8,
+        10,
+        10,
+    ]
+    navigation = _navigation(
+        subCategories=[_request(f"{URL}/s", 0.5)], nextPage={"url": f"{URL}/c?p=2"}
+    )
+    assert _urls(frontier.add(navigation).navigation) == [
+        (f"{URL}/s", 5),
+        (f"{URL}/c?p=2", -1),
+    ]
+
+    with pytest.raises(ValueError):
+        RequestFrontier(priority_buckets=0)
+    with pytest.raises(ValueError):
+        RequestFrontier(capacity=10, spill_path="x")
+
+
+def test_fingerprint():
+    frontier = RequestFrontier()
+    get = frontier.get_fingerprint
+    assert get(Request(f"{URL}/1")) == get(Request(f"{URL}/1", method="GET"))
+    assert get(Request(f"{URL}/1")) != get(Request(f"{URL}/1", method="POST"))
+    assert get(Request(f"{URL}/1", body="YQ==")) != get(Request(f"{URL}/1"))
+    assert get(Request(f"{URL}/?b=1&a=2")) != get(Request(f"{URL}/?a=2&b=1"))
+    assert get(Request(f"{URL}/1")).bit_length() > 64
+
+    frontier = RequestFrontier(normalize_url=canonicalize_url)
+    get = frontier.get_fingerprint
+    assert get(Request(f"{URL}/?b=1&a=2")) == get(Request(f"{URL}/?a=2&b=1#c"))
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"capacity": 1000}, {"spill_threshold": 2}], ids=str
+)
+def test_stores(tmp_path, kwargs):
+    if "spill_threshold" in kwargs:
+        kwargs["spill_path"] = str(tmp_path / "frontier.db")
+    frontier = RequestFrontier(**kwargs)
+    navigation = _navigation(items=[_request(f"{URL}/{i % 5}") for i in range(20)])
+    assert len(frontier.add(navigation).items) == 5
+    assert len(frontier.add(navigation).items) == 0
+    assert frontier.duplicates == 35
+    frontier.close()
+
+
+def test_to_scrapy():
+    pytest.importorskip("scrapy", minversion="2.10")
+
+    def parse_item(response):
+        pass
+
+    def parse_navigation(response):
+        pass
+
+    frontier = RequestFrontier()
+    navigation = _navigation(
+        items=[_request(f"{URL}/1", 0.5)], nextPage={"url": f"{URL}/c?page=2"}
+    )
+    requests = frontier.to_scrapy(
+        navigation,
+        item_callback=parse_item,
+        navigation_callback=parse_navigation,
+        meta={"a": 1},
+    )
+    assert [
+        (request.url, request.priority, request.callback, request.meta)
+        for request in requests
+    ] == [
+        (f"{URL}/1", 50, parse_item, {"a": 1}),
+        (f"{URL}/c?page=2", 100, parse_navigation, {"a": 1}),
+    ]
+    with pytest.raises(ValueError, match="priority"):
+        frontier.to_scrapy(
+            navigation,
+            item_callback=parse_item,
+            navigation_callback=parse_navigation,
+            priority=1,
+        )
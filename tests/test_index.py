@@ -0,0 +1,116 @@
+import pytest
+
+from zyte_common_items import (
+    Article,
+    ArticleFromList,
+    Gtin,
+    Image,
+    ProbabilityMetadata,
+    Product,
+    ProductFromList,
+    ProductMetadata,
+)
+from zyte_common_items.index import ItemIndex
+
+
+def test_find():
+    a = ProductFromList(url="https://example.com/a#foo", productId="1")
+    b = ProductFromList(url="https://example.com/b", productId="2")
+    c = ProductFromList(url="https://example.com/c", productId="1")
+    index = ItemIndex([a, b, c])
+    assert len(index) == 3
+    assert list(index) == [a, b, c]
+
+    assert index.find(Product(url="https://example.com/a")) is a
+    assert index.find(Product(url="https://example.com/x", productId="2")) is b
+    product = Product(url="https://example.com/c", productId="1")
+    assert index.find(product) is c
+    assert index.find_all(product) == [c, a]
+    assert index.find(Product(url="https://example.com/x")) is None
+    assert index.find_all(Product(url="https://example.com/x")) == []
+
+    product = Product(url="https://example.com/x", canonicalUrl="https://example.com/b")
+    assert index.find(product) is b
+
+    assert index.get("productId", "1") == [a, c]
+    assert index.get("url", "https://example.com/b#bar") == [b]
+    assert index.get("sku", "1") == []
+    with pytest.raises(KeyError):
+        index.get("name", "A")
+
+
+def test_multi_valued_keys():
+    a = Product(
+        url="https://example.com/a",
+        gtin=[Gtin(type="gtin13", value="1"), Gtin(type="upc", value="2")],
+    )
+    b = Product(url="https://example.com/b", gtin=[Gtin(type="gtin8", value="3")])
+    index = ItemIndex([a, b], keys=["gtin.value"])
+    assert index.find({"gtin": [{"value": "2"}]}) is a
+    assert index.get("gtin.value", "1") == [a]
+    assert index.get("gtin.value", "3") == [b]
+    assert index.find(Product(url="https://example.com/a")) is None
+
+
+def test_custom_keys():
+    a = ArticleFromList(url="https://example.com/a?x=1")
+    index = ItemIndex([a], keys=["url", "mainImage.url"], normalize_url=str.lower)
+    assert index.find(Article(url="https://EXAMPLE.com/a?x=1")) is a
+    assert index.find(Article(url="https://example.com/a?x=1#foo")) is None
+    b = ArticleFromList(
+        url="https://b.example", mainImage=Image(url="https://c.example")
+    )
+    index.add(b)
+    assert index.find(Article(url="https://c.example")) is b
+
+
+def test_bool_values():
+    a = ProductFromList.from_dict({"flag": True})
+    b = ProductFromList.from_dict({"flag": 1})
+    index = ItemIndex([a, b], keys=["flag"])
+    assert index.get("flag", 1) == [b]
+    assert index.get("flag", True) == []
+    assert index.find({"flag": True}) is None
+
+
+def test_merge():
+    list_items = [
+        ProductFromList(
+            url="https://example.com/a",
+            name="List A",
+            price="5.00",
+            currency="USD",
+            metadata=ProbabilityMetadata(probability=0.9),
+        ),
+        ProductFromList(url="https://example.com/b", name="List B"),
+    ]
+    index = ItemIndex(list_items)
+    a = Product.from_dict(
+        {"url": "https://example.com/a", "name": "A", "price": "", "foo": "bar"}
+    )
+    c = Product(url="https://example.com/c")
+    merged = index.merge([a, c])
+    assert merged[1] is c
+    assert merged[0] == Product.from_dict(
+        {
+            "url": "https://example.com/a",
+            "name": "A",
+            "price": "5.00",
+            "currency": "USD",
+            "metadata": {"probability": 0.9},
+        }
+    )
+    assert type(merged[0].metadata) is ProductMetadata
+    assert merged[0]._unknown_fields_dict == {"foo": "bar"}
+    assert a.price == ""
+
+    merged = index.merge([a], prefer="index", precedence={"url": "item"})
+    assert merged[0].name == "List A"
+    assert merged[0].url == "https://example.com/a"
+    merged = index.merge([a], precedence={"name": "index"})
+    assert merged[0].name == "List A"
+
+    with pytest.raises(ValueError):
+        index.merge([a], prefer="list")
+    with pytest.raises(ValueError):
+        index.merge([a], precedence={"name": "detail"})
@@ -1,9 +1,22 @@
-from typing import List, Optional, Union
+import copy
+import pickle
+from typing import Any, Dict, List, Optional, Union
 
 import attrs
 import pytest
+from itemadapter import ItemAdapter
+from web_poet import RequestUrl
 
-from zyte_common_items import Item, Product, is_data_container
+from zyte_common_items import (
+    Image,
+    Item,
+    Product,
+    ProductFromList,
+    ProductList,
+    ProductListMetadata,
+    ProductNavigation,
+    is_data_container,
+)
 
 
 class NotConsideredAnItem:
@@ -165,3 +178,249 @@ def test_item_attribute_error():
 def test_item_unknown_field_init():
     with pytest.raises(TypeError):
         SubItem(name="foo", value="bar")  # type: ignore[call-arg]
+
+
+def test_from_trusted_dict():
+    data = {
+        "url": "https://example.com/",
+        "canonicalUrl": "https://example.com/",
+        "a": "b",
+        "additionalProperties": [{"name": "a", "value": "b", "max": 10}],
+        "aggregateRating": {"worstRating": 0},
+        "gtin": [{"type": "gtin13", "value": "9504000059446"}],
+        "metadata": {"probability": 0.5, "dateDownloaded": "2024-01-01T00:00:00Z"},
+    }
+    product = Product.from_trusted_dict(data)
+    assert product == Product.from_dict(data)
+    assert product._unknown_fields_dict == {"a": "b"}
+    assert product.aggregateRating._unknown_fields_dict == {"worstRating": 0}
+    assert product.additionalProperties[0]._unknown_fields_dict == {"max": 10}
+    assert type(product.metadata).__name__ == "ProductMetadata"
+    assert product.breadcrumbs == []
+    assert product.name is None
+    assert Product.from_trusted_dict(None) is None
+
+    item = BigItem.from_trusted_dict({"sub_item": SubItem(name="a")})
+    assert item == BigItem(sub_item=SubItem(name="a"))
+
+    with pytest.raises(TypeError, match="Missing required field 'name'"):
+        SubItem.from_trusted_dict({})
+
+
+def test_from_trusted_dict_skips_converters():
+    url = RequestUrl("https://example.com")
+    assert type(Product.from_dict({"url": url}).url) is str
+    assert Product.from_trusted_dict({"url": url}).url is url
+
+
+def test_from_dict_lazy():
+    data: Dict[str, Any] = {
+        "url": "https://example.com",
+        "products": [
+            {"url": "https://example.com/1", "name": "A", "foo": "bar"},
+            {"url": "https://example.com/2", "mainImage": {"url": "https://a.example"}},
+        ],
+        "breadcrumbs": [{"name": "Home", "url": "https://example.com"}],
+        "metadata": {"probability": 0.5},
+    }
+    expected = ProductList.from_dict(data)
+    item = ProductList.from_dict(data, lazy=True)
+    assert item.products is not None
+    raw = list.__getitem__(item.products, 0)
+    assert raw is data["products"][0]
+
+    product = item.products[0]
+    assert type(product) is ProductFromList
+    assert product._unknown_fields_dict == {"foo": "bar"}
+    assert item.products[0] is product
+    assert list.__getitem__(item.products, 0) is product
+    assert isinstance(list.__getitem__(item.products, 1), dict)
+    assert item.products[-1].mainImage == Image(url="https://a.example")
+
+    item = ProductList.from_dict(data, lazy=True)
+    assert item == expected
+    assert repr(item) == repr(expected)
+    assert ItemAdapter(item).asdict() == ItemAdapter(expected).asdict()
+    assert type(ItemAdapter(item).asdict()["products"]) is list
+    item = ProductList.from_dict(data, lazy=True)
+    assert item.fingerprint() == expected.fingerprint()
+    item = ProductList.from_dict(data, lazy=True)
+    assert pickle.loads(pickle.dumps(item)) == expected
+    assert copy.deepcopy(ProductList.from_dict(data, lazy=True)) == expected
+
+    products = ProductList.from_dict(data, lazy=True).products
+    assert products is not None
+    assert products[1:] == expected.products[1:]  # type: ignore[index]
+    assert list(reversed(products)) == expected.products[::-1]  # type: ignore[index]
+    assert expected.products[0] in ProductList.from_dict(data, lazy=True).products
+    assert ProductFromList.from_list(data["products"], lazy=True) == expected.products
+
+    for value in (
+        [] + ProductFromList.from_list(data["products"], lazy=True),
+        ProductFromList.from_list(data["products"], lazy=True) + [],
+        ProductFromList.from_list(data["products"], lazy=True).copy(),
+        list(ProductFromList.from_list(data["products"], lazy=True)),
+    ):
+        assert type(value) is list
+        assert [type(product) for product in value] == [ProductFromList] * 2
+
+
+def test_from_dict_lazy_errors():
+    item = ProductNavigation.from_dict(
+        {"url": "https://example.com", "items": [{"url": "https://a.example"}, 3]},
+        lazy=True,
+    )
+    assert item.items is not None
+    assert item.items[0].url == "https://a.example"
+    pattern = r"Expected items\[1\] to be a dict with fields from \S+, got 3\."
+    with pytest.raises(ValueError, match=pattern):
+        item.items[1]
+
+
+def test_from_dict_fields():
+    data: Dict[str, Any] = {
+        "url": "https://example.com",
+        "products": [
+            {
+                "url": "https://example.com/1",
+                "name": "A",
+                "descriptionHtml": "<p>A</p>",
+                "mainImage": {"url": "https://example.com/1.png", "foo": "bar"},
+                "foo": "bar",
+            },
+            {"url": "https://example.com/2"},
+        ],
+        "breadcrumbs": 3,
+        "metadata": {"probability": 0.5, "dateDownloaded": "2024-01-01T00:00:00Z"},
+    }
+    fields = ["products.name", "products.mainImage.url", "foo"]
+    item = ProductList.from_dict(data, fields=fields)
+    assert item == ProductList.from_dict(
+        {
+            "url": "https://example.com",
+            "products": [
+                {"name": "A", "mainImage": {"url": "https://example.com/1.png"}},
+                {},
+            ],
+        }
+    )
+    assert item.products is not None
+    assert item.products[0]._unknown_fields_dict == {}
+    assert item.products[0].mainImage is not None
+    assert item.products[0].mainImage._unknown_fields_dict == {}
+    assert ProductList.from_dict(data, fields=fields, lazy=True) == item
+    assert ProductList.from_dict(data, fields=tuple(fields)) == item
+
+    fields = ["metadata.dateDownloaded", "products.foo"]
+    item = ProductList.from_dict(data, fields=fields)
+    assert item.metadata == ProductListMetadata(dateDownloaded="2024-01-01T00:00:00Z")
+    assert item.metadata._unknown_fields_dict == {}
+    assert item.products is not None
+    assert item.products[0]._unknown_fields_dict == {"foo": "bar"}
+
+    products = ProductFromList.from_list(data["products"], fields="name")
+    assert [product.name for product in products] == ["A", None]
+
+    with pytest.raises(ValueError, match="Expected breadcrumbs to be a list"):
+        ProductList.from_dict(data, fields="breadcrumbs")
+    data["products"][1]["mainImage"] = 3
+    pattern = "Expected products\\[1\\].mainImage to be a dict"
+    with pytest.raises(ValueError, match=pattern):
+        ProductList.from_dict(data, fields="products.mainImage.url")
+    with pytest.raises(TypeError):
+        Product.from_dict({"name": "A"}, fields="name")
+
+
+def test_fingerprint():
+    input_data = {
+        "url": "https://example.com/",
+        "name": "Foo",
+        "gtin": [{"type": "gtin13", "value": "9504000059446"}],
+        "aggregateRating": {"ratingValue": 4.5, "worstRating": 0},
+        "metadata": {
+            "dateDownloaded": "2024-01-01T00:00:00Z",
+            "probability": 0.9,
+        },
+        "a": {"c": 1, "b": [True, None]},
+    }
+    product = Product.from_dict(input_data)
+    fingerprint = product.fingerprint()
+    assert len(fingerprint) == 40
+
+    # Key order and empty values do not matter.
+    same_product = Product.from_dict(
+        {
+            "a": {"b": [True, None], "c": 1},
+            "metadata": {
+                "probability": 0.9,
+                "dateDownloaded": "2024-01-01T00:00:00Z",
+            },
+            "aggregateRating": {"worstRating": 0, "ratingValue": 4.5},
+            "gtin": [{"value": "9504000059446", "type": "gtin13"}],
+            "name": "Foo",
+            "url": "https://example.com/",
+            "images": [],
+            "brand": None,
+        }
+    )
+    assert same_product.fingerprint() == fingerprint
+
+    # Any change, including in nested and unknown fields, does.
+    for data in (
+        {"name": "Bar"},
+        {"gtin": [{"type": "gtin13", "value": "9504000059447"}]},
+        {"aggregateRating": {"ratingValue": 4.5, "worstRating": 1}},
+        {"a": {"c": 1, "b": [True]}},
+        {"a": {"c": "1", "b": [True, None]}},
+    ):
+        other_product = Product.from_dict({**input_data, **data})
+        assert other_product.fingerprint() != fingerprint
+
+
+def test_fingerprint_include_exclude():
+    def product(date_downloaded, name="Foo"):
+        return Product.from_dict(
+            {
+                "url": "https://example.com/",
+                "name": name,
+                "metadata": {
+                    "dateDownloaded": date_downloaded,
+                    "probability": 0.9,
+                },
+                "variants": [{"name": name, "sku": "1"}],
+            }
+        )
+
+    a = product("2024-01-01T00:00:00Z")
+    b = product("2024-01-02T00:00:00Z")
+    c = product("2024-01-02T00:00:00Z", name="Bar")
+    assert a.fingerprint() != b.fingerprint()
+
+    exclude = ["metadata.dateDownloaded"]
+    assert a.fingerprint(exclude=exclude) == b.fingerprint(exclude=exclude)
+    assert a.fingerprint(exclude=exclude) != c.fingerprint(exclude=exclude)
+    assert a.fingerprint(exclude="metadata") == b.fingerprint(exclude="metadata")
+
+    assert a.fingerprint(include="url") == c.fingerprint(include="url")
+    assert a.fingerprint(include=["url", "metadata.probability"]) == c.fingerprint(
+        include=["url", "metadata.probability"]
+    )
+    assert a.fingerprint(include=["variants.sku"]) == c.fingerprint(
+        include=["variants.sku"]
+    )
+    assert a.fingerprint(include=["variants.name"]) != c.fingerprint(
+        include=["variants.name"]
+    )
+    assert b.fingerprint(include=["url", "name"]) != c.fingerprint(
+        include=["url", "name"]
+    )
+    assert a.fingerprint(include=["metadata"], exclude=exclude) == b.fingerprint(
+        include=["metadata"], exclude=exclude
+    )
+
+
+def test_fingerprint_unsupported_type():
+    product = Product(url="https://example.com/")
+    product._unknown_fields_dict["a"] = object()
+    with pytest.raises(TypeError):
+        product.fingerprint()
@@ -0,0 +1,111 @@
+import pytest
+
+from zyte_common_items import Product, ProductNavigation
+from zyte_common_items.envelope import from_envelope
+from zyte_common_items.limits import (
+    InputLimits,
+    disable_input_limits,
+    enable_input_limits,
+    get_input_limits,
+)
+
+URL = "https://example.com"
+PRODUCT = {
+    "url": URL,
+    "name": "A",
+    "variants": [{"name": "B", "images": [{"url": f"{URL}/1.png"}]}],
+    "additionalProperties": [{"name": "color", "value": "red"}],
+    "foo": {"bar": [1, 2, {"baz": "qux"}]},
+}
+
+
+@pytest.mark.parametrize(
+    ("limits", "error"),
+    [
+        (InputLimits(), None),
+        (InputLimits(max_depth=5, max_list_length=3, max_nodes=100), None),
+        (
+            InputLimits(max_depth=4),
+            "Expected variants[0].images[0] to be nested at most 4 levels "
+            "deep, got 5.",
+        ),
+        (
+            InputLimits(max_depth=3),
+            "Expected foo.bar[2] to be nested at most 3 levels deep, got 4.",
+        ),
+        (
+            InputLimits(max_depth=2),
+            "Expected foo.bar to be nested at most 2 levels deep, got 3.",
+        ),
+        (
+            InputLimits(max_list_length=2),
+            "Expected foo.bar to have at most 2 items, got 3.",
+        ),
+        (
+            InputLimits(max_string_length=3),
+            "Expected url to have at most 3 characters, got 19.",
+        ),
+        (
+            InputLimits(max_string_length=19),
+            "Expected variants[0].images[0].url to have at most 19 characters, "
+            "got 25.",
+        ),
+        (
+            InputLimits(max_nodes=6),
+            "Expected at most 6 values in the input, exceeded at foo.bar[1].",
+        ),
+    ],
+)
+def test_limits(limits, error):
+    if error is None:
+        assert Product.from_dict(PRODUCT, limits=limits) == Product.from_dict(PRODUCT)
+        return
+    with pytest.raises(ValueError) as exc_info:
+        Product.from_dict(PRODUCT, limits=limits)
+    assert str(exc_info.value) == error
+
+
+def test_limits_lists():
+    data = [{"url": f"{URL}/{index}"} for index in range(3)]
+    with pytest.raises(ValueError, match="^Expected the input to have at most 2"):
+        Product.from_list(data, limits=InputLimits(max_list_length=2))
+    with pytest.raises(ValueError, match="exceeded at \\[2\\]"):
+        Product.from_list(data, limits=InputLimits(max_nodes=5))
+    assert len(Product.from_list(data, limits=InputLimits(max_depth=1))) == 3
+
+    navigation = {"url": URL, "items": data}
+    limits = InputLimits(max_list_length=2)
+    with pytest.raises(ValueError, match="^Expected items to have at most 2"):
+        ProductNavigation.from_dict(navigation, limits=limits, lazy=True)
+
+    # Lazily-built items are checked when built, against the same budget.
+    limits = InputLimits(max_nodes=6)
+    navigation = ProductNavigation.from_dict(navigation, limits=limits, lazy=True)
+    assert navigation.items[1].url == f"{URL}/1"
+    with pytest.raises(ValueError, match="exceeded at items\\[2\\].url"):
+        navigation.items[2]
+
+
+def test_global_limits():
+    assert get_input_limits() is None
+    limits = InputLimits(max_list_length=0)
+    assert enable_input_limits(limits) is limits
+    try:
+        assert get_input_limits() is limits
+        with pytest.raises(ValueError):
+            Product.from_dict(PRODUCT)
+        assert Product.from_dict(PRODUCT, limits=InputLimits()).name == "A"
+        with pytest.raises(ValueError, match="^Expected product.foo.bar"):
+            from_envelope({"product": PRODUCT})
+        assert from_envelope({"product": PRODUCT}, trusted=True)
+    finally:
+        assert disable_input_limits() is limits
+    assert get_input_limits() is None
+    assert Product.from_dict(PRODUCT).name == "A"
+
+
+def test_envelope_limits():
+    response = {"product": PRODUCT, "productNavigation": {"url": URL}}
+    assert from_envelope(response, limits=InputLimits(max_nodes=21))
+    with pytest.raises(ValueError, match="exceeded at productNavigation.url"):
+        from_envelope(response, limits=InputLimits(max_nodes=20))
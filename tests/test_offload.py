@@ -0,0 +1,140 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from web_poet import HttpResponse, field
+
+from zyte_common_items import ProductPage
+from zyte_common_items.offload import (
+    disable_processor_offloading,
+    enable_processor_offloading,
+    is_offloadable,
+    mark_offloadable,
+)
+from zyte_common_items.processors import (
+    description_processor,
+    price_processor,
+)
+
+HTML = b"""
+<!DOCTYPE html>
+<html>
+    <body>
+        <h1>Foo</h1>
+        <ul class="breadcrumbs">
+            <li><a href="/">Home</a></li>
+            <li><a href="/foo">Foo</a></li>
+        </ul>
+        <div class="price">$13.2</div>
+        <div class="description"><p>Bar</p><p>Baz</p></div>
+    </body>
+</html>
+"""
+
+processor_threads = []
+
+
+@mark_offloadable
+def name_processor(value, page):
+    processor_threads.append(threading.get_ident())
+    return value.upper()
+
+
+class CustomProductPage(ProductPage):
+    class Processors(ProductPage.Processors):
+        name = [name_processor]
+
+    @field
+    def name(self):
+        return self.css("h1::text").get()
+
+    @field
+    def breadcrumbs(self):
+        return self.css(".breadcrumbs")
+
+    @field
+    def price(self):
+        return self.css(".price")
+
+    @field
+    async def description(self):
+        return self.css(".description")
+
+
+def _page():
+    return CustomProductPage(
+        response=HttpResponse(url="https://example.com", body=HTML)
+    )
+
+
+def test_is_offloadable():
+    assert is_offloadable(description_processor)
+    assert is_offloadable(name_processor)
+    assert not is_offloadable(price_processor)
+    assert not is_offloadable([])  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_processor_offloading():
+    expected_item = await _page().to_item()
+    assert expected_item.name == "FOO"
+    assert processor_threads == [threading.get_ident()]
+
+    processor_threads.clear()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert enable_processor_offloading(executor) is executor
+        try:
+            item = await _page().to_item()
+        finally:
+            disable_processor_offloading()
+    assert len(processor_threads) == 1
+    assert processor_threads[0] != threading.get_ident()
+
+    assert item.metadata is not None
+    assert expected_item.metadata is not None
+    item.metadata.dateDownloaded = expected_item.metadata.dateDownloaded
+    assert item == expected_item
+    assert item.description == "Bar\n\nBaz"
+    assert item.descriptionHtml == expected_item.descriptionHtml
+    assert item.breadcrumbs is not None
+    assert [breadcrumb.url for breadcrumb in item.breadcrumbs] == [
+        "https://example.com/",
+        "https://example.com/foo",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_processor_offloading_default_executor():
+    executor = enable_processor_offloading(max_workers=1)
+    try:
+        item = await _page().to_item()
+    finally:
+        disable_processor_offloading()
+    assert item.name == "FOO"
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+
+class UnhashableProcessor:
+    def __eq__(self, other):
+        return isinstance(other, UnhashableProcessor)
+
+    def __call__(self, value, page):
+        return value.lower()
+
+
+@pytest.mark.asyncio
+async def test_processor_offloading_unhashable_processor():
+    class UnhashableProcessorPage(CustomProductPage):
+        class Processors(CustomProductPage.Processors):
+            name = [UnhashableProcessor()]
+
+    enable_processor_offloading(max_workers=1)
+    try:
+        page = UnhashableProcessorPage(
+            response=HttpResponse(url="https://example.com", body=HTML)
+        )
+        item = await page.to_item()
+    finally:
+        disable_processor_offloading()
+    assert item.name == "foo"
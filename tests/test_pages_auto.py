@@ -145,3 +145,50 @@ async def test_extended(
     page = ExtendedPage(**kwargs)
     expected_item = ExtendedItem(**item_kwargs, foo="bar")
     await assert_expected_item(page, expected_item)
+
+
+@pytest.mark.parametrize(*PARAMS)
+@pytest.mark.asyncio
+async def test_unmodified_passthrough(
+    item_cls: Type, item_kwargs: Dict[str, Any], cls: Type, param: str
+) -> None:
+    item = item_cls(**item_kwargs)
+    page = cls(**{param: item, "request_url": RequestUrl("https://example.com")})
+    assert await page.to_item() is item
+
+
+@pytest.mark.asyncio
+async def test_modified_passthrough() -> None:
+    class CustomProductPage(AutoProductPage):
+        @field
+        def name(self):
+            return "Custom name"
+
+    item = Product(**_PRODUCT_ALL_KWARGS)
+    item._unknown_fields_dict["foo"] = "bar"
+    page = CustomProductPage(
+        product=item, request_url=RequestUrl("https://example.com")
+    )
+    result = await page.to_item()
+    assert result is not item
+    assert result.name == "Custom name"
+    assert item.name == _PRODUCT_ALL_KWARGS["name"]
+    assert result._unknown_fields_dict == {"foo": "bar"}
+    for name in attrs.fields_dict(Product):
+        if name != "name":
+            assert getattr(result, name) is getattr(item, name)
+
+
+@pytest.mark.asyncio
+async def test_modified_processors_passthrough() -> None:
+    class CustomProductPage(AutoProductPage):
+        class Processors(AutoProductPage.Processors):
+            name = [str.upper]
+
+    item = Product(**_PRODUCT_ALL_KWARGS)
+    page = CustomProductPage(
+        product=item, request_url=RequestUrl("https://example.com")
+    )
+    result = await page.to_item()
+    assert result.name == _PRODUCT_ALL_KWARGS["name"].upper()
+    assert result.price == item.price
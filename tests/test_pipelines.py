@@ -5,6 +5,7 @@ scrapy = pytest.importorskip("scrapy")  # noqa
 import sys
 import warnings
 from copy import deepcopy
+from typing import Dict
 from unittest.mock import MagicMock, patch
 
 from zyte_common_items import (
@@ -17,7 +18,11 @@ from zyte_common_items import (
     ProductNavigation,
 )
 from zyte_common_items.base import ProbabilityMixin
-from zyte_common_items.pipelines import DropLowProbabilityItemPipeline
+from zyte_common_items.pipelines import (
+    DropDuplicateItemPipeline,
+    DropLowProbabilityItemPipeline,
+    DropUnchangedItemPipeline,
+)
 
 
 @pytest.mark.parametrize(
@@ -284,6 +289,272 @@ def test_process_item(items, item_proba, threshold, expected_stats_calls):
             assert len(calls) == count
 
 
+def _duplicate_pipeline(settings=None):
+    from scrapy.settings import Settings
+
+    mock_crawler = MagicMock(spec=["spider", "stats"])
+    mock_crawler.spider.settings = Settings(settings or {})
+    return DropDuplicateItemPipeline(mock_crawler), mock_crawler
+
+
+def _process_items(pipeline, spider, items, reason="it is a duplicate"):
+    kept = []
+    for item in items:
+        try:
+            kept.append(pipeline.process_item(item, spider))
+        except scrapy.exceptions.DropItem as e:
+            assert f"This item is dropped since {reason}:" in str(e)
+    return kept
+
+
+def _stats(mock_crawler):
+    stats: Dict[str, int] = {}
+    for args, _ in mock_crawler.stats.inc_value.call_args_list:
+        stats[args[0]] = stats.get(args[0], 0) + 1
+    return stats
+
+
+def test_drop_duplicate_item_default():
+    pipeline, crawler = _duplicate_pipeline()
+    items = [
+        Product.from_dict(
+            {
+                "url": "https://example.com/1",
+                "metadata": {"dateDownloaded": "2024-01-01T00:00:00Z"},
+            }
+        ),
+        Product.from_dict(
+            {
+                "url": "https://example.com/1",
+                "metadata": {"dateDownloaded": "2024-01-02T00:00:00Z"},
+            }
+        ),
+        Product(url="https://example.com/1", name="foo"),
+        Product(url="https://example.com/2"),
+        Article(url="https://example.com/2"),
+        {"url": "https://example.com/2"},
+        {"url": "https://example.com/2"},
+    ]
+    kept = _process_items(pipeline, crawler.spider, items)
+    assert kept == [items[0], *items[2:]]
+    assert _stats(crawler) == {
+        "drop_duplicate_item/processed": 5,
+        "drop_duplicate_item/processed/Product": 4,
+        "drop_duplicate_item/processed/Article": 1,
+        "drop_duplicate_item/kept": 4,
+        "drop_duplicate_item/kept/Product": 3,
+        "drop_duplicate_item/kept/Article": 1,
+        "drop_duplicate_item/dropped": 1,
+        "drop_duplicate_item/dropped/Product": 1,
+    }
+
+
+def test_drop_duplicate_item_fields():
+    pipeline, crawler = _duplicate_pipeline(
+        {
+            "DUPLICATE_ITEM_FIELDS": {
+                "zyte_common_items.Product": ["url", "gtin.value"],
+                "default": ["url"],
+            }
+        }
+    )
+    items = [
+        Product.from_dict(
+            {"url": "https://example.com/1", "gtin": [{"type": "a", "value": "1"}]}
+        ),
+        Product.from_dict(
+            {"url": "https://example.com/1", "gtin": [{"type": "b", "value": "1"}]}
+        ),
+        Product.from_dict(
+            {"url": "https://example.com/1", "gtin": [{"type": "a", "value": "2"}]}
+        ),
+        Article(url="https://example.com/1", headline="foo"),
+        Article(url="https://example.com/1", headline="bar"),
+        ProductNavigation(url=None),
+        ProductNavigation(url=None),
+    ]
+    kept = _process_items(pipeline, crawler.spider, items)
+    # Items with empty fingerprint fields are never dropped.
+    assert kept == [items[0], items[2], items[3], items[5], items[6]]
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {"DUPLICATE_ITEM_BLOOM_FILTER_CAPACITY": 1000},
+        {"DUPLICATE_ITEM_SPILL_THRESHOLD": 3},
+    ],
+)
+def test_drop_duplicate_item_bounded_memory(settings, tmp_path):
+    if "DUPLICATE_ITEM_SPILL_THRESHOLD" in settings:
+        settings["DUPLICATE_ITEM_SPILL_PATH"] = str(tmp_path / "fingerprints.db")
+    pipeline, crawler = _duplicate_pipeline(settings)
+    items = [Product(url=f"https://example.com/{i}") for i in range(10)]
+    kept = _process_items(pipeline, crawler.spider, items + items)
+    assert kept == items
+    assert len(pipeline.fingerprints) == 10
+    pipeline.close_spider(crawler.spider)
+
+    if "DUPLICATE_ITEM_SPILL_PATH" in settings:
+        # Fingerprints are persisted, so duplicates are detected across
+        # crawls.
+        pipeline, crawler = _duplicate_pipeline(settings)
+        kept = _process_items(
+            pipeline,
+            crawler.spider,
+            items[:2] + [Product(url="https://example.com/a")],
+        )
+        assert kept == [Product(url="https://example.com/a")]
+        pipeline.close_spider(crawler.spider)
+
+
+def test_drop_duplicate_item_bloom_filter_spill_conflict(tmp_path):
+    with pytest.raises(ValueError):
+        _duplicate_pipeline(
+            {
+                "DUPLICATE_ITEM_BLOOM_FILTER_CAPACITY": 1000,
+                "DUPLICATE_ITEM_SPILL_PATH": str(tmp_path / "fingerprints.db"),
+            }
+        )
+
+
+def _unchanged_pipeline(settings=None):
+    from scrapy.settings import Settings
+
+    mock_crawler = MagicMock(spec=["spider", "stats"])
+    mock_crawler.spider.settings = Settings(settings or {})
+    return DropUnchangedItemPipeline(mock_crawler), mock_crawler
+
+
+def _process_unchanged_items(pipeline, spider, items):
+    return _process_items(pipeline, spider, items, reason="it has not changed")
+
+
+def test_drop_unchanged_item_default():
+    pipeline, crawler = _unchanged_pipeline()
+    items = [
+        Product.from_dict(
+            {
+                "url": "https://example.com/1",
+                "price": "10.00",
+                "metadata": {"dateDownloaded": "2024-01-01T00:00:00Z"},
+            }
+        ),
+        Product.from_dict(
+            {
+                "url": "https://example.com/1",
+                "price": "10.00",
+                "metadata": {"dateDownloaded": "2024-01-02T00:00:00Z"},
+            }
+        ),
+        Product(url="https://example.com/1", price="9.00"),
+        Product(url="https://example.com/1", price="9.00"),
+        Article(url="https://example.com/1"),
+        Product(url=None),
+        Product(url=None),
+        {"url": "https://example.com/1"},
+    ]
+    kept = _process_unchanged_items(pipeline, crawler.spider, items)
+    # Items with empty key fields are never dropped.
+    assert kept == [items[0], items[2], *items[4:]]
+    assert _stats(crawler) == {
+        "drop_unchanged_item/processed": 5,
+        "drop_unchanged_item/processed/Product": 4,
+        "drop_unchanged_item/processed/Article": 1,
+        "drop_unchanged_item/kept": 3,
+        "drop_unchanged_item/kept/Product": 2,
+        "drop_unchanged_item/kept/Article": 1,
+        "drop_unchanged_item/dropped": 2,
+        "drop_unchanged_item/dropped/Product": 2,
+    }
+
+
+def test_drop_unchanged_item_diff(tmp_path):
+    settings = {
+        "CHANGED_ITEM_FIELDS": {
+            "zyte_common_items.Product": ["price", "availability", "gtin.value"],
+        },
+        "CHANGED_ITEM_KEY_FIELDS": {Product: ["url", "sku"]},
+        "CHANGED_ITEM_OUTPUT": "diff",
+        "CHANGED_ITEM_STATE_PATH": str(tmp_path / "state.db"),
+    }
+    pipeline, crawler = _unchanged_pipeline(settings)
+    items = [
+        Product.from_dict(
+            {"url": "https://example.com/1", "sku": "1", "price": "10.00"}
+        ),
+        Product.from_dict(
+            {"url": "https://example.com/1", "sku": "1", "price": "10.00", "name": "A"}
+        ),
+        Product.from_dict(
+            {
+                "url": "https://example.com/1",
+                "sku": "1",
+                "availability": "InStock",
+                "gtin": [{"type": "gtin8", "value": "1"}],
+            }
+        ),
+        Product.from_dict(
+            {
+                "url": "https://example.com/1",
+                "sku": "1",
+                "availability": "InStock",
+                "gtin": [{"type": "gtin13", "value": "1"}],
+            }
+        ),
+    ]
+    kept = _process_unchanged_items(pipeline, crawler.spider, items)
+    assert kept == [
+        {
+            "key": {"url": "https://example.com/1", "sku": "1"},
+            "changed": ["availability", "gtin.value", "price"],
+            "values": {"price": "10.00"},
+        },
+        {
+            "key": {"url": "https://example.com/1", "sku": "1"},
+            "changed": ["availability", "gtin.value", "price"],
+            "values": {"availability": "InStock", "gtin": [{"value": "1"}]},
+        },
+    ]
+    pipeline.close_spider(crawler.spider)
+
+    # The state is persisted, so changes are detected across crawls.
+    pipeline, crawler = _unchanged_pipeline(settings)
+    items = [
+        items[3],
+        Product.from_dict(
+            {"url": "https://example.com/1", "sku": "1", "availability": "OutOfStock"}
+        ),
+    ]
+    kept = _process_unchanged_items(pipeline, crawler.spider, items)
+    assert kept == [
+        {
+            "key": {"url": "https://example.com/1", "sku": "1"},
+            "changed": ["availability", "gtin.value"],
+            "values": {"availability": "OutOfStock"},
+        },
+    ]
+    pipeline.close_spider(crawler.spider)
+
+    # Changing the watched fields makes every field count as changed.
+    settings["CHANGED_ITEM_FIELDS"] = {"zyte_common_items.Product": ["price"]}
+    pipeline, crawler = _unchanged_pipeline(settings)
+    kept = _process_unchanged_items(pipeline, crawler.spider, items[1:])
+    assert kept == [
+        {
+            "key": {"url": "https://example.com/1", "sku": "1"},
+            "changed": ["price"],
+            "values": {},
+        },
+    ]
+    pipeline.close_spider(crawler.spider)
+
+
+def test_drop_unchanged_item_output():
+    with pytest.raises(ValueError):
+        _unchanged_pipeline({"CHANGED_ITEM_OUTPUT": "fields"})
+
+
 @pytest.mark.parametrize(
     "item, expected_name",
     [
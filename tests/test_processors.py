@@ -4,7 +4,7 @@ import pytest
 from lxml.html import fromstring
 from parsel import Selector, SelectorList
 from price_parser import Price
-from web_poet import HttpResponse, field
+from web_poet import HttpResponse, RequestUrl, field
 from zyte_parsers import Breadcrumb as zp_Breadcrumb
 from zyte_parsers import Gtin as zp_Gtin
 from zyte_parsers import extract_breadcrumbs
@@ -373,6 +373,15 @@ def test_rating_3_values():
                 Image("https://www.url.com/img2.jpg"),
             ],
         ),
+        (
+            [
+                {"url": RequestUrl("https://www.url.com/img1.jpg")},
+                {"url": 1},
+                {"url": None},
+                {"url": ["https://www.url.com/img2.jpg"]},
+            ],
+            [Image("https://www.url.com/img1.jpg")],
+        ),
     ],
 )
 def test_images(input_value, expected_value):
@@ -385,6 +394,27 @@ def test_images(input_value, expected_value):
     assert page.images == expected_value
 
 
+def test_images_relative_duplicates():
+    class ImagesPage(ProductPage):
+        @field(out=[images_processor])
+        def images(self):
+            return self.css("img::attr(src)").getall()
+
+    response = HttpResponse(
+        url="http://www.example.com/a/",
+        body=(
+            b"<html><head><base href='/b/'></head><body>"
+            b"<img src='1.jpg'><img src=' /b/1.jpg'><img src='../2.jpg'>"
+            b"</body></html>"
+        ),
+    )
+    page = ImagesPage(response=response)
+    assert page.images == [
+        Image(url="http://www.example.com/b/1.jpg"),
+        Image(url="http://www.example.com/2.jpg"),
+    ]
+
+
 def test_images_page():
     class MyProductPage(ProductPage):
         @field
@@ -0,0 +1,109 @@
+import json
+import subprocess
+import sys
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from zyte_common_items import Product, ProductNavigation
+from zyte_common_items.envelope import from_envelope, get_item_types
+from zyte_common_items.testing import (
+    DEFAULT_LIST_SIZE,
+    FakeZyteAPIServer,
+    fake_zyte_api_response,
+    generate_item_data,
+)
+from zyte_common_items.validation import validate
+
+
+def test_generate_item_data():
+    data = generate_item_data(Product, url="https://a.example/1")
+    assert data == generate_item_data(Product, url="https://a.example/1")
+    assert data != generate_item_data(Product, url="https://a.example/2")
+    assert data != generate_item_data(Product, url="https://a.example/1", seed=1)
+    assert data["url"] == "https://a.example/1"
+    assert len(data["images"]) == DEFAULT_LIST_SIZE
+    assert data["variants"][0]["url"].startswith("https://a.example/")
+
+    data = generate_item_data(Product, sizes={"variants": 5, "images": 0})
+    assert len(data["variants"]) == 5
+    assert "images" not in data
+    assert "images" not in data["variants"][0]
+
+    data = generate_item_data(ProductNavigation, sizes={"items": 7})
+    assert len(ProductNavigation.from_dict(data).items or []) == 7
+
+    with pytest.raises(ValueError):
+        generate_item_data(dict)
+
+
+def test_fake_zyte_api_response():
+    request = {"url": "https://a.example", "browserHtml": True}
+    request.update(dict.fromkeys(get_item_types(), True))
+    response = fake_zyte_api_response(request)
+    assert response["url"] == "https://a.example"
+    assert response["statusCode"] == 200
+    assert "https://a.example" in response["browserHtml"]
+    assert "httpResponseBody" not in response
+    items = from_envelope(response)
+    assert set(items) == set(get_item_types())
+    for item in items.values():
+        assert validate(item) == {}
+
+    with pytest.raises(ValueError):
+        fake_zyte_api_response({"product": True})
+
+
+def _post(url, data):
+    request = Request(
+        f"{url}extract", data=data, headers={"Content-Type": "application/json"}
+    )
+    with urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_fake_zyte_api_server():
+    with FakeZyteAPIServer(sizes={"variants": 3}) as server:
+        assert server.url.startswith("http://127.0.0.1:")
+        request = {"url": "https://a.example", "product": True}
+        response = _post(server.url, json.dumps(request).encode())
+        assert response == fake_zyte_api_response(request, sizes={"variants": 3})
+        assert len(response["product"]["variants"]) == 3
+
+        with pytest.raises(HTTPError) as exc_info:
+            _post(server.url, b"[]")
+        assert exc_info.value.code == 400
+        error = json.loads(exc_info.value.read())
+        assert error["type"] == "/request/invalid"
+        assert server.request_count == 2
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--ae"],
+        ["--html-paragraphs", "2", "--offload"],
+    ],
+)
+def test_benchmark(args):
+    pytest.importorskip("scrapy", minversion="2.10")
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "zyte_common_items.benchmark",
+            "--pages",
+            "2",
+            "--products-per-page",
+            "3",
+            *args,
+        ],
+        capture_output=True,
+        check=True,
+    )
+    output = json.loads(result.stdout)
+    assert output["items"] == 6
+    assert output["items_per_second"] > 0
+    assert output["cpu_seconds_per_item"] > 0
+    assert "max_reactor_lag_seconds" in output
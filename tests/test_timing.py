@@ -0,0 +1,190 @@
+from copy import copy
+
+import pytest
+from web_poet import HttpResponse, RequestUrl, field
+
+from zyte_common_items import AutoProductPage, Product, ProductPage
+from zyte_common_items.timing import (
+    FieldTimings,
+    disable_field_timing,
+    enable_field_timing,
+    get_field_timings,
+)
+
+HTML = b"""
+<!DOCTYPE html>
+<html>
+    <body>
+        <h1>Foo</h1>
+        <div class="price">$13.2</div>
+        <div class="description"><p>Bar</p></div>
+    </body>
+</html>
+"""
+
+
+class CustomProductPage(ProductPage):
+    @field
+    def name(self):
+        return self.css("h1::text").get()
+
+    @field
+    def price(self):
+        return self.css(".price")
+
+    @field
+    async def description(self):
+        return self.css(".description")
+
+
+def _page():
+    return CustomProductPage(
+        response=HttpResponse(url="https://example.com", body=HTML)
+    )
+
+
+@pytest.mark.asyncio
+async def test_field_timing():
+    assert get_field_timings() is None
+    expected_item = await _page().to_item()
+
+    timings = enable_field_timing()
+    try:
+        assert get_field_timings() is timings
+        item = await _page().to_item()
+        await _page().to_item()
+    finally:
+        assert disable_field_timing() is timings
+    assert get_field_timings() is None
+
+    assert type(item) is Product
+    assert item.metadata is not None
+    assert expected_item.metadata is not None
+    assert item.metadata.dateDownloaded is not None
+    item.metadata.dateDownloaded = expected_item.metadata.dateDownloaded
+    assert item == expected_item
+    assert item.price == "13.20"
+    assert item.description == "Bar"
+
+    page_timings = timings.get(CustomProductPage)
+    for key in (
+        "name",
+        "price",
+        "price:price_processor",
+        "description",
+        "description:description_processor",
+        "metadata:metadata_processor",
+        "url",
+    ):
+        assert page_timings[key].count == 2, key
+        assert sum(page_timings[key].histogram) == 2, key
+        assert page_timings[key].total >= page_timings[key].max > 0, key
+    assert page_timings["price"].total >= page_timings["price:price_processor"].total
+
+    # Disabled timing is not recorded.
+    await _page().to_item()
+    assert timings.get(CustomProductPage)["price"].count == 2
+
+
+class CustomAutoProductPage(AutoProductPage):
+    @field
+    def name(self):
+        return "Custom name"
+
+
+@pytest.mark.asyncio
+async def test_field_timing_auto_page():
+    item = Product(url="https://example.com", additionalProperties=[])
+    item._unknown_fields_dict["foo"] = "bar"
+    request_url = RequestUrl("https://example.com")
+
+    timings = enable_field_timing()
+    try:
+        page = AutoProductPage(product=item, request_url=request_url)
+        assert await page.to_item() is item
+        custom_page = CustomAutoProductPage(product=item, request_url=request_url)
+        result = await custom_page.to_item()
+    finally:
+        disable_field_timing()
+
+    assert result.name == "Custom name"
+    assert result.additionalProperties == []
+    assert result._unknown_fields_dict == {"foo": "bar"}
+    assert timings.get(AutoProductPage) == {}
+    assert list(timings.get(CustomAutoProductPage)) == ["name"]
+
+
+calls: list = []
+
+
+class CachedFieldPage(ProductPage):
+    @field(cached=True)
+    def name(self):
+        calls.append(None)
+        return "Foo"
+
+    @field
+    def description(self):
+        return self.name
+
+
+@pytest.mark.asyncio
+async def test_field_timing_cached_field():
+    calls.clear()
+    timings = enable_field_timing()
+    try:
+        page = CachedFieldPage(response=HttpResponse(url="https://a.example", body=b""))
+        item = await page.to_item()
+    finally:
+        disable_field_timing()
+    assert item.name == item.description == "Foo"
+    assert len(calls) == 1
+    assert timings.get(CachedFieldPage)["name"].count == 1
+
+
+def test_field_timings_stats():
+    timings = FieldTimings(buckets=[0.1, 0.01])
+    assert timings.buckets == (0.01, 0.1)
+    timings.record(CustomProductPage, "price", 0.001)
+    timings.record(CustomProductPage, "price", 0.05)
+    timings.record(CustomProductPage, "price", 5)
+    prefix = "field_timing/tests.test_timing.CustomProductPage/price"
+    assert timings.to_stats() == {
+        f"{prefix}/count": 3,
+        f"{prefix}/total": 5.051,
+        f"{prefix}/max": 5,
+        f"{prefix}/histogram": {"<=0.01": 1, "<=0.1": 1, ">0.1": 1},
+    }
+
+
+@pytest.mark.asyncio
+async def test_field_timing_addon(monkeypatch):
+    pytest.importorskip("scrapy", minversion="2.10")
+    from itemadapter import ItemAdapter
+    from scrapy.exceptions import NotConfigured
+    from scrapy.utils.test import get_crawler
+
+    from zyte_common_items import Addon
+    from zyte_common_items._addon import _FieldTimingExtension
+
+    # The add-on changes the global itemadapter configuration.
+    monkeypatch.setattr(
+        ItemAdapter, "ADAPTER_CLASSES", copy(ItemAdapter.ADAPTER_CLASSES)
+    )
+    crawler = get_crawler(settings_dict={"ADDONS": {Addon: 400}})
+    assert _FieldTimingExtension in crawler.settings.getdict("EXTENSIONS")
+    with pytest.raises(NotConfigured):
+        _FieldTimingExtension.from_crawler(crawler)
+
+    crawler = get_crawler(
+        settings_dict={"ADDONS": {Addon: 400}, "ZYTE_COMMON_ITEMS_FIELD_TIMING": True}
+    )
+    extension = _FieldTimingExtension.from_crawler(crawler)
+    extension.spider_opened(None)
+    await _page().to_item()
+    extension.spider_closed(None)
+    assert get_field_timings() is None
+    prefix = "field_timing/tests.test_timing.CustomProductPage"
+    assert crawler.stats is not None
+    assert crawler.stats.get_value(f"{prefix}/price/count") == 1
+    assert crawler.stats.get_value(f"{prefix}/price:price_processor/count") == 1
@@ -0,0 +1,96 @@
+import attrs
+import pytest
+from web_poet import HttpResponse, RequestUrl, field
+
+from zyte_common_items import BasePage, Image, ProductPage
+from zyte_common_items.processors import images_processor
+from zyte_common_items.urls import (
+    URLResolver,
+    canonicalize_url,
+    disable_url_canonicalization,
+    enable_url_canonicalization,
+    get_url_resolver,
+)
+
+
+@pytest.mark.parametrize(
+    ("url", "kwargs", "expected"),
+    [
+        ("https://example.com/a#b", {}, "https://example.com/a"),
+        ("https://example.com/a?b=2&a=1", {}, "https://example.com/a?a=1&b=2"),
+        (
+            "https://example.com/?utm_medium=x&id=1&gclid=2&UTM_X=3",
+            {},
+            "https://example.com/?UTM_X=3&id=1",
+        ),
+        (
+            "https://example.com/?id=1&ref=2&utm_source=3",
+            {"remove_parameters": {"ref"}},
+            "https://example.com/?id=1&utm_source=3",
+        ),
+        (
+            "https://example.com/?gclid=1",
+            {"remove_parameters": ()},
+            "https://example.com/?gclid=1",
+        ),
+        ("https://example.com/?gclid=1", {}, "https://example.com/"),
+    ],
+)
+def test_canonicalize_url(url, kwargs, expected):
+    assert canonicalize_url(url, **kwargs) == expected
+
+
+def test_url_resolver():
+    resolver = URLResolver("https://example.com/a/b")
+    assert resolver.base_url == "https://example.com/a/b"
+    assert resolver.resolve(" c?y=1&x=2#d ") == "https://example.com/a/c?y=1&x=2#d"
+    assert resolver.resolve("//other.example/") == "https://other.example/"
+
+    resolver = URLResolver("https://example.com/a/b", canonicalize=True)
+    assert resolver.resolve("c?y=1&x=2#d") == "https://example.com/a/c?x=2&y=1"
+
+    resolver = URLResolver(None)
+    assert resolver.base_url is None
+    assert resolver.resolve(" c ") == "c"
+
+
+def test_get_url_resolver():
+    response = HttpResponse(
+        "https://example.com/a/",
+        b"<html><head><base href='https://cdn.example/'></head></html>",
+    )
+    page = ProductPage(response=response)
+    resolver = get_url_resolver(page)
+    assert resolver is get_url_resolver(page)
+    assert resolver.base_url == "https://cdn.example/"
+    assert resolver.resolve("1.jpg") == "https://cdn.example/1.jpg"
+
+    page2 = BasePage(request_url=RequestUrl("https://example.com/a/"))
+    assert get_url_resolver(page2).base_url == "https://example.com/a/"
+
+    @attrs.define(slots=True)
+    class SlottedPage:
+        url: str
+
+    slotted = SlottedPage("https://example.com")
+    assert get_url_resolver(slotted).base_url == "https://example.com"
+    assert get_url_resolver(slotted) is not get_url_resolver(slotted)
+    assert get_url_resolver(None).base_url is None
+
+
+def test_url_canonicalization():
+    class ImagesPage(BasePage):
+        @field(out=[images_processor])
+        def images(self):
+            return ["/1.jpg?b=1&a=2#x", "/1.jpg?a=2&b=1&utm_source=y", "/2.jpg"]
+
+    url = RequestUrl("https://example.com/")
+    enable_url_canonicalization()
+    try:
+        assert ImagesPage(url).images == [
+            Image(url="https://example.com/1.jpg?a=2&b=1"),
+            Image(url="https://example.com/2.jpg"),
+        ]
+    finally:
+        disable_url_canonicalization()
+    assert len(ImagesPage(url).images) == 3
@@ -1,6 +1,13 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
 import attrs
 import pytest
 
+from zyte_common_items import Item
+from zyte_common_items._class_cache import _ClassCache
 from zyte_common_items.util import split_in_unknown_and_known_fields
 
 
@@ -26,3 +33,54 @@ def test_split_in_unknown_and_known_fields():
 
     with pytest.raises(ValueError):
         split_in_unknown_and_known_fields(input, str)
+
+
+def test_class_cache_threads():
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def compute(cls):
+        calls.append(cls)
+        time.sleep(0.01)
+        return object()
+
+    cache = _ClassCache(compute)
+    results = []
+
+    def read():
+        barrier.wait()
+        results.append(cache[_TestItem])
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == [_TestItem]
+    assert len({id(result) for result in results}) == 1
+    assert _TestItem in cache
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_from_dict_threads():
+    @attrs.define
+    class Child(Item):
+        value: str
+
+    @attrs.define
+    class Parent(Item):
+        url: str
+        children: List[Child] = attrs.Factory(list)
+
+    data = {"url": "https://example.com", "children": [{"value": "a", "x": 1}]}
+    with ThreadPoolExecutor(8) as executor:
+        items = list(
+            executor.map(
+                lambda fields: Parent.from_dict(data, fields=fields),
+                [None, ["children.value"]] * 50,
+            )
+        )
+    assert items[0] == items[1] == Parent.from_dict(data)
+    assert items[0].children[0]._unknown_fields_dict == {"x": 1}
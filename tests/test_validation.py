@@ -0,0 +1,194 @@
+import pytest
+
+from zyte_common_items import (
+    Article,
+    Gtin,
+    Product,
+    ProductMetadata,
+    SearchRequestTemplate,
+)
+from zyte_common_items.validation import (
+    get_validation_messages,
+    validate,
+    validate_items,
+)
+
+
+def test_valid():
+    product = Product.from_dict(
+        {
+            "url": "https://example.com/a",
+            "canonicalUrl": "http://example.com/a",
+            "price": "1234.56",
+            "regularPrice": "2000",
+            "availability": "InStock",
+            "gtin": [
+                {"type": "gtin13", "value": "9780201379624"},
+                {"type": "isbn10", "value": "0201379627"},
+                {"type": "issn", "value": "0378-5955"},
+                {"type": "upc", "value": "036000291452"},
+            ],
+            "images": [{"url": "https://example.com/a.png"}],
+            "metadata": {
+                "dateDownloaded": "2024-01-01T00:00:00Z",
+                "probability": 0.5,
+            },
+        }
+    )
+    assert get_validation_messages(product) == {}
+    assert validate(product) == {}
+    assert product.metadata is not None
+    assert product.metadata.validationMessages is None
+
+    article = Article(
+        url="https://example.com",
+        datePublished="2024-01-01T00:00:00.123+02:00",
+    )
+    assert get_validation_messages(article) == {}
+    article = Article(url="https://example.com", datePublished="2024-01-01T00:00:00")
+    assert get_validation_messages(article) == {}
+
+
+@pytest.mark.parametrize(
+    ("data", "path", "message"),
+    [
+        ({"url": ""}, "url", "Missing required field."),
+        ({"url": "/a"}, "url", "Expected an absolute HTTP(S) URL, got '/a'."),
+        (
+            {"canonicalUrl": "ftp://example.com"},
+            "canonicalUrl",
+            "Expected an absolute HTTP(S) URL, got 'ftp://example.com'.",
+        ),
+        (
+            {"price": "1,234.56"},
+            "price",
+            "Expected a decimal number like '1234.56', got '1,234.56'.",
+        ),
+        (
+            {"regularPrice": "-1"},
+            "regularPrice",
+            "Expected a decimal number like '1234.56', got '-1'.",
+        ),
+        (
+            {"availability": "in stock"},
+            "availability",
+            "Expected one of 'InStock', 'OutOfStock', got 'in stock'.",
+        ),
+        (
+            {"metadata": {"dateDownloaded": "2024-01-01"}},
+            "metadata.dateDownloaded",
+            "Expected an ISO 8601 date and time, got '2024-01-01'.",
+        ),
+        (
+            {"metadata": {"dateDownloaded": "2024-13-01T00:00:00Z"}},
+            "metadata.dateDownloaded",
+            "Expected an ISO 8601 date and time, got '2024-13-01T00:00:00Z'.",
+        ),
+        (
+            {"metadata": {"probability": 1.5}},
+            "metadata.probability",
+            "Expected a number from 0 to 1, got 1.5.",
+        ),
+        (
+            {
+                "gtin": [
+                    {"type": "gtin8", "value": "96385074"},
+                    {"type": "gtin8", "value": "96385075"},
+                ]
+            },
+            "gtin[1].value",
+            "'96385075' has an invalid gtin8 check digit.",
+        ),
+        (
+            {"gtin": [{"type": "isbn13", "value": "123"}]},
+            "gtin[0].value",
+            "'123' is not a valid isbn13 value.",
+        ),
+        (
+            {"gtin": [{"type": "ean", "value": "9780201379624"}]},
+            "gtin[0].type",
+            (
+                "Expected one of 'gtin13', 'gtin14', 'gtin8', 'isbn10', 'isbn13', "
+                "'ismn', 'issn', 'upc', got 'ean'."
+            ),
+        ),
+        (
+            {"gtin": [{"type": "", "value": "9780201379624"}]},
+            "gtin[0].type",
+            "Missing required field.",
+        ),
+        (
+            {"mainImage": {"url": "data:image/png;base64," + "A" * 1000}},
+            "mainImage.url",
+            "Expected an HTTP(S) URL, got a data URI ('data:image/png;base64,AAAAAAAAAA'...).",
+        ),
+        (
+            {"images": [{"url": "https://example.com/a.png"}, {"url": "a.png"}]},
+            "images[1].url",
+            "Expected an absolute HTTP(S) URL, got 'a.png'.",
+        ),
+        (
+            {"variants": [{"url": "https://example.com/b", "price": "free"}]},
+            "variants[0].price",
+            "Expected a decimal number like '1234.56', got 'free'.",
+        ),
+    ],
+)
+def test_invalid(data, path, message):
+    data = {"url": "https://example.com", **data}
+    product = Product.from_dict(data)
+    assert get_validation_messages(product) == {path: [message]}
+
+
+def test_validate_metadata():
+    product = Product(
+        url="https://example.com",
+        price="foo",
+        metadata=ProductMetadata(validationMessages={"price": ["Custom message."]}),
+    )
+    messages = validate(product)
+    expected_message = "Expected a decimal number like '1234.56', got 'foo'."
+    assert messages == {"price": [expected_message]}
+    assert product.metadata is not None
+    assert product.metadata.validationMessages == {
+        "price": ["Custom message.", expected_message]
+    }
+    validate(product)
+    assert product.metadata.validationMessages == {
+        "price": ["Custom message.", expected_message]
+    }
+
+    product = Product(url="foo")
+    assert validate(product) == {
+        "url": ["Expected an absolute HTTP(S) URL, got 'foo'."]
+    }
+    assert product.metadata is None
+
+    product = Product(url="foo", metadata=ProductMetadata())
+    validate(product)
+    assert product.metadata is not None
+    assert product.metadata.validationMessages == {
+        "url": ["Expected an absolute HTTP(S) URL, got 'foo'."]
+    }
+
+
+def test_validate_items():
+    items = [
+        Product(url="https://example.com", metadata=ProductMetadata()),
+        Product(url="https://example.com", price="a", metadata=ProductMetadata()),
+        Gtin(type="gtin13", value="9780201379625"),
+    ]
+    assert validate_items(items) == [
+        {},
+        {"price": ["Expected a decimal number like '1234.56', got 'a'."]},
+        {"value": ["'9780201379625' has an invalid gtin13 check digit."]},
+    ]
+    product = items[1]
+    assert isinstance(product, Product)
+    assert product.metadata is not None
+    assert product.metadata.validationMessages == validate_items(items)[1]
+
+
+def test_skipped_classes():
+    template = SearchRequestTemplate(url="{{ query }}")
+    assert get_validation_messages(template) == {}
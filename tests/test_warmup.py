@@ -0,0 +1,90 @@
+import logging
+import subprocess
+import sys
+from typing import List, Optional, Union
+
+import attrs
+import pytest
+from web_poet import field
+
+from zyte_common_items import Item, Product, ProductPage, ae, warmup
+from zyte_common_items.ae import AEProduct
+from zyte_common_items.base import _SUB_FIELD_PLANS, _TRUSTED_PLANS
+from zyte_common_items.pages.base import _AUTO_OVERRIDDEN_FIELDS
+from zyte_common_items.pages.mixins import _METADATA_CLASSES
+from zyte_common_items.util import _CLASS_ATTRS
+from zyte_common_items.validation import _RULES
+
+
+@attrs.define
+class Child(Item):
+    value: str
+
+
+@attrs.define
+class Parent(Item):
+    children: List[Child] = attrs.Factory(list)
+
+
+class CustomProductPage(ProductPage):
+    @field
+    def name(self):
+        return "foo"
+
+
+def test_warmup_classes(monkeypatch):
+    frozen = []
+    monkeypatch.setattr("gc.freeze", lambda: frozen.append(True))
+    for cache in (_CLASS_ATTRS, _TRUSTED_PLANS, _SUB_FIELD_PLANS, _RULES):
+        cache.clear()
+    _METADATA_CLASSES.clear()
+
+    warmup([Parent, CustomProductPage], freeze=True)
+    assert frozen == [True]
+    for cache in (_CLASS_ATTRS, _TRUSTED_PLANS, _SUB_FIELD_PLANS, _RULES):
+        assert Parent in cache
+        assert Child not in cache
+    assert CustomProductPage in _METADATA_CLASSES
+
+    with pytest.raises(ValueError):
+        warmup([str])
+    assert frozen == [True]
+
+
+def test_warmup_default(caplog, monkeypatch):
+    @attrs.define
+    class Invalid(Item):
+        value: Optional[Union[str, int]] = None
+
+    for cache in (_CLASS_ATTRS, _SUB_FIELD_PLANS):
+        cache.clear()
+    _METADATA_CLASSES.clear()
+    _AUTO_OVERRIDDEN_FIELDS.clear()
+    # Other tests remove the module, which AEProduct annotations need.
+    monkeypatch.setitem(sys.modules, "zyte_common_items.ae", ae)
+
+    with caplog.at_level(logging.DEBUG, logger="zyte_common_items._warmup"):
+        warmup()
+    assert f"Skipping the warmup of {Invalid!r}." in caplog.messages
+    for cls in (Item, Child, Parent, Product, AEProduct):
+        assert cls in _SUB_FIELD_PLANS
+        assert cls in _CLASS_ATTRS
+    assert Invalid in _CLASS_ATTRS
+    assert Invalid not in _SUB_FIELD_PLANS
+    assert CustomProductPage in _METADATA_CLASSES
+    assert ProductPage in _METADATA_CLASSES
+
+    with pytest.raises(ValueError):
+        warmup([Invalid])
+
+
+def test_warmup_default_ae():
+    # Classes of modules not imported yet, and their import side effects,
+    # e.g. the deprecation warning of zyte_common_items.ae, are not included.
+    code = (
+        "import sys, zyte_common_items; zyte_common_items.warmup(); "
+        "assert 'zyte_common_items.ae' not in sys.modules"
+    )
+    subprocess.run(
+        [sys.executable, "-W", "error::DeprecationWarning", "-c", code], check=True
+    )
@@ -249,6 +249,7 @@ __all__ = [
     "ZyteItemAdapter",
     "ZyteItemKeepEmptyAdapter",
     "is_data_container",
+    "warmup",
 ]
 
 try:
@@ -260,3 +261,5 @@ except ImportError:  # Scrapy is not installed.
 
 # Register serialization support for all Item subclasses
 from . import serialization  # noqa: F401
+
+from ._warmup import warmup  # isort: skip
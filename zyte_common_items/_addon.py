@@ -1,11 +1,22 @@
 from collections import deque
+from pathlib import Path
 
 from itemadapter import ItemAdapter
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
 from scrapy.settings import BaseSettings
 from scrapy.utils.misc import load_object
+from scrapy.utils.project import data_path
 
 from . import ZyteItemAdapter, ZyteItemKeepEmptyAdapter
+from .cache import (
+    DEFAULT_MAX_SIZE,
+    ExtractionCache,
+    disable_extraction_cache,
+    enable_extraction_cache,
+)
 from .log_formatters import ZyteLogFormatter
+from .timing import disable_field_timing, enable_field_timing
 
 
 def _setdefault(settings, setting, cls, pos):
@@ -23,6 +34,70 @@ def _setdefault(settings, setting, cls, pos):
     settings[setting][cls] = pos
 
 
+class _FieldTimingExtension:
+    """Enables field timing while the spider is open, and stores the
+    resulting timings as stats when the spider closes."""
+
+    def __init__(self, crawler):
+        self.stats = crawler.stats
+        self.timings = None
+        crawler.signals.connect(self.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("ZYTE_COMMON_ITEMS_FIELD_TIMING"):
+            raise NotConfigured
+        return cls(crawler)
+
+    def spider_opened(self, spider):
+        self.timings = enable_field_timing()
+
+    def spider_closed(self, spider):
+        disable_field_timing()
+        if self.timings is None:
+            return
+        for key, value in self.timings.to_stats().items():
+            self.stats.set_value(key, value)
+
+
+class _ExtractionCacheExtension:
+    """Enables the extraction cache while the spider is open, and stores its
+    hit and miss counts as stats when the spider closes."""
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        self.stats = crawler.stats
+        self.path = data_path(settings["ZYTE_COMMON_ITEMS_EXTRACTION_CACHE"])
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_size = settings.getint(
+            "ZYTE_COMMON_ITEMS_EXTRACTION_CACHE_SIZE", DEFAULT_MAX_SIZE
+        )
+        self.cache = None
+        crawler.signals.connect(self.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.get("ZYTE_COMMON_ITEMS_EXTRACTION_CACHE"):
+            raise NotConfigured
+        return cls(crawler)
+
+    def spider_opened(self, spider):
+        self.cache = enable_extraction_cache(
+            ExtractionCache(self.path, max_size=self.max_size)
+        )
+
+    def spider_closed(self, spider):
+        disable_extraction_cache()
+        if self.cache is None:
+            return
+        for key, value in self.cache.to_stats().items():
+            self.stats.set_value(key, value)
+        self.cache.close()
+        self.cache = None
+
+
 class Addon:
     def update_settings(self, settings: BaseSettings) -> None:
         if not any(
@@ -34,3 +109,5 @@ class Addon:
             )
 
         settings.set("LOG_FORMATTER", ZyteLogFormatter, priority="addon")
+        _setdefault(settings, "EXTENSIONS", _FieldTimingExtension, 0)
+        _setdefault(settings, "EXTENSIONS", _ExtractionCacheExtension, 0)
@@ -0,0 +1,51 @@
+"""Per-class caches that are safe to use from concurrent threads, including
+on free-threaded builds of Python."""
+
+import threading
+from typing import Any, Callable, Generic, TypeVar
+from weakref import WeakKeyDictionary
+
+_T = TypeVar("_T")
+
+# Held while computing missing cache values. It is shared by all caches, and
+# reentrant, because computing a value may need values from other caches,
+# e.g. projections need trusted plans, and per-cache locks could deadlock.
+_MISS_LOCK = threading.RLock()
+
+
+class _ClassCache(Generic[_T]):
+    """Cache of the values that *compute* returns for each class.
+
+    Hits are a single lookup in a :class:`~weakref.WeakKeyDictionary`,
+    without locking. On a miss, the value is computed while holding a lock,
+    so that it is computed only once, and then published with a single
+    assignment, so that concurrent readers never see a partial value.
+    """
+
+    __slots__ = ("_compute", "_values")
+
+    def __init__(self, compute: Callable[[Any], _T]):
+        self._compute = compute
+        self._values: WeakKeyDictionary = WeakKeyDictionary()
+
+    def __getitem__(self, cls: Any) -> _T:
+        try:
+            return self._values[cls]
+        except KeyError:
+            pass
+        with _MISS_LOCK:
+            try:
+                return self._values[cls]
+            except KeyError:
+                value = self._values[cls] = self._compute(cls)
+                return value
+
+    def __contains__(self, cls: Any) -> bool:
+        return cls in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def clear(self) -> None:
+        with _MISS_LOCK:
+            self._values.clear()
@@ -0,0 +1,562 @@
+import argparse
+import asyncio
+import bz2
+import gzip
+import json
+import lzma
+import os
+import sys
+import time
+from array import array
+from base64 import b64decode
+from collections import deque
+from functools import partial
+from importlib import import_module
+from itertools import count, islice
+from multiprocessing import Pool
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+import attrs
+from web_poet import (
+    HttpResponse,
+    HttpResponseBody,
+    HttpResponseHeaders,
+    ItemPage,
+    RequestUrl,
+    ResponseUrl,
+)
+
+from ._class_cache import _ClassCache
+from .base import Item
+from .serialization import ZCEItemAdapter
+
+_MAGIC_NUMBERS: List[Tuple[bytes, Callable[..., Any]]] = [
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+]
+_EXTENSIONS: Dict[str, Callable[..., Any]] = {
+    ".bz2": bz2.open,
+    ".gz": gzip.open,
+    ".lzma": lzma.open,
+    ".xz": lzma.open,
+}
+
+# (input name, record number, data) of an input record. For item commands,
+# data is a line of JSON. For extract, it is a (kind, value) tuple, see
+# _build_page().
+_Record = Tuple[str, int, Any]
+# (input name, record number, output line, error message, seconds) of a
+# processed record.
+_Result = Tuple[str, int, Optional[str], Optional[str], float]
+
+
+def _open_input(path: str) -> IO[bytes]:
+    """Return a binary file object to read *path*, ``"-"`` for standard
+    input, decompressing it if its first bytes are those of a gzip, bzip2 or
+    xz file."""
+    if path == "-":
+        file = sys.stdin.buffer
+    else:
+        file = open(path, "rb")
+    peek = getattr(file, "peek", None)
+    head = peek(6) if peek is not None else b""
+    for magic_number, open_ in _MAGIC_NUMBERS:
+        if head.startswith(magic_number):
+            return open_(file)
+    return file
+
+
+def _open_output(path: str) -> IO[bytes]:
+    """Return a binary file object to write *path*, ``"-"`` for standard
+    output, compressing it based on the file extension of *path*."""
+    if path == "-":
+        return sys.stdout.buffer
+    for extension, open_ in _EXTENSIONS.items():
+        if path.endswith(extension):
+            return open_(path, "wb")
+    return open(path, "wb")
+
+
+def _iter_records(paths: Iterable[str]) -> Iterator[_Record]:
+    for path in paths:
+        file = _open_input(path)
+        try:
+            for line_number, line in zip(count(1), file):
+                if line.strip():
+                    yield path, line_number, line
+        finally:
+            if file is not sys.stdin.buffer:
+                file.close()
+
+
+def _iter_warc_records(path: str) -> Iterator[_Record]:
+    try:
+        from warcio.archiveiterator import ArchiveIterator
+    except ImportError:
+        raise RuntimeError(f"Reading {path!r} requires warcio (pip install warcio).")
+    with open(path, "rb") as file:
+        responses = (
+            record
+            for record in ArchiveIterator(file)
+            if record.rec_type == "response" and record.http_headers is not None
+        )
+        for number, record in zip(count(1), responses):
+            http_headers = record.http_headers
+            response = (
+                record.rec_headers.get_header("WARC-Target-URI"),
+                int(http_headers.get_statuscode() or 200),
+                list(http_headers.headers),
+                record.content_stream().read(),
+            )
+            yield path, number, ("response", response)
+
+
+def _iter_page_records(paths: Iterable[str]) -> Iterator[_Record]:
+    """Yield the records of *paths*, each a web-poet fixture directory, which
+    may contain many fixtures at any depth, a WARC file, or a JSON Lines file
+    of responses."""
+    for path in paths:
+        if path != "-" and os.path.isdir(path):
+            for inputs in sorted(Path(path).glob("**/inputs")):
+                if inputs.is_dir():
+                    fixture = str(inputs.parent)
+                    yield fixture, 1, ("fixture", fixture)
+        elif path.endswith((".warc", ".warc.gz")):
+            yield from _iter_warc_records(path)
+        else:
+            for name, line_number, line in _iter_records([path]):
+                yield name, line_number, ("json", line)
+
+
+def _load_item_cls(name: str) -> Type[Item]:
+    """Return the item class with the specified *name*, either the name of a
+    class exported by :mod:`zyte_common_items` or an import path."""
+    module_name, _, class_name = name.rpartition(".")
+    try:
+        module = import_module(module_name or "zyte_common_items")
+    except ImportError:
+        raise argparse.ArgumentTypeError(f"Cannot import {module_name!r}.")
+    item_cls = getattr(module, class_name, None)
+    if not isinstance(item_cls, type) or not issubclass(item_cls, Item):
+        raise argparse.ArgumentTypeError(f"{name!r} is not an item class.")
+    return item_cls
+
+
+def _load_page_cls(name: str) -> Type[ItemPage]:
+    """Return the page object class with the specified *name*, an import
+    path."""
+    module_name, _, class_name = name.rpartition(".")
+    try:
+        module = import_module(module_name)
+    except (ImportError, ValueError):
+        raise argparse.ArgumentTypeError(f"Cannot import {module_name!r}.")
+    page_cls = getattr(module, class_name, None)
+    if not isinstance(page_cls, type) or not issubclass(page_cls, ItemPage):
+        raise argparse.ArgumentTypeError(f"{name!r} is not a page object class.")
+    return page_cls
+
+
+def _to_json(item: Any) -> str:
+    return json.dumps(ZCEItemAdapter(item).asdict(), ensure_ascii=False)
+
+
+def _validate(item: Item) -> Optional[str]:
+    return None
+
+
+def _convert(item: Item) -> Optional[str]:
+    from .ae import downgrade
+
+    return _to_json(downgrade(item))
+
+
+def _normalize(item: Item) -> Optional[str]:
+    return _to_json(item)
+
+
+_COMMANDS: Dict[str, Tuple[Callable[[Item], Optional[str]], str]] = {
+    "validate": (
+        _validate,
+        "Report the records that cannot be loaded as items of the specified type.",
+    ),
+    "convert": (
+        _convert,
+        "Convert records into the schema of Zyte Automatic Extraction, as "
+        "zyte_common_items.ae.downgrade does.",
+    ),
+    "normalize": (
+        _normalize,
+        "Load records as items of the specified type and write them back "
+        "without empty fields.",
+    ),
+}
+
+
+def _process(
+    function: Callable[[Item], Optional[str]], item_cls: Type[Item], record: _Record
+) -> _Result:
+    path, line_number, line = record
+    start = time.perf_counter()
+    try:
+        data = json.loads(line)
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected a JSON object, got {data!r}.")
+        output = function(item_cls.from_dict(data))
+    except (TypeError, ValueError) as exception:
+        return path, line_number, None, str(exception), time.perf_counter() - start
+    except Exception as exception:  # Any error of item or conversion code.
+        error = f"{type(exception).__name__}: {exception}"
+        return path, line_number, None, error, time.perf_counter() - start
+    return path, line_number, output, None, time.perf_counter() - start
+
+
+# Page inputs that extract can build from a response.
+_PAGE_INPUTS: Dict[Any, Callable[[HttpResponse], Any]] = {
+    HttpResponse: lambda response: response,
+    HttpResponseBody: lambda response: response.body,
+    HttpResponseHeaders: lambda response: response.headers,
+    RequestUrl: lambda response: RequestUrl(str(response.url)),
+    ResponseUrl: lambda response: response.url,
+}
+# Page inputs by name, for page object classes with postponed annotations.
+_PAGE_INPUT_NAMES = {cls.__name__: cls for cls in _PAGE_INPUTS}
+
+
+def _compute_page_inputs(
+    page_cls: type,
+) -> Tuple[Tuple[str, Callable[[HttpResponse], Any]], ...]:
+    inputs = []
+    for field in attrs.fields(page_cls):
+        if not field.init:
+            continue
+        # Not get_type_hints(), which fails with the annotations of some
+        # web-poet versions, e.g. ResponseShortcutsMixin.response in 0.14.
+        annotation = field.type
+        if isinstance(annotation, str):
+            annotation = _PAGE_INPUT_NAMES.get(annotation, annotation)
+        if annotation in _PAGE_INPUTS:
+            name = getattr(field, "alias", None) or field.name.lstrip("_")
+            inputs.append((name, _PAGE_INPUTS[annotation]))
+        elif field.default is attrs.NOTHING:
+            raise ValueError(
+                f"Cannot build the {field.name} input of {page_cls.__name__} "
+                f"({annotation!r}) from a response."
+            )
+    return tuple(inputs)
+
+
+# Caches the constructor arguments of each page object class that extract
+# builds from responses.
+_PAGE_INPUT_PLANS: _ClassCache[
+    Tuple[Tuple[str, Callable[[HttpResponse], Any]], ...]
+] = _ClassCache(_compute_page_inputs)
+
+
+def _parse_response(line: bytes) -> HttpResponse:
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object, got {data!r}.")
+    url = data.get("url")
+    if not isinstance(url, str) or not url:
+        raise ValueError(f"Expected a URL as the url field, got {url!r}.")
+    if data.get("httpResponseBody") is not None:
+        body = b64decode(data["httpResponseBody"])
+    else:
+        text = data.get("body", data.get("browserHtml"))
+        if not isinstance(text, str):
+            raise ValueError(
+                "Expected the response body as body, httpResponseBody or "
+                f"browserHtml, got {text!r}."
+            )
+        body = text.encode()
+    headers = data.get("headers", data.get("httpResponseHeaders")) or {}
+    if isinstance(headers, dict):
+        headers = HttpResponseHeaders(headers)
+    else:
+        headers = HttpResponseHeaders(
+            (header["name"], header["value"]) for header in headers
+        )
+    status = data.get("status", data.get("statusCode"))
+    return HttpResponse(url, body, status=status, headers=headers)
+
+
+def _build_page(page_cls: Type[ItemPage], kind: str, value: Any) -> ItemPage:
+    """Return a page object of *page_cls* for *value*: a fixture directory
+    path if *kind* is ``"fixture"``, a ``(url, status, headers, body)``
+    tuple if it is ``"response"``, or a JSON line of a response if it is
+    ``"json"``."""
+    if kind == "fixture":
+        from web_poet.serialization import SerializedDataFileStorage, deserialize
+
+        storage = SerializedDataFileStorage(Path(value) / "inputs")
+        return deserialize(page_cls, storage.read())
+    if kind == "response":
+        url, status, headers, body = value
+        response = HttpResponse(
+            url, body, status=status, headers=HttpResponseHeaders(headers)
+        )
+    else:
+        response = _parse_response(value)
+    kwargs = {name: get(response) for name, get in _PAGE_INPUT_PLANS[page_cls]}
+    return page_cls(**kwargs)
+
+
+# Event loop of the current process, reused for every page.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _run(coroutine: Any) -> Any:
+    """Run *coroutine* in the event loop of the current process."""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        # Worker processes never return from main(), so their loop is closed
+        # when they exit.
+        Finalize(None, _close_loop, exitpriority=0)
+    return _loop.run_until_complete(coroutine)
+
+
+def _close_loop() -> None:
+    global _loop
+    if _loop is not None:
+        _loop.close()
+        _loop = None
+
+
+def _process_page(page_cls: Type[ItemPage], record: _Record) -> _Result:
+    path, number, (kind, value) = record
+    start = time.perf_counter()
+    try:
+        page = _build_page(page_cls, kind, value)
+        output = _to_json(_run(page.to_item()))
+    except Exception as exception:  # Any error of page object code.
+        error = f"{type(exception).__name__}: {exception}"
+        return path, number, None, error, time.perf_counter() - start
+    return path, number, output, None, time.perf_counter() - start
+
+
+def _process_chunk(
+    function: Callable[[_Record], _Result], chunk: List[_Record]
+) -> List[_Result]:
+    return [function(record) for record in chunk]
+
+
+def _imap_bounded(
+    pool: Any,
+    function: Callable[[_Record], _Result],
+    records: Iterator[_Record],
+    chunk_size: int,
+    max_chunks: int,
+) -> Iterator[_Result]:
+    """Like :meth:`Pool.imap() <multiprocessing.pool.Pool.imap>`, but only
+    read *records* as needed to keep *max_chunks* chunks of *chunk_size*
+    records in flight, instead of reading all of them upfront."""
+    pending: Deque[Any] = deque()
+    chunks = iter(lambda: list(islice(records, chunk_size)), [])
+    for chunk in chunks:
+        pending.append(pool.apply_async(_process_chunk, (function, chunk)))
+        if len(pending) >= max_chunks:
+            yield from pending.popleft().get()
+    while pending:
+        yield from pending.popleft().get()
+
+
+def _percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """Return the nearest-rank *percent* percentile of *sorted_values*."""
+    index = max(0, -(-len(sorted_values) * percent // 100) - 1)
+    return sorted_values[int(index)]
+
+
+def _add_common_arguments(subparser: argparse.ArgumentParser, chunk_size: int) -> None:
+    subparser.add_argument(
+        "-e",
+        "--errors",
+        default=None,
+        help=(
+            "File where to write errors as JSON Lines. Standard error is "
+            "used by default."
+        ),
+    )
+    subparser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes. Output order is preserved. Default: 1.",
+    )
+    subparser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=chunk_size,
+        help=(
+            "Number of records sent to a worker process at a time. "
+            f"Default: {chunk_size}."
+        ),
+    )
+    subparser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="Do not report the processing speed.",
+    )
+
+
+_OUTPUT_HELP = (
+    "Output file. Standard output is written by default or for -. It is "
+    "compressed if it ends in .gz, .bz2, .xz or .lzma."
+)
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m zyte_common_items",
+        description=(
+            "Process JSON Lines files of items. Input files may be gzip, "
+            "bzip2 or xz compressed."
+        ),
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command, (_, description) in _COMMANDS.items():
+        subparser = subparsers.add_parser(
+            command, help=description, description=description
+        )
+        subparser.add_argument(
+            "inputs",
+            metavar="INPUT",
+            nargs="*",
+            default=["-"],
+            help="Input files. Standard input is read by default or for -.",
+        )
+        subparser.add_argument(
+            "-t",
+            "--type",
+            dest="item_cls",
+            type=_load_item_cls,
+            default="Product",
+            help=(
+                "Item class of the records, either the name of a class from "
+                "zyte_common_items (e.g. Article) or an import path. "
+                "Default: Product."
+            ),
+        )
+        if command != "validate":
+            subparser.add_argument("-o", "--output", default="-", help=_OUTPUT_HELP)
+        _add_common_arguments(subparser, chunk_size=256)
+    description = (
+        "Build page objects of the specified class from archived responses "
+        "and write the items that they return."
+    )
+    subparser = subparsers.add_parser(
+        "extract", help=description, description=description
+    )
+    subparser.add_argument(
+        "inputs",
+        metavar="INPUT",
+        nargs="*",
+        default=["-"],
+        help=(
+            "Directories of web-poet fixtures, WARC files (.warc, .warc.gz), "
+            "or JSON Lines files of responses. Standard input is read by "
+            "default or for -."
+        ),
+    )
+    subparser.add_argument(
+        "-p",
+        "--page",
+        dest="page_cls",
+        type=_load_page_cls,
+        required=True,
+        help="Import path of the page object class.",
+    )
+    subparser.add_argument("-o", "--output", default="-", help=_OUTPUT_HELP)
+    _add_common_arguments(subparser, chunk_size=8)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the ``python -m zyte_common_items`` command with *argv* and return
+    its exit code: ``0`` if every record was processed successfully, ``1``
+    otherwise."""
+    args = _get_parser().parse_args(argv)
+    process: Callable[[_Record], _Result]
+    if args.command == "extract":
+        process = partial(_process_page, args.page_cls)
+        records = _iter_page_records(args.inputs)
+    else:
+        function = _COMMANDS[args.command][0]
+        process = partial(_process, function, args.item_cls)
+        records = _iter_records(args.inputs)
+    output = _open_output(getattr(args, "output", "-"))
+    errors = sys.stderr if args.errors is None else open(args.errors, "w")
+    pool = Pool(args.jobs) if args.jobs > 1 else None
+    total = failed = 0
+    latencies = array("d")
+    start = time.perf_counter()
+    try:
+        results: Iterable[_Result]
+        if pool is None:
+            results = map(process, records)
+        else:
+            results = _imap_bounded(
+                pool, process, records, args.chunk_size, 2 * args.jobs
+            )
+        for path, line_number, result, error, seconds in results:
+            total += 1
+            latencies.append(seconds)
+            if error is not None:
+                failed += 1
+                errors.write(
+                    json.dumps({"input": path, "line": line_number, "error": error})
+                    + "\n"
+                )
+            elif result is not None:
+                output.write(result.encode() + b"\n")
+        if pool is not None:
+            # Let worker processes exit normally, closing their event loop.
+            pool.close()
+            pool.join()
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        _close_loop()
+        if output is not sys.stdout.buffer:
+            output.close()
+        else:
+            output.flush()
+        if errors is not sys.stderr:
+            errors.close()
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        rate = total / elapsed if elapsed else 0
+        sys.stderr.write(
+            f"Processed {total} records ({failed} failed) in {elapsed:.2f}s "
+            f"({rate:.0f} records/s).\n"
+        )
+        if args.command == "extract" and latencies:
+            values = sorted(latencies)
+            sys.stderr.write(
+                "Latency per page: "
+                + ", ".join(
+                    f"p{percent} {_percentile(values, percent) * 1000:.1f}ms"
+                    for percent in (50, 90, 99)
+                )
+                + f", max {values[-1] * 1000:.1f}ms.\n"
+            )
+    return 1 if failed else 0
@@ -0,0 +1,200 @@
+"""Compact sets of 64-bit fingerprints used for deduplication, and stores
+of field hashes used for change detection."""
+
+import math
+import sqlite3
+from typing import Dict, Optional, Set
+
+_MASK_64 = (1 << 64) - 1
+
+
+def _to_signed(fingerprint: int) -> int:
+    # SQLite integers are signed 64-bit integers.
+    return fingerprint - (1 << 64) if fingerprint >= (1 << 63) else fingerprint
+
+
+class _FingerprintSet:
+    """Exact set of fingerprints.
+
+    Only the lowest 64 bits of each fingerprint are kept.
+    """
+
+    def __init__(self):
+        self._fingerprints: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def add(self, fingerprint: int) -> bool:
+        """Add *fingerprint* and return ``True`` if it was not in the set."""
+        fingerprint &= _MASK_64
+        if fingerprint in self._fingerprints:
+            return False
+        self._fingerprints.add(fingerprint)
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class _BloomFilter:
+    """Probabilistic set of fingerprints with a fixed memory footprint.
+
+    :meth:`add` may report a new fingerprint as already seen with a
+    probability of about *error_rate*, as long as no more than *capacity*
+    fingerprints are added.
+
+    Fingerprints must have at least 128 bits of entropy, the bit positions
+    are derived from them through double hashing.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        if capacity <= 0:
+            raise ValueError(f"capacity must be a positive integer, got {capacity!r}")
+        if not 0 < error_rate < 1:
+            raise ValueError(
+                f"error_rate must be between 0 and 1 (exclusive), got {error_rate!r}"
+            )
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._size = max(bits, 8)
+        self._hash_count = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, fingerprint: int) -> bool:
+        """Add *fingerprint* and return ``True`` if it was not in the set."""
+        h1 = fingerprint & _MASK_64
+        h2 = ((fingerprint >> 64) & _MASK_64) | 1
+        bits, size = self._bits, self._size
+        new = False
+        for i in range(self._hash_count):
+            position = (h1 + i * h2) % size
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self._count += 1
+        return new
+
+    def close(self) -> None:
+        pass
+
+
+class _SpillingFingerprintSet:
+    """Exact set of fingerprints that keeps up to *max_in_memory*
+    fingerprints in memory, and moves them to an SQLite database at *path*
+    when that limit is reached.
+
+    Only the lowest 64 bits of each fingerprint are kept.
+    """
+
+    def __init__(self, path: str, max_in_memory: int = 1_000_000):
+        self._memory: Set[int] = set()
+        self._max_in_memory = max_in_memory
+        self._connection: Optional[sqlite3.Connection] = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints "
+            "(fingerprint INTEGER PRIMARY KEY) WITHOUT ROWID"
+        )
+        self._on_disk = self._connection.execute(
+            "SELECT COUNT(*) FROM fingerprints"
+        ).fetchone()[0]
+
+    def __len__(self) -> int:
+        return len(self._memory) + self._on_disk
+
+    def _is_on_disk(self, fingerprint: int) -> bool:
+        if not self._on_disk:
+            return False
+        assert self._connection is not None
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM fingerprints WHERE fingerprint = ?",
+                (_to_signed(fingerprint),),
+            ).fetchone()
+            is not None
+        )
+
+    def _spill(self) -> None:
+        assert self._connection is not None
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO fingerprints VALUES (?)",
+                ((_to_signed(fingerprint),) for fingerprint in self._memory),
+            )
+        self._on_disk += len(self._memory)
+        self._memory.clear()
+
+    def add(self, fingerprint: int) -> bool:
+        """Add *fingerprint* and return ``True`` if it was not in the set."""
+        fingerprint &= _MASK_64
+        if fingerprint in self._memory or self._is_on_disk(fingerprint):
+            return False
+        self._memory.add(fingerprint)
+        if len(self._memory) >= self._max_in_memory:
+            self._spill()
+        return True
+
+    def close(self) -> None:
+        if self._connection is None:
+            return
+        if self._memory:
+            self._spill()
+        self._connection.close()
+        self._connection = None
+
+
+class _FieldHashStore:
+    """Map of 64-bit item keys to the field hashes of the last seen version
+    of each item.
+
+    Hashes are kept in memory, or in an SQLite database at *path* if
+    specified. Changes to the database are committed every
+    *commit_interval* writes and on :meth:`close`.
+    """
+
+    def __init__(self, path: Optional[str] = None, commit_interval: int = 10_000):
+        self._memory: Dict[int, bytes] = {}
+        self._connection: Optional[sqlite3.Connection] = None
+        self._commit_interval = commit_interval
+        self._pending = 0
+        if path is not None:
+            self._connection = sqlite3.connect(path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS field_hashes "
+                "(key INTEGER PRIMARY KEY, hashes BLOB) WITHOUT ROWID"
+            )
+
+    def get(self, key: int) -> Optional[bytes]:
+        key &= _MASK_64
+        if self._connection is None:
+            return self._memory.get(key)
+        row = self._connection.execute(
+            "SELECT hashes FROM field_hashes WHERE key = ?", (_to_signed(key),)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, key: int, hashes: bytes) -> None:
+        key &= _MASK_64
+        if self._connection is None:
+            self._memory[key] = hashes
+            return
+        self._connection.execute(
+            "INSERT OR REPLACE INTO field_hashes VALUES (?, ?)",
+            (_to_signed(key), hashes),
+        )
+        self._pending += 1
+        if self._pending >= self._commit_interval:
+            self._connection.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        if self._connection is None:
+            return
+        self._connection.commit()
+        self._connection.close()
+        self._connection = None
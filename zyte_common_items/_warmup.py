@@ -0,0 +1,111 @@
+import gc
+import logging
+import sys
+from typing import Iterable, Iterator, Optional
+
+import attrs
+from web_poet.fields import get_fields_dict
+
+from . import cache
+from .base import (
+    _FINGERPRINT_FIELDS,
+    _SUB_FIELD_PLANS,
+    _TRUSTED_PLANS,
+    Item,
+    is_data_container,
+)
+from .fields import _get_field_processors, _takes_page
+from .pages.base import _AUTO_OVERRIDDEN_FIELDS, _BasePage
+from .pages.mixins import _METADATA_CLASSES
+from .util import _CLASS_ATTRS
+from .validation import _RULES
+
+logger = logging.getLogger(__name__)
+
+
+def _iter_subclasses(cls: type) -> Iterator[type]:
+    seen = set()
+    pending = [cls]
+    while pending:
+        for subclass in pending.pop().__subclasses__():
+            if subclass not in seen:
+                seen.add(subclass)
+                pending.append(subclass)
+                yield subclass
+
+
+def _iter_default_classes() -> Iterator[type]:
+    yield Item
+    yield from _iter_subclasses(Item)
+    yield from _iter_subclasses(_BasePage)
+
+
+def _warm_item_class(item_cls: type) -> None:
+    if not attrs.has(item_cls):
+        return
+    _CLASS_ATTRS[item_cls]
+    _FINGERPRINT_FIELDS[item_cls]
+    _TRUSTED_PLANS[item_cls]
+    _SUB_FIELD_PLANS[item_cls]
+    _RULES[item_cls]
+    arrow = sys.modules.get("zyte_common_items.arrow")
+    if arrow is not None:
+        arrow._STRUCT_COLUMNS[item_cls]
+
+
+def _warm_page_class(page_cls: type) -> None:
+    _METADATA_CLASSES[page_cls]
+    if getattr(page_cls, "_auto_item_attribute", None) is not None:
+        _AUTO_OVERRIDDEN_FIELDS[page_cls]
+    for name in get_fields_dict(page_cls):
+        for processor in _get_field_processors(page_cls, name):
+            _takes_page(processor)
+    if cache.get_extraction_cache() is not None:
+        cache._CACHEABLE[page_cls]
+        cache._CODE_VERSIONS[page_cls]
+
+
+def warmup(classes: Optional[Iterable[type]] = None, *, freeze: bool = False) -> None:
+    """Precompute the information that zyte-common-items caches for each
+    :ref:`item <items>`, :ref:`component <components>` and :ref:`page object
+    <page-objects>` class.
+
+    *classes* are the item, component and page object classes to warm up.
+    The default is every subclass of :class:`~zyte_common_items.Item` and of
+    the page object classes of zyte-common-items that exists at the time of
+    the call, i.e. classes of modules that have not been imported yet, e.g.
+    ``zyte_common_items.ae``, are not included. Classes that are found this
+    way but cannot be used, e.g. because of an invalid type annotation, are
+    skipped, and logged at the debug level.
+
+    If *freeze* is ``True``, :func:`gc.freeze` is called afterwards, so that
+    the garbage collector of processes forked afterwards does not touch
+    objects created up to this point, and those processes can share their
+    memory pages with the parent process. Objects created up to this point
+    are then never garbage-collected, so only use it right before forking.
+
+    Call it in the parent process of a pre-fork server or worker pool, after
+    importing your own item and page object classes and before forking, so
+    that workers do not have to compute this information on their first
+    uses of each class.
+    """
+    # Remove the leftover, non-slotted originals of slotted attrs classes.
+    gc.collect()
+    explicit = classes is not None
+    for cls in classes if classes is not None else _iter_default_classes():
+        try:
+            if is_data_container(cls):
+                _warm_item_class(cls)
+            elif isinstance(cls, type) and issubclass(cls, _BasePage):
+                _warm_page_class(cls)
+            elif explicit:
+                raise ValueError(
+                    f"Expected an item, component or page object class, got "
+                    f"{cls!r}."
+                )
+        except Exception:
+            if explicit:
+                raise
+            logger.debug(f"Skipping the warmup of {cls!r}.", exc_info=True)
+    if freeze:
+        gc.freeze()
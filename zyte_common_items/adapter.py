@@ -1,11 +1,11 @@
 """This module offers better integration with the itemadapter package."""
 
 from types import MappingProxyType
-from typing import Any, Collection, Iterator, KeysView
+from typing import Any, Collection, Dict, Iterable, Iterator, KeysView, Union
 
-from itemadapter.adapter import AttrsAdapter
+from itemadapter.adapter import AttrsAdapter, ItemAdapter
 
-from zyte_common_items.base import Item
+from zyte_common_items.base import Item, _build_path_tree, _PathTree
 
 
 def _is_empty(value):
@@ -42,6 +42,8 @@ class ZyteItemAdapter(AttrsAdapter):
     -   Removes keys with empty values from the output of
         `ItemAdapter.asdict()`_, for a cleaner output.
 
+    -   Provides :meth:`asdict`, which can limit its output to some fields.
+
     .. _AttrsAdapter: https://github.com/scrapy/itemadapter#built-in-adapters
     .. _itemadapter: https://github.com/scrapy/itemadapter#itemadapter
     .. _ItemAdapter.asdict(): https://github.com/scrapy/itemadapter#asdict---dict
@@ -86,6 +88,53 @@ class ZyteItemAdapter(AttrsAdapter):
                 f"Object of type {self.item.__class__.__name__} does not contain a field with name {field_name}"
             )
 
+    def asdict(
+        self, *, fields: Union[str, Iterable[str], None] = None
+    ) -> Dict[str, Any]:
+        """Return the item data as a :class:`dict`, converting nested items
+        recursively, like `ItemAdapter.asdict()`_.
+
+        *fields* are field paths, with nested fields separated by dots, that
+        limit the output to those fields. Fields not selected are not
+        converted:
+
+        >>> from zyte_common_items import AggregateRating, Product
+        >>> product = Product(
+        ...     url="https://example.com",
+        ...     name="Foo",
+        ...     aggregateRating=AggregateRating(ratingValue=4.5, reviewCount=10),
+        ... )
+        >>> adapter = ZyteItemAdapter(product)
+        >>> adapter.asdict(fields=["url", "aggregateRating.ratingValue"])
+        {'aggregateRating': {'ratingValue': 4.5}, 'url': 'https://example.com'}
+
+        Paths into list fields apply to every list item, e.g.
+        ``"gtin.value"``.
+        """
+        return self._asdict(self.item, _build_path_tree(fields))
+
+    @classmethod
+    def _asdict(cls, value: Any, tree: Union[_PathTree, None]) -> Any:
+        if isinstance(value, Item):
+            adapter = cls(value)
+            return {
+                name: cls._asdict(adapter[name], None if tree is None else tree[name])
+                for name in adapter
+                if tree is None or name in tree
+            }
+        if isinstance(value, dict):
+            return {
+                key: cls._asdict(element, None if tree is None else tree[key])
+                for key, element in value.items()
+                if tree is None or key in tree
+            }
+        if isinstance(value, (list, set, tuple)):
+            return value.__class__(cls._asdict(element, tree) for element in value)
+        if not isinstance(value, (str, int, float)) and ItemAdapter.is_item(value):
+            # Other items, e.g. dataclass objects, like ItemAdapter.asdict().
+            return cls._asdict(ItemAdapter(value).asdict(), tree)
+        return value
+
     def __iter__(self) -> Iterator:
         fields = [
             attr
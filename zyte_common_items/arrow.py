@@ -0,0 +1,354 @@
+"""Columnar export of :ref:`items <items>` to `Apache Arrow`_ and Parquet_.
+
+.. _Apache Arrow: https://arrow.apache.org/
+.. _Parquet: https://parquet.apache.org/
+
+This module requires pyarrow_ to be installed.
+
+.. _pyarrow: https://arrow.apache.org/docs/python/
+
+The Arrow schema of an item class is derived from its field annotations:
+
+-   :class:`str`, :class:`int`, :class:`float`, :class:`bool` and
+    :class:`bytes` fields become ``string``, ``int64``, ``double``, ``bool``
+    and ``binary`` columns.
+
+-   Fields annotated with an item class, e.g.
+    :attr:`Product.brand <zyte_common_items.Product.brand>`, become ``struct``
+    columns.
+
+-   List fields, e.g. :attr:`Product.images <zyte_common_items.Product.images>`,
+    become ``list`` columns.
+
+-   Dictionary fields with :class:`str` keys and a supported value type, e.g.
+    :attr:`ProductMetadata.validationMessages
+    <zyte_common_items.ProductMetadata.validationMessages>`, become ``map``
+    columns.
+
+-   Any other field, e.g. :attr:`CustomAttributes.values
+    <zyte_common_items.CustomAttributes.values>`, becomes a ``string`` column
+    with the JSON representation of the field value. So do fields annotated
+    with the item class of an enclosing ``struct``, e.g.
+    ``AEProduct.hasVariants``, since Arrow types cannot be recursive.
+
+Every ``struct``, including the top-level schema, also gets an
+``_unknown_fields`` JSON ``string`` column with the :ref:`unknown fields
+<unknown-fields>` of the item, ``null`` if there are none.
+
+Columns are built directly from item attributes, one column at a time,
+without converting each item into a :class:`dict` first.
+"""
+
+import json
+import types
+from operator import attrgetter
+from typing import (
+    Any,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+import attrs
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ._class_cache import _ClassCache
+from .adapter import ZyteItemAdapter
+from .base import Item, is_data_container
+
+UNKNOWN_FIELDS_COLUMN = "_unknown_fields"
+"""Name of the column with the JSON representation of the :ref:`unknown
+fields <unknown-fields>` of items."""
+
+DEFAULT_BATCH_SIZE = 10_000
+"""Default number of items per record batch, and hence per Parquet row
+group."""
+
+_UNION_ORIGINS = (Union, types.UnionType)
+_SCALAR_TYPES = {
+    bool: pa.bool_(),
+    bytes: pa.binary(),
+    float: pa.float64(),
+    int: pa.int64(),
+    str: pa.string(),
+}
+
+
+class _Column:
+    arrow_type: pa.DataType
+
+    def build(self, values: List[Any]) -> pa.Array:
+        raise NotImplementedError
+
+
+class _ScalarColumn(_Column):
+    def __init__(self, arrow_type: pa.DataType):
+        self.arrow_type = arrow_type
+
+    def build(self, values: List[Any]) -> pa.Array:
+        return pa.array(values, type=self.arrow_type)
+
+
+def _item_to_json(value: Any) -> Any:
+    if is_data_container(type(value)):
+        return ZyteItemAdapter(value).asdict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _JsonColumn(_Column):
+    arrow_type = pa.string()
+
+    def build(self, values: List[Any]) -> pa.Array:
+        return pa.array(
+            [
+                (
+                    None
+                    if value is None
+                    else json.dumps(value, ensure_ascii=False, default=_item_to_json)
+                )
+                for value in values
+            ],
+            type=self.arrow_type,
+        )
+
+
+def _null_mask(values: List[Any]) -> Optional[pa.Array]:
+    mask = [value is None for value in values]
+    if not any(mask):
+        return None
+    return pa.array(mask, type=pa.bool_())
+
+
+class _ListColumn(_Column):
+    def __init__(self, child: _Column):
+        self.child = child
+        self.arrow_type = pa.list_(child.arrow_type)
+
+    def build(self, values: List[Any]) -> pa.Array:
+        offsets = [0]
+        flat_values: List[Any] = []
+        for value in values:
+            if value is not None:
+                flat_values.extend(value)
+            offsets.append(len(flat_values))
+        return pa.ListArray.from_arrays(
+            pa.array(offsets, type=pa.int32()),
+            self.child.build(flat_values),
+            type=self.arrow_type,
+            mask=_null_mask(values),
+        )
+
+
+class _MapColumn(_Column):
+    def __init__(self, child: _Column):
+        self.child = child
+        self.arrow_type = pa.map_(pa.string(), child.arrow_type)
+
+    def build(self, values: List[Any]) -> pa.Array:
+        offsets = [0]
+        keys: List[str] = []
+        items: List[Any] = []
+        for value in values:
+            if value is not None:
+                keys.extend(value.keys())
+                items.extend(value.values())
+            offsets.append(len(keys))
+        return pa.MapArray.from_arrays(
+            pa.array(offsets, type=pa.int32()),
+            pa.array(keys, type=pa.string()),
+            self.child.build(items),
+            type=self.arrow_type,
+            mask=_null_mask(values),
+        )
+
+
+class _StructColumn(_Column):
+    def __init__(self, item_cls: type, expanding: FrozenSet[type] = frozenset()):
+        self.item_cls = item_cls
+        hints = get_type_hints(item_cls)
+        # Item classes of the enclosing structs, to stop at recursive fields.
+        expanding = expanding | {item_cls}
+        self.columns: List[Tuple[str, _Column]] = [
+            (field.name, _get_column(hints.get(field.name, Any), expanding))
+            for field in attrs.fields(item_cls)
+        ]
+        self.fields = [
+            pa.field(name, column.arrow_type) for name, column in self.columns
+        ]
+        self.fields.append(pa.field(UNKNOWN_FIELDS_COLUMN, pa.string()))
+        self.arrow_type = pa.struct(self.fields)
+
+    def build_children(self, values: List[Any]) -> List[pa.Array]:
+        if any(value is None for value in values):
+            children = [
+                column.build(
+                    [
+                        None if value is None else getattr(value, name)
+                        for value in values
+                    ]
+                )
+                for name, column in self.columns
+            ]
+        else:
+            children = [
+                column.build(list(map(attrgetter(name), values)))
+                for name, column in self.columns
+            ]
+        children.append(
+            _JsonColumn().build(
+                [
+                    getattr(value, "_unknown_fields_dict", None) or None
+                    for value in values
+                ]
+            )
+        )
+        return children
+
+    def build(self, values: List[Any]) -> pa.Array:
+        return pa.StructArray.from_arrays(
+            self.build_children(values),
+            fields=self.fields,
+            mask=_null_mask(values),
+        )
+
+
+# Caches the column tree of each item class.
+_STRUCT_COLUMNS: _ClassCache[_StructColumn] = _ClassCache(_StructColumn)
+
+
+def _get_struct_column(item_cls: type) -> _StructColumn:
+    return _STRUCT_COLUMNS[item_cls]
+
+
+def _get_column(annotation: Any, expanding: FrozenSet[type]) -> _Column:
+    origin = get_origin(annotation)
+    if origin in _UNION_ORIGINS:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return _JsonColumn()
+        annotation = args[0]
+        origin = get_origin(annotation)
+    if annotation in _SCALAR_TYPES:
+        return _ScalarColumn(_SCALAR_TYPES[annotation])
+    if origin is list:
+        (arg,) = get_args(annotation) or (Any,)
+        return _ListColumn(_get_column(arg, expanding))
+    if origin is dict:
+        key, value = get_args(annotation) or (Any, Any)
+        child = _get_column(value, expanding)
+        if key is str and not isinstance(child, _JsonColumn):
+            return _MapColumn(child)
+        return _JsonColumn()
+    if isinstance(annotation, type) and is_data_container(annotation):
+        if annotation in expanding:
+            return _JsonColumn()
+        return _StructColumn(annotation, expanding)
+    return _JsonColumn()
+
+
+def get_arrow_schema(item_cls: Type[Item]) -> pa.Schema:
+    """Return the :class:`pyarrow.Schema` of *item_cls*.
+
+    >>> from zyte_common_items import Brand
+    >>> get_arrow_schema(Brand)
+    name: string
+    _unknown_fields: string
+    """
+    return pa.schema(_get_struct_column(item_cls).fields)
+
+
+def to_record_batch(
+    items: Sequence[Item], *, item_cls: Optional[Type[Item]] = None
+) -> pa.RecordBatch:
+    """Return a :class:`pyarrow.RecordBatch` with *items*, using the
+    :func:`schema <get_arrow_schema>` of *item_cls*.
+
+    If *item_cls* is not specified, the class of the first item is used.
+    All items must be instances of *item_cls*.
+    """
+    items = list(items)
+    if item_cls is None:
+        if not items:
+            raise ValueError("item_cls is required if there are no items.")
+        item_cls = type(items[0])
+    for item in items:
+        if type(item) is not item_cls:
+            raise ValueError(f"Expected a {item_cls} item, got {item!r}.")
+    column = _get_struct_column(item_cls)
+    return pa.RecordBatch.from_arrays(
+        column.build_children(items), schema=pa.schema(column.fields)
+    )
+
+
+def iter_record_batches(
+    items: Iterable[Item],
+    *,
+    item_cls: Optional[Type[Item]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[pa.RecordBatch]:
+    """Iterate *items* and yield them as record batches of up to *batch_size*
+    items each.
+
+    See :func:`to_record_batch`.
+    """
+    batch: List[Item] = []
+    for item in items:
+        if item_cls is None:
+            item_cls = type(item)
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield to_record_batch(batch, item_cls=item_cls)
+            batch = []
+    if batch:
+        yield to_record_batch(batch, item_cls=item_cls)
+
+
+def write_parquet(
+    items: Iterable[Item],
+    where: Any,
+    *,
+    item_cls: Optional[Type[Item]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    **kwargs: Any,
+) -> int:
+    """Write *items* into a Parquet file at *where*, a path or a writable
+    binary file object, and return the number of written items.
+
+    *items* can be any iterable, including a generator: items are converted
+    and written as they are iterated, one row group of up to *batch_size*
+    items at a time.
+
+    If *items* is empty, *item_cls* is required to determine the
+    :func:`schema <get_arrow_schema>`.
+
+    Additional keyword arguments are passed to
+    :class:`pyarrow.parquet.ParquetWriter`, e.g. ``compression``.
+    """
+    writer: Optional[pq.ParquetWriter] = None
+    count = 0
+    try:
+        for batch in iter_record_batches(
+            items, item_cls=item_cls, batch_size=batch_size
+        ):
+            if writer is None:
+                writer = pq.ParquetWriter(where, batch.schema, **kwargs)
+            writer.write_batch(batch)
+            count += batch.num_rows
+        if writer is None:
+            if item_cls is None:
+                raise ValueError("item_cls is required if there are no items.")
+            writer = pq.ParquetWriter(where, get_arrow_schema(item_cls), **kwargs)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
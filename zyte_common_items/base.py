@@ -1,11 +1,27 @@
 """The ``Item`` class should be used as the parent class for data containers."""
 
+import hashlib
 import types
 from collections import ChainMap
-from typing import Dict, List, Optional, Union, get_args, get_origin, get_type_hints
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
 
 import attrs
 
+from . import limits as _limits_module
+from ._class_cache import _ClassCache
+from .limits import InputLimits
 from .util import split_in_unknown_and_known_fields
 
 _Trail = Optional[str]
@@ -14,6 +30,18 @@ _UNDEFINED = object()
 # ``types.UnionType``.
 _UNION_ORIGINS = (Union, types.UnionType)
 
+# (field name, default value, item class of the field or of its list items,
+# whether the field is a list)
+_TrustedField = Tuple[str, Any, Any, bool]
+
+# A tree of field paths, e.g. {"metadata": {"dateDownloaded": None}}, where
+# None means that the whole field is selected.
+_PathTree = Dict[str, Any]
+
+# Maps the name of each field to read to the projection of its nested items,
+# or to None if the whole field is read.
+_Projection = Dict[str, Any]
+
 
 def is_data_container(cls_or_obj):
     """Used for discerning classes/instances if they are part of the Zyte Common
@@ -52,6 +80,480 @@ def _extend_trail(trail: _Trail, key: Union[int, str]):
     return trail
 
 
+def _where(trail: _Trail) -> str:
+    return trail or "the input"
+
+
+class _Guard:
+    """Enforces :class:`~zyte_common_items.limits.InputLimits` during a
+    :meth:`Item.from_dict` or :meth:`Item.from_list` call, keeping count of
+    the values read so far."""
+
+    __slots__ = (
+        "_max_depth",
+        "_max_list_length",
+        "_max_nodes",
+        "_max_string_length",
+        "_nodes",
+    )
+
+    def __init__(self, limits: InputLimits):
+        self._max_depth = limits.max_depth
+        self._max_list_length = limits.max_list_length
+        self._max_nodes = limits.max_nodes
+        self._max_string_length = limits.max_string_length
+        self._nodes = 0
+
+    def _count(self, nodes: int, trail: _Trail) -> None:
+        self._nodes += nodes
+        if self._max_nodes is not None and self._nodes > self._max_nodes:
+            raise ValueError(
+                f"Expected at most {self._max_nodes} values in the input, "
+                f"exceeded at {_where(trail)}."
+            )
+
+    def _check_depth(self, depth: int, trail: _Trail) -> None:
+        if self._max_depth is not None and depth > self._max_depth:
+            raise ValueError(
+                f"Expected {_where(trail)} to be nested at most "
+                f"{self._max_depth} levels deep, got {depth}."
+            )
+
+    def _check_length(self, value: List, trail: _Trail) -> None:
+        if self._max_list_length is not None and len(value) > self._max_list_length:
+            raise ValueError(
+                f"Expected {_where(trail)} to have at most "
+                f"{self._max_list_length} items, got {len(value)}."
+            )
+
+    def check_list(self, value: List, trail: _Trail, depth: int) -> None:
+        """Check a list of items, whose items are checked separately."""
+        self._check_depth(depth, trail)
+        self._count(1, trail)
+        self._check_length(value, trail)
+
+    def check_item(
+        self, item: Dict, trail: _Trail, depth: int, item_fields: FrozenSet[str]
+    ) -> None:
+        """Check the dict of an item, except for its *item_fields*, which are
+        checked separately."""
+        self._check_depth(depth, trail)
+        self._count(1, trail)
+        for key, value in item.items():
+            if key not in item_fields:
+                self._check_value(value, trail, key, depth + 1)
+
+    def _check_value(
+        self, value: Any, trail: _Trail, key: Union[int, str], depth: int
+    ) -> None:
+        # Trails are only built for containers and errors, to keep the check
+        # of scalar values cheap.
+        self._nodes += 1
+        if self._max_nodes is not None and self._nodes > self._max_nodes:
+            self._count(0, _extend_trail(trail, key))
+        if isinstance(value, str):
+            if (
+                self._max_string_length is not None
+                and len(value) > self._max_string_length
+            ):
+                raise ValueError(
+                    f"Expected {_extend_trail(trail, key)} to have at most "
+                    f"{self._max_string_length} characters, got {len(value)}."
+                )
+        elif isinstance(value, dict):
+            trail = _extend_trail(trail, key)
+            self._check_depth(depth, trail)
+            for sub_key, sub_value in value.items():
+                self._check_value(sub_value, trail, str(sub_key), depth + 1)
+        elif isinstance(value, list):
+            trail = _extend_trail(trail, key)
+            self._check_depth(depth, trail)
+            self._check_length(value, trail)
+            for index, sub_value in enumerate(value):
+                self._check_value(sub_value, trail, index, depth + 1)
+
+
+def _get_guard(limits: Optional[InputLimits]) -> Optional[_Guard]:
+    """Return a guard for *limits*, or for the limits enabled globally if
+    *limits* is ``None``, or ``None`` if there are no limits to enforce."""
+    if limits is None:
+        limits = _limits_module._limits
+        if limits is None:
+            return None
+    if (
+        limits.max_depth is None
+        and limits.max_list_length is None
+        and limits.max_nodes is None
+        and limits.max_string_length is None
+    ):
+        return None
+    return _Guard(limits)
+
+
+class _LazyItemList(list):
+    """List of items, read with :meth:`Item.from_dict` or
+    :meth:`Item.from_list` with ``lazy=True``, that stores the input
+    dictionaries and builds each item the first time that it is accessed.
+
+    Operations that need every item, like comparisons or :func:`repr`, build
+    all pending items first. Copies, slices, concatenations and pickles are
+    regular lists of items.
+
+    Code that reads the underlying list storage directly, like the C
+    implementations of :func:`json.dumps` and :meth:`str.join`, gets the
+    input dictionaries of pending items instead. Use :func:`list` to build
+    a regular list first.
+    """
+
+    __slots__ = ("_item_cls", "_trail", "_projection", "_guard", "_depth")
+
+    def __new__(
+        cls,
+        iterable: Iterable = (),
+        item_cls: Any = None,
+        trail=None,
+        projection=None,
+        guard=None,
+        depth=1,
+    ):
+        # Allows code like ItemAdapter.asdict() to build a copy with
+        # obj.__class__(iterable), getting a regular list.
+        if item_cls is None:
+            return list(iterable)  # type: ignore[return-value]
+        return super().__new__(cls)
+
+    def __init__(
+        self,
+        iterable: Iterable = (),
+        item_cls: Any = None,
+        trail=None,
+        projection=None,
+        guard=None,
+        depth=1,
+    ):
+        super().__init__(iterable)
+        self._item_cls = item_cls
+        self._trail: _Trail = trail
+        self._projection: Optional[_Projection] = projection
+        self._guard: Optional[_Guard] = guard
+        self._depth: int = depth
+
+    def _build(self, index: int) -> Any:
+        value = list.__getitem__(self, index)
+        if value is not None and not isinstance(value, self._item_cls):
+            if index < 0:
+                index += len(self)
+            value = self._item_cls._from_dict(
+                value,
+                trail=_extend_trail(self._trail, index),
+                lazy=True,
+                projection=self._projection,
+                guard=self._guard,
+                depth=self._depth,
+            )
+            list.__setitem__(self, index, value)
+        return value
+
+    def _build_all(self) -> None:
+        for index in range(len(self)):
+            self._build(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            for element_index in range(*index.indices(len(self))):
+                self._build(element_index)
+            return list.__getitem__(self, index)
+        return self._build(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._build(index)
+
+    def __reversed__(self):
+        for index in range(len(self) - 1, -1, -1):
+            yield self._build(index)
+
+    def __eq__(self, other):
+        self._build_all()
+        if isinstance(other, _LazyItemList):
+            other._build_all()
+        return list.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self):
+        self._build_all()
+        return list.__repr__(self)
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+    def __contains__(self, value):
+        return any(element == value for element in self)
+
+    def __add__(self, other):
+        return list(self) + other
+
+    def __radd__(self, other):
+        # Called instead of list.__add__ for list + _LazyItemList.
+        return other + list(self)
+
+    def __mul__(self, other):
+        return list(self) * other
+
+    __rmul__ = __mul__
+
+    def copy(self):
+        return list(self)
+
+    def count(self, value):
+        return sum(1 for element in self if element == value)
+
+    def index(self, value, *args):
+        self._build_all()
+        return list.index(self, value, *args)
+
+    def pop(self, index=-1):
+        self._build(index)
+        return list.pop(self, index)
+
+    def remove(self, value):
+        self._build_all()
+        list.remove(self, value)
+
+    def sort(self, *args, **kwargs):
+        self._build_all()
+        list.sort(self, *args, **kwargs)
+
+
+def _build_path_tree(paths: Union[str, Iterable[str], None]) -> Optional[_PathTree]:
+    """Return a tree of field names from dot-separated field *paths*.
+
+    >>> _build_path_tree(["url", "metadata.dateDownloaded"])
+    {'url': None, 'metadata': {'dateDownloaded': None}}
+    >>> _build_path_tree(["metadata.probability", "metadata"])
+    {'metadata': None}
+    """
+    if paths is None:
+        return None
+    if isinstance(paths, str):
+        paths = [paths]
+    tree: _PathTree = {}
+    for path in paths:
+        node: Optional[_PathTree] = tree
+        *parents, leaf = path.split(".")
+        for key in parents:
+            assert node is not None
+            if key in node and node[key] is None:
+                # A parent path is already fully selected.
+                node = None
+                break
+            node = node.setdefault(key, {})
+        if node is not None:
+            node[leaf] = None
+    return tree
+
+
+def _compute_fingerprint_fields(cls: type) -> Tuple[str, ...]:
+    return tuple(sorted(field.name for field in attrs.fields(cls)))
+
+
+# Caches the sorted field names that Item.fingerprint() walks for each class.
+_FINGERPRINT_FIELDS = _ClassCache(_compute_fingerprint_fields)
+
+
+def _get_fingerprint_fields(cls: type) -> Tuple[str, ...]:
+    return _FINGERPRINT_FIELDS[cls]
+
+
+def _compute_trusted_plan(
+    cls: Any,
+) -> Tuple[FrozenSet[str], Tuple[_TrustedField, ...]]:
+    hints = get_type_hints(cls)
+    fields = []
+    for field in attrs.fields(cls):
+        annotation = hints.get(field.name)
+        if get_origin(annotation) in _UNION_ORIGINS:
+            annotation = get_args(annotation)[0]
+        is_list = get_origin(annotation) is list
+        if is_list:
+            annotation = get_args(annotation)[0]
+        item_cls = annotation if is_data_container(annotation) else None
+        fields.append((field.name, field.default, item_cls, is_list))
+    return frozenset(field[0] for field in fields), tuple(fields)
+
+
+# Caches the field names and the fields that Item._construct_trusted() sets
+# for each class.
+_TRUSTED_PLANS = _ClassCache(_compute_trusted_plan)
+
+
+def _get_trusted_plan(
+    cls: Any,
+) -> Tuple[FrozenSet[str], Tuple[_TrustedField, ...]]:
+    return _TRUSTED_PLANS[cls]
+
+
+def _compile_projection(cls: Any, tree: _PathTree) -> _Projection:
+    _, fields = _get_trusted_plan(cls)
+    # Required fields are always read, whole.
+    projection: _Projection = {
+        name: None for name, default, _, _ in fields if default is attrs.NOTHING
+    }
+    item_classes = {name: item_cls for name, _, item_cls, _ in fields}
+    for name, subtree in tree.items():
+        if name in projection:
+            continue
+        item_cls = item_classes.get(name)
+        if subtree is None or item_cls is None:
+            projection[name] = None
+        else:
+            projection[name] = _compile_projection(item_cls, subtree)
+    return projection
+
+
+# Caches, for each class, the projections that Item.from_dict() compiles for
+# each tuple of field paths.
+_PROJECTIONS: _ClassCache[Dict[tuple, _Projection]] = _ClassCache(lambda cls: {})
+
+
+def _compute_sub_field_plan(
+    cls: Any,
+) -> Tuple[Tuple[Tuple[str, bool, Any], ...], Dict[str, Any], FrozenSet[str]]:
+    list_fields = []
+    from_dict = {}
+    annotations = ChainMap(*(get_type_hints(c) for c in cls.__mro__))
+    for field, type_annotation in annotations.items():
+        origin = get_origin(type_annotation)
+        is_optional = False
+        if origin in _UNION_ORIGINS:
+            field_classes = get_args(type_annotation)
+            if len(field_classes) != 2 or not isinstance(None, field_classes[1]):
+                path = f"{_get_import_path(cls)}.{field}"
+                raise ValueError(
+                    f"{path} is annotated with {type_annotation}. Fields "
+                    f"should only be annotated with one type (or "
+                    f"optional)."
+                )
+            is_optional = len(field_classes) == 2 and isinstance(None, field_classes[1])
+            type_annotation = field_classes[0]
+            origin = get_origin(type_annotation)
+
+        if origin is list:
+            type_annotation = get_args(type_annotation)[0]
+            item_cls = type_annotation if is_data_container(type_annotation) else None
+            list_fields.append((field, is_optional, item_cls))
+        elif is_data_container(type_annotation):
+            from_dict[field] = type_annotation
+    item_fields = frozenset(from_dict).union(
+        field for field, _, item_cls in list_fields if item_cls is not None
+    )
+    return tuple(list_fields), from_dict, item_fields
+
+
+# Caches, for each class, the list fields that Item.from_dict() type-checks,
+# as (field name, whether the field is optional, item class of the list
+# items or None), the item class of each field that holds an item, and the
+# names of the fields that hold items or lists of items.
+_SUB_FIELD_PLANS = _ClassCache(_compute_sub_field_plan)
+
+
+def _get_projection(
+    cls: type, fields: Union[str, Iterable[str], None]
+) -> Optional[_Projection]:
+    if fields is None:
+        return None
+    key = (fields,) if isinstance(fields, str) else tuple(fields)
+    projections = _PROJECTIONS[cls]
+    try:
+        return projections[key]
+    except KeyError:
+        pass
+    tree = _build_path_tree(key)
+    assert tree is not None
+    # If another thread compiled the same projection meanwhile, use the
+    # projection that was stored first.
+    return projections.setdefault(key, _compile_projection(cls, tree))
+
+
+def _is_empty_for_fingerprint(value: Any) -> bool:
+    # Matches the empty-value semantics of ZyteItemAdapter, so that an item
+    # and an item read back from its serialization share a fingerprint.
+    return value is None or (not value and isinstance(value, (list, tuple, dict)))
+
+
+def _fingerprint_field(
+    parts: List[bytes],
+    name: str,
+    value: Any,
+    include: Optional[_PathTree],
+    exclude: Optional[_PathTree],
+) -> None:
+    if _is_empty_for_fingerprint(value):
+        return
+    if include is not None:
+        if name not in include:
+            return
+        include = include[name]
+    if exclude is not None:
+        if name in exclude:
+            exclude = exclude[name]
+            if exclude is None:
+                return
+        else:
+            exclude = None
+    _fingerprint_value(parts, name, None, None)
+    _fingerprint_value(parts, value, include, exclude)
+
+
+def _fingerprint_value(
+    parts: List[bytes],
+    value: Any,
+    include: Optional[_PathTree],
+    exclude: Optional[_PathTree],
+) -> None:
+    if isinstance(value, str):
+        data = value.encode()
+        parts.append(b"s%d:" % len(data))
+        parts.append(data)
+    elif value is None:
+        parts.append(b"n")
+    elif isinstance(value, bool):
+        parts.append(b"t" if value else b"f")
+    elif isinstance(value, int):
+        parts.append(b"i%d;" % value)
+    elif isinstance(value, float):
+        parts.append(b"d%r;" % value)
+    elif isinstance(value, Item):
+        parts.append(b"{")
+        for name in _get_fingerprint_fields(type(value)):
+            _fingerprint_field(
+                parts, name, getattr(value, name, None), include, exclude
+            )
+        unknown_fields = value._unknown_fields_dict
+        for name in sorted(unknown_fields):
+            _fingerprint_field(parts, name, unknown_fields[name], include, exclude)
+        parts.append(b"}")
+    elif isinstance(value, (list, tuple)):
+        parts.append(b"[")
+        for element in value:
+            _fingerprint_value(parts, element, include, exclude)
+        parts.append(b"]")
+    elif isinstance(value, dict):
+        parts.append(b"{")
+        for key in sorted(value):
+            _fingerprint_field(parts, key, value[key], include, exclude)
+        parts.append(b"}")
+    elif isinstance(value, bytes):
+        parts.append(b"b%d:" % len(value))
+        parts.append(value)
+    else:
+        raise TypeError(f"Cannot fingerprint {value!r} of type {type(value)}.")
+
+
 @attrs.define
 class ProbabilityMixin:
     """Provides :meth:`get_probability` to make it easier to access the
@@ -72,13 +574,108 @@ class Item(ProbabilityMixin, _ItemBase):
     def __attrs_post_init__(self):
         self._unknown_fields_dict = {}  # type: ignore[misc]
 
+    def fingerprint(
+        self,
+        *,
+        include: Union[str, Iterable[str], None] = None,
+        exclude: Union[str, Iterable[str], None] = None,
+    ) -> str:
+        """Return a stable SHA1 hex digest of the item data.
+
+        The fingerprint does not depend on field definition order, on the
+        order of keys in :attr:`_unknown_fields_dict` or in :class:`dict`
+        values, and fields with empty values (``None``, empty lists and
+        dicts) are ignored, so that an item and the result of reading its
+        :class:`~zyte_common_items.ZyteItemAdapter` output back with
+        :meth:`from_dict` share a fingerprint.
+
+        *include* and *exclude* are field paths, with nested fields
+        separated by dots, that limit the fields used to compute the
+        fingerprint. For example, to ignore the download date of a product:
+
+        >>> from zyte_common_items import Product, ProductMetadata
+        >>> a = Product(
+        ...     url="https://example.com",
+        ...     metadata=ProductMetadata(dateDownloaded="2024-01-01T00:00:00Z"),
+        ... )
+        >>> b = Product(
+        ...     url="https://example.com",
+        ...     metadata=ProductMetadata(dateDownloaded="2024-01-02T00:00:00Z"),
+        ... )
+        >>> a.fingerprint() == b.fingerprint()
+        False
+        >>> exclude = ["metadata.dateDownloaded"]
+        >>> a.fingerprint(exclude=exclude) == b.fingerprint(exclude=exclude)
+        True
+
+        Paths into list fields apply to every list item, e.g.
+        ``"gtin.value"``.
+        """
+        parts: List[bytes] = []
+        _fingerprint_value(
+            parts, self, _build_path_tree(include), _build_path_tree(exclude)
+        )
+        return hashlib.sha1(b"".join(parts)).hexdigest()
+
     @classmethod
-    def from_dict(cls, item: Optional[Dict]):
-        """Read an item from a dictionary."""
-        return cls._from_dict(item)
+    def from_dict(
+        cls,
+        item: Optional[Dict],
+        *,
+        lazy: bool = False,
+        fields: Union[str, Iterable[str], None] = None,
+        limits: Optional[InputLimits] = None,
+    ):
+        """Read an item from a dictionary.
+
+        If *lazy* is ``True``, fields with a list of items, e.g.
+        :attr:`ProductList.products <zyte_common_items.ProductList.products>`,
+        keep the input dictionaries, and each item of the list is only built
+        the first time that it is accessed. Errors in those items are also
+        only raised then.
+
+        *fields* are field paths, with nested fields separated by dots, that
+        limit the fields to read. Other fields of *item* are ignored, without
+        being read, except for required fields, which are always read:
+
+        >>> from zyte_common_items import Product
+        >>> product = Product.from_dict(
+        ...     {
+        ...         "url": "https://example.com",
+        ...         "name": "Foo",
+        ...         "descriptionHtml": "<p>Foo</p>",
+        ...         "aggregateRating": {"ratingValue": 4.5, "reviewCount": 10},
+        ...     },
+        ...     fields=["name", "aggregateRating.ratingValue"],
+        ... )
+        >>> product.url, product.name, product.descriptionHtml
+        ('https://example.com', 'Foo', None)
+        >>> product.aggregateRating
+        AggregateRating(bestRating=None, ratingValue=4.5, reviewCount=None)
+
+        Paths into list fields apply to every list item, e.g.
+        ``"gtin.value"``.
+
+        *limits* are :class:`~zyte_common_items.limits.InputLimits` to
+        enforce instead of the :func:`globally enabled ones
+        <zyte_common_items.limits.enable_input_limits>`.
+        """
+        projection = _get_projection(cls, fields)
+        return cls._from_dict(
+            item, lazy=lazy, projection=projection, guard=_get_guard(limits)
+        )
 
     @classmethod
-    def _from_dict(cls, item: Optional[Dict], *, trail: _Trail = None):
+    def _from_dict(
+        cls,
+        item: Optional[Dict],
+        *,
+        trail: _Trail = None,
+        lazy: bool = False,
+        projection: Optional[_Projection] = None,
+        guard: Optional[_Guard] = None,
+        depth: int = 1,
+    ):
         """Read an item from a dictionary."""
         if item is None:
             return None
@@ -91,28 +688,150 @@ class Item(ProbabilityMixin, _ItemBase):
                 prefix = f"Expected {trail} to be"
             raise ValueError(f"{prefix} a dict with fields from {path}, got {item!r}.")
 
-        item = cls._apply_field_types_to_sub_fields(item, trail=trail)
+        if projection is not None:
+            item = {key: value for key, value in item.items() if key in projection}
+        if guard is not None:
+            guard.check_item(item, trail, depth, _SUB_FIELD_PLANS[cls][2])
+        item = cls._apply_field_types_to_sub_fields(
+            item,
+            trail=trail,
+            lazy=lazy,
+            projection=projection,
+            guard=guard,
+            depth=depth,
+        )
         unknown_fields, known_fields = split_in_unknown_and_known_fields(item, cls)
         obj = cls(**known_fields)  # type: ignore
         obj._unknown_fields_dict = unknown_fields  # type: ignore[misc]
         return obj
 
     @classmethod
-    def from_list(cls, items: Optional[List[Dict]], *, trail: _Trail = None) -> List:
-        """Read items from a list."""
-        return cls._from_list(items)
+    def from_trusted_dict(cls, item: Optional[Dict]):
+        """Read an item from a dictionary that is known to be valid, e.g.
+        one previously exported from an item of the same class.
+
+        It works like :meth:`from_dict`, but faster, because field values are
+        assigned as is, without running field converters or type checks.
+        Only nested items are built from their dictionaries.
+
+        .. warning:: Do not use it with untrusted input. Invalid input is
+            not reported, and may result in items with invalid field values,
+            e.g. a :class:`dict` as the :class:`~zyte_common_items.Product`
+            ``metadata`` instead of a
+            :class:`~zyte_common_items.ProductMetadata` object.
+        """
+        if item is None:
+            return None
+        return cls._construct_trusted(item)
 
     @classmethod
-    def _from_list(cls, items: Optional[List[Dict]], *, trail: _Trail = None) -> List:
-        """Read items from a list."""
+    def _construct_trusted(cls, item: Dict):
+        names, fields = _get_trusted_plan(cls)
+        obj = cls.__new__(cls)
+        for name, default, item_cls, is_list in fields:
+            value = item.get(name, _UNDEFINED)
+            if item_cls is not None and is_list:
+                # Like from_dict(), read a missing list of items as an empty
+                # list.
+                value = [
+                    (
+                        item_cls._construct_trusted(element)
+                        if isinstance(element, dict)
+                        else element
+                    )
+                    for element in (value if value is not _UNDEFINED else None) or ()
+                ]
+            elif value is _UNDEFINED:
+                if default is attrs.NOTHING:
+                    path = _get_import_path(cls)
+                    raise TypeError(f"Missing required field {name!r} of {path}.")
+                if isinstance(default, attrs.Factory):  # type: ignore[arg-type]
+                    value = (
+                        default.factory(obj)
+                        if default.takes_self
+                        else default.factory()
+                    )
+                else:
+                    value = default
+            elif item_cls is not None and isinstance(value, dict):
+                value = item_cls._construct_trusted(value)
+            object.__setattr__(obj, name, value)
+        object.__setattr__(
+            obj,
+            "_unknown_fields_dict",
+            {key: value for key, value in item.items() if key not in names},
+        )
+        return obj
+
+    @classmethod
+    def from_list(
+        cls,
+        items: Optional[List[Dict]],
+        *,
+        trail: _Trail = None,
+        lazy: bool = False,
+        fields: Union[str, Iterable[str], None] = None,
+        limits: Optional[InputLimits] = None,
+    ) -> List:
+        """Read items from a list.
+
+        If *lazy* is ``True``, each item is only built the first time that it
+        is accessed. *fields* limits the fields to read from each item, and
+        *limits* the size of the input. See :meth:`from_dict`.
+        """
+        projection = _get_projection(cls, fields)
+        return cls._from_list(
+            items,
+            lazy=lazy,
+            projection=projection,
+            guard=_get_guard(limits),
+            depth=0,
+        )
+
+    @classmethod
+    def _from_list(
+        cls,
+        items: Optional[List[Dict]],
+        *,
+        trail: _Trail = None,
+        lazy: bool = False,
+        projection: Optional[_Projection] = None,
+        guard: Optional[_Guard] = None,
+        depth: int = 1,
+    ) -> List:
+        """Read items from a list.
+
+        *depth* is the nesting level of the list, see
+        :attr:`~zyte_common_items.limits.InputLimits.max_depth`, with ``0``
+        for the top-level list of :meth:`from_list`."""
+        if guard is not None and items is not None:
+            guard.check_list(items, trail, depth)
+        if lazy:
+            return _LazyItemList(items or (), cls, trail, projection, guard, depth + 1)
         result = []
         for index, item in enumerate(items or []):
             index_trail = _extend_trail(trail, index)
-            result.append(cls._from_dict(item, trail=index_trail))
+            result.append(
+                cls._from_dict(
+                    item,
+                    trail=index_trail,
+                    projection=projection,
+                    guard=guard,
+                    depth=depth + 1,
+                )
+            )
         return result
 
     @classmethod
-    def _apply_field_types_to_sub_fields(cls, item: Dict, trail: _Trail = None):
+    def _apply_field_types_to_sub_fields(
+        cls,
+        item: Dict,
+        trail: _Trail = None,
+        lazy: bool = False,
+        projection: Optional[_Projection] = None,
+        guard: Optional[_Guard] = None,
+        depth: int = 1,
+    ):
         """This applies the correct data container class for some of the fields
         that need them.
 
@@ -129,43 +848,19 @@ class Item(ProbabilityMixin, _ItemBase):
             * Article having ``headline: Optional[str]``
             * Product having ``name: Optional[str]``
         """
-        from_dict, from_list = {}, {}
-
-        annotations = ChainMap(*(get_type_hints(c) for c in cls.__mro__))
-        for field, type_annotation in annotations.items():
-            origin = get_origin(type_annotation)
-            is_optional = False
-            if origin in _UNION_ORIGINS:
-                field_classes = get_args(type_annotation)
-                if len(field_classes) != 2 or not isinstance(None, field_classes[1]):
-                    path = f"{_get_import_path(cls)}.{field}"
-                    raise ValueError(
-                        f"{path} is annotated with {type_annotation}. Fields "
-                        f"should only be annotated with one type (or "
-                        f"optional)."
-                    )
-                is_optional = len(field_classes) == 2 and isinstance(
-                    None, field_classes[1]
-                )
-                type_annotation = field_classes[0]
-                origin = get_origin(type_annotation)
-
-            if origin is list:
-                value = item.get(field, _UNDEFINED)
-                if (
-                    not isinstance(value, list)
-                    and value is not _UNDEFINED
-                    and not (is_optional and value is None)
-                ):
-                    field_trail = _extend_trail(trail, field)
-                    raise ValueError(
-                        f"Expected {field_trail} to be a list, got {value!r}."
-                    )
-                type_annotation = get_args(type_annotation)[0]
-                if is_data_container(type_annotation):
-                    from_list[field] = type_annotation
-            elif is_data_container(type_annotation):
-                from_dict[field] = type_annotation
+        list_fields, from_dict, _ = _SUB_FIELD_PLANS[cls]
+        from_list = {}
+        for field, is_optional, item_cls in list_fields:
+            value = item.get(field, _UNDEFINED)
+            if (
+                not isinstance(value, list)
+                and value is not _UNDEFINED
+                and not (is_optional and value is None)
+            ):
+                field_trail = _extend_trail(trail, field)
+                raise ValueError(f"Expected {field_trail} to be a list, got {value!r}.")
+            if item_cls is not None:
+                from_list[field] = item_cls
 
         if from_dict or from_list:
             item = dict(**item)
@@ -178,7 +873,14 @@ class Item(ProbabilityMixin, _ItemBase):
                         f"Expected {key_trail} to be a dict with fields "
                         f"from {path}, got {value!r}."
                     )
-                item[key] = cls._from_dict(value, trail=key_trail)
+                item[key] = cls._from_dict(
+                    value,
+                    trail=key_trail,
+                    lazy=lazy,
+                    projection=projection and projection.get(key),
+                    guard=guard,
+                    depth=depth + 1,
+                )
             for key, cls in (from_list or {}).items():
                 key_trail = _extend_trail(trail, key)
                 value = item.get(key)
@@ -188,6 +890,13 @@ class Item(ProbabilityMixin, _ItemBase):
                         f"Expected {key_trail} to be a list of dicts "
                         f"with fields from {path}, got {value!r}."
                     )
-                item[key] = cls._from_list(value, trail=key_trail)
+                item[key] = cls._from_list(
+                    value,
+                    trail=key_trail,
+                    lazy=lazy,
+                    projection=projection and projection.get(key),
+                    guard=guard,
+                    depth=depth + 1,
+                )
 
         return item
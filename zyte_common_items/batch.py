@@ -0,0 +1,332 @@
+"""Struct-of-arrays containers for vectorized analysis of items.
+
+This module requires NumPy_ to be installed.
+
+.. _NumPy: https://numpy.org/
+"""
+
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+import numpy as np
+
+from .items import Product, ProductFromList
+
+_ProductLike = Union[Product, ProductFromList, Dict[str, Any]]
+
+
+def _get(source: Any, name: str) -> Any:
+    if source is None:
+        return None
+    if isinstance(source, dict):
+        return source.get(name)
+    return getattr(source, name, None)
+
+
+def _parse_floats(values: Sequence[Any]) -> np.ndarray:
+    """Return a float64 array with *values* parsed as numbers, using NaN for
+    values that are missing or cannot be parsed.
+
+    >>> _parse_floats(["1.5", None, "foo", 2])
+    array([1.5, nan, nan, 2. ])
+    """
+    result = np.full(len(values), np.nan, dtype=np.float64)
+    present = [index for index, value in enumerate(values) if value is not None]
+    if not present:
+        return result
+    try:
+        parsed = np.array([values[index] for index in present], dtype=np.str_).astype(
+            np.float64
+        )
+    except ValueError:
+        parsed = np.array(
+            [_parse_float(values[index]) for index in present], dtype=np.float64
+        )
+    result[present] = parsed
+    result[~np.isfinite(result)] = np.nan
+    return result
+
+
+def _parse_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+_INT64_LIMIT = 2.0**63
+
+
+def _to_int64(values: np.ndarray, default: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return an int64 array with *values* rounded to the nearest integer,
+    using *default* for values that are NaN or out of the int64 range, and
+    a boolean array that is ``True`` where *values* were converted.
+
+    >>> _to_int64(np.array([1.6, np.nan, 1e19]), -1)
+    (array([ 2, -1, -1]), array([ True, False, False]))
+    """
+    rounded = np.round(values)
+    valid = np.abs(rounded) < _INT64_LIMIT
+    return np.where(valid, rounded, default).astype(np.int64), valid
+
+
+def _categorize(values: Sequence[Any]) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """Return an int32 array of category codes for *values*, where -1 means
+    a missing value, and the sorted categories that the codes index.
+
+    >>> _categorize(["USD", None, "EUR", "USD"])
+    (array([ 1, -1,  0,  1], dtype=int32), ('EUR', 'USD'))
+    """
+    categories = tuple(sorted({value for value in values if value is not None}))
+    codes = {category: code for code, category in enumerate(categories)}
+    return (
+        np.fromiter(
+            (codes.get(value, -1) for value in values),
+            dtype=np.int32,
+            count=len(values),
+        ),
+        categories,
+    )
+
+
+class ProductBatch:
+    """Struct-of-arrays view of the price, currency, availability and rating
+    data of a sequence of products.
+
+    *products* may be :class:`~zyte_common_items.Product` or
+    :class:`~zyte_common_items.ProductFromList` objects, or raw dictionaries
+    as accepted by :meth:`Product.from_dict
+    <zyte_common_items.Item.from_dict>`.
+
+    Prices are parsed into :attr:`price` and :attr:`regularPrice`, with
+    ``NaN`` for missing or invalid values, and into :attr:`price_scaled`
+    and :attr:`regularPrice_scaled`, integers that count units of
+    ``10 ** -scale``, e.g. cents with the default *scale*, ``2``. Prices
+    that do not fit into a 64-bit integer at that scale are considered
+    invalid.
+
+    Indexing a batch with an integer returns the corresponding product,
+    built on demand as an instance of *item_cls* if the input was a
+    dictionary. Indexing a batch with a slice, an array of indexes or a
+    boolean mask returns a new batch that shares the source products:
+
+    >>> batch = ProductBatch(
+    ...     [
+    ...         {"url": "https://a.example", "price": "8.00", "regularPrice": "10.00"},
+    ...         {"url": "https://b.example", "price": "5.00", "currency": "EUR"},
+    ...         {"url": "https://c.example", "price": "3.50", "regularPrice": "7.00"},
+    ...     ]
+    ... )
+    >>> batch.price
+    array([8. , 5. , 3.5])
+    >>> batch.price_scaled
+    array([800, 500, 350])
+    >>> batch.discount()
+    array([0.2, nan, 0.5])
+    >>> discounted = batch[batch.discount() > 0.3]
+    >>> len(discounted)
+    1
+    >>> discounted[0].url
+    'https://c.example'
+    >>> [product.url for product in batch.sort("price")]
+    ['https://c.example', 'https://b.example', 'https://a.example']
+    """
+
+    price: np.ndarray
+    """float64 array of :attr:`Product.price
+    <zyte_common_items.Product.price>` values."""
+
+    price_scaled: np.ndarray
+    """int64 array of :attr:`Product.price
+    <zyte_common_items.Product.price>` values in units of ``10 ** -scale``,
+    ``0`` where :attr:`price_valid` is ``False``."""
+
+    price_valid: np.ndarray
+    """Boolean array that is ``True`` where :attr:`price` is valid."""
+
+    regularPrice: np.ndarray
+    """float64 array of :attr:`Product.regularPrice
+    <zyte_common_items.Product.regularPrice>` values."""
+
+    regularPrice_scaled: np.ndarray
+    """int64 array of :attr:`Product.regularPrice
+    <zyte_common_items.Product.regularPrice>` values in units of
+    ``10 ** -scale``, ``0`` where :attr:`regularPrice_valid` is ``False``."""
+
+    regularPrice_valid: np.ndarray
+    """Boolean array that is ``True`` where :attr:`regularPrice` is valid."""
+
+    currency: np.ndarray
+    """int32 array of codes that index :attr:`currency_categories`, ``-1``
+    for a missing :attr:`Product.currency
+    <zyte_common_items.Product.currency>`."""
+
+    currency_categories: Tuple[str, ...]
+    """Sorted currency values."""
+
+    availability: np.ndarray
+    """int32 array of codes that index :attr:`availability_categories`,
+    ``-1`` for a missing :attr:`Product.availability
+    <zyte_common_items.Product.availability>`."""
+
+    availability_categories: Tuple[str, ...]
+    """Sorted availability values."""
+
+    ratingValue: np.ndarray
+    """float64 array of :attr:`AggregateRating.ratingValue
+    <zyte_common_items.AggregateRating.ratingValue>` values, ``NaN`` if
+    missing."""
+
+    bestRating: np.ndarray
+    """float64 array of :attr:`AggregateRating.bestRating
+    <zyte_common_items.AggregateRating.bestRating>` values, ``NaN`` if
+    missing."""
+
+    reviewCount: np.ndarray
+    """int64 array of :attr:`AggregateRating.reviewCount
+    <zyte_common_items.AggregateRating.reviewCount>` values, ``-1`` if
+    missing."""
+
+    _ARRAYS = (
+        "price",
+        "price_scaled",
+        "price_valid",
+        "regularPrice",
+        "regularPrice_scaled",
+        "regularPrice_valid",
+        "currency",
+        "availability",
+        "ratingValue",
+        "bestRating",
+        "reviewCount",
+    )
+
+    def __init__(
+        self,
+        products: Iterable[_ProductLike],
+        *,
+        item_cls: Type[Union[Product, ProductFromList]] = Product,
+        scale: int = 2,
+    ):
+        self.item_cls = item_cls
+        self.scale = scale
+        self._sources: List[_ProductLike] = list(products)
+        self._indexes = np.arange(len(self._sources))
+        self._items: Dict[int, Any] = {}
+        for name in ("price", "regularPrice"):
+            values = _parse_floats([_get(source, name) for source in self._sources])
+            with np.errstate(over="ignore"):
+                scaled, valid = _to_int64(values * 10**scale, 0)
+            values[~valid] = np.nan
+            setattr(self, name, values)
+            setattr(self, f"{name}_valid", valid)
+            setattr(self, f"{name}_scaled", scaled)
+        for name in ("currency", "availability"):
+            codes, categories = _categorize(
+                [_get(source, name) for source in self._sources]
+            )
+            setattr(self, name, codes)
+            setattr(self, f"{name}_categories", categories)
+        ratings = [_get(source, "aggregateRating") for source in self._sources]
+        for name in ("ratingValue", "bestRating"):
+            setattr(
+                self, name, _parse_floats([_get(rating, name) for rating in ratings])
+            )
+        review_counts = _parse_floats(
+            [_get(rating, "reviewCount") for rating in ratings]
+        )
+        self.reviewCount, _ = _to_int64(review_counts, -1)
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def __iter__(self) -> Iterator[Union[Product, ProductFromList]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, (int, np.integer)):
+            return self._get_item(int(self._indexes[key]))
+        return self._take(key)
+
+    def _get_item(self, source_index: int) -> Union[Product, ProductFromList]:
+        source = self._sources[source_index]
+        if not isinstance(source, dict):
+            return source
+        if source_index not in self._items:
+            self._items[source_index] = self.item_cls.from_dict(source)
+        return self._items[source_index]
+
+    def _take(self, key: Any) -> "ProductBatch":
+        batch = object.__new__(ProductBatch)
+        batch.item_cls = self.item_cls
+        batch.scale = self.scale
+        batch._sources = self._sources
+        batch._items = self._items
+        batch._indexes = self._indexes[key]
+        for name in self._ARRAYS:
+            setattr(batch, name, getattr(self, name)[key])
+        batch.currency_categories = self.currency_categories
+        batch.availability_categories = self.availability_categories
+        return batch
+
+    def filter(self, mask: np.ndarray) -> "ProductBatch":
+        """Return a new batch with the products where *mask* is ``True``."""
+        return self._take(np.asarray(mask, dtype=np.bool_))
+
+    def discount(self) -> np.ndarray:
+        """Return a float64 array with the relative discount of
+        :attr:`price` over :attr:`regularPrice`, e.g. ``0.2`` for a 20%
+        discount, and ``NaN`` if either price is missing or
+        :attr:`regularPrice` is not positive."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            discount = 1 - self.price / self.regularPrice
+        discount[~(self.regularPrice > 0)] = np.nan
+        return discount
+
+    def argsort(self, by: str, *, descending: bool = False) -> np.ndarray:
+        """Return the indexes that sort the batch by the array named *by*,
+        e.g. ``"price"``, with missing values last.
+
+        The sort is stable, and categorical arrays are sorted by category
+        value."""
+        if by not in self._ARRAYS:
+            raise ValueError(f"Cannot sort by {by!r}.")
+        values = getattr(self, by)
+        if values.dtype.kind == "b":
+            values = values.astype(np.int8)
+        if values.dtype.kind == "f":
+            missing = np.isnan(values)
+        elif by in {"currency", "availability", "reviewCount"}:
+            missing = values < 0
+        else:
+            missing = np.zeros(len(values), dtype=np.bool_)
+        keys = np.where(missing, 0, values)
+        if descending:
+            keys = -keys
+        return np.lexsort((keys, missing))
+
+    def sort(self, by: str, *, descending: bool = False) -> "ProductBatch":
+        """Return a new batch sorted by the array named *by*. See
+        :meth:`argsort`."""
+        return self._take(self.argsort(by, descending=descending))
+
+    def get_currency(self, index: int) -> Optional[str]:
+        """Return the currency value of the product at *index*."""
+        code = int(self.currency[index])
+        return None if code < 0 else self.currency_categories[code]
+
+    def get_availability(self, index: int) -> Optional[str]:
+        """Return the availability value of the product at *index*."""
+        code = int(self.availability[index])
+        return None if code < 0 else self.availability_categories[code]
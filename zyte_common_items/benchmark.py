@@ -0,0 +1,345 @@
+"""Throughput benchmark of a Scrapy crawl of synthetic Zyte API data.
+
+Run it with:
+
+.. code-block:: shell
+
+    python -m zyte_common_items.benchmark [options]
+
+It starts a :class:`~zyte_common_items.testing.FakeZyteAPIServer` in a
+separate process, and runs a Scrapy crawl with the :ref:`add-on
+<scrapy-config>` that requests ``productNavigation`` for a number of
+category URLs, then ``product`` for every product URL found, builds each
+product through :class:`~zyte_common_items.AutoProductPage`, and sends it
+through :class:`~zyte_common_items.pipelines.DropLowProbabilityItemPipeline`
+and, optionally, :class:`~zyte_common_items.pipelines.AEPipeline`.
+
+With ``--html-paragraphs``, each product is instead rendered into an HTML
+document with that many description paragraphs, and extracted from it with a
+:class:`~zyte_common_items.ProductPage` subclass that uses the built-in
+breadcrumbs and description processors. Add ``--offload`` to run those
+processors with :func:`processor offloading
+<zyte_common_items.offload.enable_processor_offloading>`, and compare the
+results of both runs.
+
+The result is written to the standard output as a JSON object with the
+number of items, items per second, CPU time per item of the crawl process,
+excluding the server, the peak memory usage of the crawl process, and the
+99th percentile and maximum delay of a timer that should run every 10
+milliseconds in the reactor of the crawl process, which show how long
+extraction blocks the reactor.
+
+Run ``python -m zyte_common_items.benchmark --help`` for all options.
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from typing import Any, Dict, List, Mapping, Optional
+
+import scrapy
+from scrapy.crawler import CrawlerProcess
+from web_poet import HttpResponse, RequestUrl, field
+
+from . import Addon, AutoProductPage, Product, ProductPage
+from .envelope import from_envelope
+from .offload import disable_processor_offloading, enable_processor_offloading
+from .pipelines import AEPipeline, DropLowProbabilityItemPipeline
+from .testing import FakeZyteAPIServer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+def _serve(sizes: Mapping[str, int], connection: Any) -> None:
+    with FakeZyteAPIServer(sizes=sizes) as server:
+        connection.send(server.url)
+        connection.recv()
+
+
+# Interval of the timer that measures how long the reactor is blocked.
+_LAG_INTERVAL = 0.01
+
+
+def _render_html(product: Product, paragraphs: int) -> bytes:
+    paragraph = f"<p>{product.name} is {product.description}.</p>"
+    return (
+        f"<!DOCTYPE html><html><body><h1>{product.name}</h1>"
+        f'<ul class="breadcrumbs"><li><a href="/">Home</a></li>'
+        f'<li><a href="/c">Category</a></li></ul>'
+        f'<div class="description">{paragraph * paragraphs}</div>'
+        f"</body></html>"
+    ).encode()
+
+
+class _HtmlProductPage(ProductPage):
+    @field
+    def name(self):
+        return self.css("h1::text").get()
+
+    @field
+    def breadcrumbs(self):
+        return self.css(".breadcrumbs")
+
+    @field
+    def description(self):
+        return self.css(".description")
+
+    @field
+    def descriptionHtml(self):
+        return self.css(".description")
+
+
+class _BenchmarkSpider(scrapy.Spider):
+    name = "zyte_common_items_benchmark"
+
+    def __init__(
+        self, api_url: str, pages: int, html_paragraphs: int = 0, **kwargs: Any
+    ):
+        super().__init__(**kwargs)
+        self.api_url = api_url
+        self.pages = pages
+        self.html_paragraphs = html_paragraphs
+        self.lags: List[float] = []
+        self._last_tick: Optional[float] = None
+        self._lag_timer: Any = None
+
+    def _tick(self) -> None:
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            self.lags.append(max(0.0, now - self._last_tick - _LAG_INTERVAL))
+        self._last_tick = now
+
+    def closed(self, reason: str) -> None:
+        if self._lag_timer is not None and self._lag_timer.running:
+            self._lag_timer.stop()
+
+    def _request(self, url: str, item_type: str, callback: Any) -> scrapy.Request:
+        return scrapy.Request(
+            f"{self.api_url}extract",
+            method="POST",
+            body=json.dumps({"url": url, item_type: True}),
+            headers={"Content-Type": "application/json"},
+            callback=callback,
+            dont_filter=True,
+        )
+
+    async def start(self):
+        for request in self.start_requests():
+            yield request
+
+    def start_requests(self):
+        # Imported here not to install a reactor before Scrapy does.
+        from twisted.internet import task
+
+        self._lag_timer = task.LoopingCall(self._tick)
+        self._lag_timer.start(_LAG_INTERVAL)
+        for index in range(self.pages):
+            url = f"https://example.com/category/{index}"
+            yield self._request(url, "productNavigation", self.parse_navigation)
+
+    def parse_navigation(self, response):
+        navigation = from_envelope(response.json())["productNavigation"]
+        for request in navigation.items or []:  # type: ignore[attr-defined]
+            yield self._request(request.url, "product", self.parse_product)
+
+    async def parse_product(self, response):
+        product = from_envelope(response.json())["product"]
+        if self.html_paragraphs:
+            html = _render_html(product, self.html_paragraphs)  # type: ignore[arg-type]
+            html_page = _HtmlProductPage(
+                response=HttpResponse(url=product.url, body=html)  # type: ignore[attr-defined]
+            )
+            yield await html_page.to_item()
+            return
+        page = AutoProductPage(
+            request_url=RequestUrl(product.url),  # type: ignore[attr-defined]
+            product=product,  # type: ignore[arg-type]
+        )
+        yield await page.to_item()
+
+
+def _get_peak_memory() -> Optional[float]:
+    """Return the peak resident memory of the current process in MiB, if
+    known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _get_lag_stats(lags: List[float]) -> Dict[str, Optional[float]]:
+    if not lags:
+        return {"p99_reactor_lag_seconds": None, "max_reactor_lag_seconds": None}
+    lags = sorted(lags)
+    return {
+        "p99_reactor_lag_seconds": lags[int(len(lags) * 0.99)],
+        "max_reactor_lag_seconds": lags[-1],
+    }
+
+
+def run_benchmark(
+    *,
+    pages: int = 100,
+    products_per_page: int = 10,
+    variants: int = 5,
+    images: int = 5,
+    concurrency: int = 16,
+    ae: bool = False,
+    html_paragraphs: int = 0,
+    offload: bool = False,
+    settings: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Run a benchmark crawl and return its results.
+
+    *pages* is the number of product navigation pages to crawl, each with
+    *products_per_page* products with *variants* variants and *images*
+    images. *settings* are additional Scrapy settings.
+
+    If *html_paragraphs* is set, products are extracted from HTML documents
+    with that many description paragraphs. If *offload* is ``True``,
+    processors are offloaded to a thread pool, and the asyncio reactor is
+    used.
+
+    It can only be called once per process, because it runs the Twisted
+    reactor.
+    """
+    sizes = {"items": products_per_page, "variants": variants, "images": images}
+    context = multiprocessing.get_context("spawn")
+    parent_connection, child_connection = context.Pipe()
+    server = context.Process(target=_serve, args=(sizes, child_connection))
+    server.start()
+    try:
+        api_url = parent_connection.recv()
+        pipelines: Dict[Any, int] = {DropLowProbabilityItemPipeline: 100}
+        if ae:
+            pipelines[AEPipeline] = 200
+        if offload:
+            enable_processor_offloading()
+            settings = {
+                "TWISTED_REACTOR": (
+                    "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
+                ),
+                **(settings or {}),
+            }
+        process = CrawlerProcess(
+            {
+                "ADDONS": {Addon: 400},
+                "CONCURRENT_REQUESTS": concurrency,
+                "CONCURRENT_REQUESTS_PER_DOMAIN": concurrency,
+                "ITEM_PIPELINES": pipelines,
+                "LOG_LEVEL": "ERROR",
+                "ROBOTSTXT_OBEY": False,
+                "TELNETCONSOLE_ENABLED": False,
+                **(settings or {}),
+            }
+        )
+        crawler = process.create_crawler(_BenchmarkSpider)
+        process.crawl(
+            crawler, api_url=api_url, pages=pages, html_paragraphs=html_paragraphs
+        )
+        start_time, start_cpu = time.perf_counter(), time.process_time()
+        process.start()
+        elapsed = time.perf_counter() - start_time
+        cpu = time.process_time() - start_cpu
+    finally:
+        disable_processor_offloading()
+        parent_connection.send(None)
+        server.join()
+    assert crawler.stats is not None
+    items = crawler.stats.get_value("item_scraped_count", 0)
+    return {
+        "items": items,
+        "dropped_items": crawler.stats.get_value("item_dropped_count", 0),
+        "seconds": elapsed,
+        "items_per_second": items / elapsed if elapsed else None,
+        "cpu_seconds_per_item": cpu / items if items else None,
+        "peak_memory_mib": _get_peak_memory(),
+        **_get_lag_stats(crawler.spider.lags),  # type: ignore[union-attr]
+    }
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m zyte_common_items.benchmark",
+        description=(
+            "Run a Scrapy crawl of synthetic Zyte API data served locally, and "
+            "report its throughput as JSON."
+        ),
+    )
+    parser.add_argument(
+        "--pages",
+        type=int,
+        default=100,
+        help="Number of product navigation pages to crawl. Default: 100.",
+    )
+    parser.add_argument(
+        "--products-per-page",
+        type=int,
+        default=10,
+        help="Number of products per product navigation page. Default: 10.",
+    )
+    parser.add_argument(
+        "--variants",
+        type=int,
+        default=5,
+        help="Number of variants per product. Default: 5.",
+    )
+    parser.add_argument(
+        "--images",
+        type=int,
+        default=5,
+        help="Number of images per product and variant. Default: 5.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=16,
+        help="Number of concurrent requests. Default: 16.",
+    )
+    parser.add_argument(
+        "--ae",
+        action="store_true",
+        help="Also convert items with AEPipeline.",
+    )
+    parser.add_argument(
+        "--html-paragraphs",
+        type=int,
+        default=0,
+        help=(
+            "Extract products from HTML documents with this many description "
+            "paragraphs instead of reading them from the API response. "
+            "Default: 0."
+        ),
+    )
+    parser.add_argument(
+        "--offload",
+        action="store_true",
+        help="Offload field processors to a thread pool.",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _get_parser().parse_args(argv)
+    result = run_benchmark(
+        pages=args.pages,
+        products_per_page=args.products_per_page,
+        variants=args.variants,
+        images=args.images,
+        concurrency=args.concurrency,
+        ae=args.ae,
+        html_paragraphs=args.html_paragraphs,
+        offload=args.offload,
+    )
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
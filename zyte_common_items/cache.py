@@ -0,0 +1,301 @@
+"""Opt-in cache of the items that :ref:`page objects <page-objects>` extract,
+keyed by the response they extract them from.
+
+Call :func:`enable_extraction_cache` to enable it. From then on,
+``to_item()`` of page objects with a ``response`` input, e.g.
+:class:`~zyte_common_items.ProductPage`, returns a cached copy of the item
+when the page object class, its code and the response URL and body have not
+changed since the item was cached, instead of running every field and field
+processor again.
+
+When using Scrapy, you can instead set the
+:setting:`ZYTE_COMMON_ITEMS_EXTRACTION_CACHE` setting of the :ref:`add-on
+<scrapy-config>`.
+
+Items are cached as the output of
+:class:`~zyte_common_items.ZyteItemKeepEmptyAdapter`, so that empty values
+are kept, and cached items are read back with
+:meth:`~zyte_common_items.Item.from_trusted_dict`, so they are equivalent to
+the original items as read back from their serialization, e.g. list fields
+of items that were ``None`` are empty lists. ``metadata.dateDownloaded``, if
+present, is set to the current time in returned items. Items with values
+that cannot be serialized into JSON, e.g. objects in unknown fields, are
+not cached.
+
+The code version of a page object class is a hash of the source code of
+every class in its MRO and of the zyte-common-items version. Changes to code
+outside those classes, e.g. to a custom field processor defined in a
+different module, are not detected, so clear the cache after such changes.
+
+The cache only applies to page object classes that inherit from the page
+object classes of zyte-common-items and do not override ``to_item()``, and
+whose only inputs are ``response`` and, optionally, ``request_url``. The
+output of page objects with other inputs, e.g. ``page_params`` or an
+``HttpClient``, may change for the same response, so it is not cached.
+
+Cache reads and writes are synchronous SQLite queries that run in the thread
+that calls ``to_item()``, i.e. in Scrapy they block the reactor while they
+run. They are usually much faster than extraction, but keep the database on
+a local disk: on a slow or network file system, reactor delays may cancel
+the benefit of the cache.
+"""
+
+import hashlib
+import inspect
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ._class_cache import _ClassCache
+from ._dateutils import utcnow_formatted
+from .adapter import ZyteItemKeepEmptyAdapter
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+"""Default maximum size, in bytes, of the cached data of
+:class:`ExtractionCache`."""
+
+_cache: Optional["ExtractionCache"] = None
+
+_PACKAGE_VERSION = (Path(__file__).parent / "VERSION").read_text().strip()
+
+
+def _compute_code_version(page_cls: type) -> str:
+    digest = hashlib.sha1(_PACKAGE_VERSION.encode())
+    for cls in page_cls.__mro__:
+        digest.update(f"{cls.__module__}.{cls.__qualname__}".encode())
+        try:
+            digest.update(inspect.getsource(cls).encode())
+        except (OSError, TypeError):
+            pass
+    return digest.hexdigest()
+
+
+# Caches the code version of each page object class.
+_CODE_VERSIONS: _ClassCache[str] = _ClassCache(_compute_code_version)
+
+
+def _get_code_version(page_cls: type) -> str:
+    return _CODE_VERSIONS[page_cls]
+
+
+# Inputs of page object classes that the cache key covers.
+_KEY_INPUTS = frozenset({"response", "request_url"})
+
+
+def _compute_cacheable(page_cls: type) -> bool:
+    try:
+        parameters = list(inspect.signature(page_cls).parameters.values())
+    except (TypeError, ValueError):
+        return False
+    return all(
+        parameter.name in _KEY_INPUTS
+        and parameter.kind
+        not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+        for parameter in parameters
+    )
+
+
+# Caches whether the output of each page object class can be cached.
+_CACHEABLE: _ClassCache[bool] = _ClassCache(_compute_cacheable)
+
+
+def _get_key(page: Any) -> Optional[bytes]:
+    """Return the cache key of *page*, or ``None`` if its output cannot be
+    cached."""
+    page_cls = type(page)
+    if not _CACHEABLE[page_cls]:
+        return None
+    response = getattr(page, "response", None)
+    body = getattr(response, "body", None)
+    if not isinstance(body, bytes):
+        return None
+    digest = hashlib.sha256()
+    for part in (
+        f"{page_cls.__module__}.{page_cls.__qualname__}",
+        _get_code_version(page_cls),
+        str(response.url),  # type: ignore[union-attr]
+        str(getattr(page, "request_url", "")),
+    ):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    digest.update(body)
+    return digest.digest()
+
+
+class ExtractionCache:
+    """SQLite-backed store of extracted items.
+
+    *path* is the path to the SQLite database, which is created if needed.
+    The default, ``":memory:"``, keeps the cache in memory.
+
+    When the size of the cached items, compressed, exceeds *max_size*
+    bytes, the least recently used items are removed.
+    """
+
+    def __init__(self, path: str = ":memory:", *, max_size: int = DEFAULT_MAX_SIZE):
+        if max_size <= 0:
+            raise ValueError(f"max_size must be a positive integer, got {max_size!r}")
+        self.max_size = max_size
+
+        self.hits: int = 0
+        """Number of items read from the cache."""
+
+        self.misses: int = 0
+        """Number of items that were not in the cache."""
+
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = sqlite3.connect(
+            path, check_same_thread=False
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS items "
+            "(key BLOB PRIMARY KEY, data BLOB, size INTEGER, used REAL) "
+            "WITHOUT ROWID"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS items_used ON items (used)"
+        )
+        self._size: int = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM items"
+        ).fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            assert self._connection is not None
+            return self._connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        """Size, in bytes, of the cached data."""
+        return self._size
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return the item data cached for *key*, or ``None``."""
+        with self._lock:
+            assert self._connection is not None
+            row = self._connection.execute(
+                "SELECT data FROM items WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE items SET used = ? WHERE key = ?", (time.time(), key)
+                )
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, key: bytes, data: Dict[str, Any]) -> None:
+        """Cache the item data *data* for *key*."""
+        blob = zlib.compress(
+            json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+        )
+        with self._lock:
+            assert self._connection is not None
+            with self._connection:
+                row = self._connection.execute(
+                    "SELECT size FROM items WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._size -= row[0]
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)",
+                    (key, blob, len(blob), time.time()),
+                )
+                self._size += len(blob)
+                if self._size > self.max_size:
+                    self._evict()
+
+    def _evict(self) -> None:
+        assert self._connection is not None
+        rows = self._connection.execute("SELECT key, size FROM items ORDER BY used")
+        evicted = []
+        for key, size in rows:
+            if self._size <= self.max_size:
+                break
+            evicted.append((key,))
+            self._size -= size
+        self._connection.executemany("DELETE FROM items WHERE key = ?", evicted)
+
+    def clear(self) -> None:
+        """Remove all cached items."""
+        with self._lock:
+            assert self._connection is not None
+            with self._connection:
+                self._connection.execute("DELETE FROM items")
+            self._size = 0
+
+    def to_stats(self, prefix: str = "extraction_cache") -> Dict[str, int]:
+        """Return cache statistics as a flat dict suitable for Scrapy
+        stats."""
+        return {
+            f"{prefix}/hits": self.hits,
+            f"{prefix}/misses": self.misses,
+            f"{prefix}/size": self.size,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def enable_extraction_cache(
+    cache: Optional[ExtractionCache] = None,
+    *,
+    path: str = ":memory:",
+    max_size: int = DEFAULT_MAX_SIZE,
+) -> ExtractionCache:
+    """Start caching extracted items into *cache*, or into a new
+    :class:`ExtractionCache` with the specified *path* and *max_size*, and
+    return it."""
+    global _cache
+    _cache = cache if cache is not None else ExtractionCache(path, max_size=max_size)
+    return _cache
+
+
+def disable_extraction_cache() -> Optional[ExtractionCache]:
+    """Stop caching extracted items, and return the :class:`ExtractionCache`
+    object that was used, if any.
+
+    The returned cache is not closed."""
+    global _cache
+    cache, _cache = _cache, None
+    return cache
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Return the :class:`ExtractionCache` object in use, or ``None`` if the
+    extraction cache is disabled."""
+    return _cache
+
+
+async def _cached_to_item(
+    page: Any, cache: ExtractionCache, to_item: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Return the output item of *page* from *cache*, or from *to_item* if it
+    is not cached, caching it."""
+    key = _get_key(page)
+    if key is None:
+        return await to_item()
+    data = cache.get(key)
+    if data is not None:
+        item = page.item_cls.from_trusted_dict(data)
+        metadata = getattr(item, "metadata", None)
+        if getattr(metadata, "dateDownloaded", None) is not None:
+            metadata.dateDownloaded = utcnow_formatted()  # type: ignore[union-attr]
+        return item
+    item = await to_item()
+    if type(item) is page.item_cls:
+        try:
+            cache.set(key, ZyteItemKeepEmptyAdapter(item).asdict())
+        except (TypeError, ValueError):  # Not JSON-serializable.
+            pass
+    return item
@@ -1,7 +1,22 @@
 import base64
-from typing import List, Optional, Type, TypeVar
+import hashlib
+import json
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 import attrs
+from w3lib.url import canonicalize_url, safe_url_string
 
 from zyte_common_items.base import Item, ProbabilityMixin
 from zyte_common_items.components.metadata import ProbabilityMetadata
@@ -19,10 +34,23 @@ class Header(Item):
     """Value of the header."""
 
 
+# Keys in the order of json.dumps(..., sort_keys=True), as Scrapy does.
+_FINGERPRINT_JSON = '{{"body": "{}", "headers": {}, "method": {}, "url": {}}}'
+
+# Maps (included header names, keep_fragments) to request fingerprints.
+_FingerprintCache = Dict[Tuple[Optional[Tuple[str, ...]], bool], bytes]
+
 RequestT = TypeVar("RequestT", bound="Request")
 """:class:`~typing.TypeVar` for :class:`Request`."""
 
 
+# The same URLs are often found in many navigation items, e.g. products in
+# several categories.
+@lru_cache(maxsize=65536)
+def _canonicalize_url(url: str, keep_fragments: bool) -> str:
+    return canonicalize_url(safe_url_string(url), keep_fragments=keep_fragments)
+
+
 @attrs.define(slots=False)
 class Request(Item):
     """Describe a web request to load a page"""
@@ -43,6 +71,8 @@ class Request(Item):
     """Name of the page being requested."""
 
     _body_bytes = None
+    # Not annotated, so that attrs does not make it a field.
+    _fingerprints = None  # type: Optional[_FingerprintCache]
 
     @property
     def body_bytes(self) -> Optional[bytes]:
@@ -71,6 +101,57 @@ class Request(Item):
             **kwargs,
         )
 
+    def request_fingerprint(
+        self,
+        *,
+        include_headers: Optional[Iterable[str]] = None,
+        keep_fragments: bool = False,
+    ) -> bytes:
+        """Return the fingerprint that the default request fingerprinter of
+        Scrapy (``scrapy.utils.request.fingerprint``) returns for the output
+        of :meth:`to_scrapy`, with the same parameters, without building a
+        :class:`scrapy.Request <scrapy.http.Request>` object.
+
+        It is unrelated to :meth:`~zyte_common_items.Item.fingerprint`, which
+        hashes the data of the request as an item, including its name and
+        metadata.
+
+        The result is cached, so the request must not be modified
+        afterwards.
+        """
+        names = (
+            tuple(sorted({name.lower() for name in include_headers}))
+            if include_headers
+            else None
+        )
+        key = (names, keep_fragments)
+        if self._fingerprints is None:
+            self._fingerprints = {}
+        else:
+            try:
+                return self._fingerprints[key]
+            except KeyError:
+                pass
+        headers: Dict[str, List[str]] = {}
+        for name in names or ():
+            values = [
+                header.value.encode().hex()
+                for header in self.headers or ()
+                if header.name.lower() == name
+            ]
+            if values:
+                headers[name.encode().hex()] = values
+        url = _canonicalize_url(self.url, keep_fragments)
+        data = _FINGERPRINT_JSON.format(
+            (self.body_bytes or b"").hex(),
+            json.dumps(headers, sort_keys=True) if headers else "{}",
+            json.dumps((self.method or "GET").upper()),
+            json.dumps(url),
+        )
+        fingerprint = hashlib.sha1(data.encode()).digest()
+        self._fingerprints[key] = fingerprint
+        return fingerprint
+
     def cast(self, cls: Type[RequestT]) -> RequestT:
         """Convert *value*, an instance of :class:`~.Request` or a subclass, into
         *cls*, a different class that is also either :class:`~.Request` or a
@@ -81,6 +162,51 @@ class Request(Item):
         return new_value
 
 
+def request_fingerprints(
+    requests: Iterable[Request],
+    *,
+    include_headers: Optional[Iterable[str]] = None,
+    keep_fragments: bool = False,
+) -> List[bytes]:
+    """Return the :meth:`~Request.request_fingerprint` of each of *requests*,
+    e.g. the :attr:`~zyte_common_items.ProductNavigation.items` of a
+    navigation item, with the same parameters."""
+    if include_headers:
+        include_headers = tuple(include_headers)
+    return [
+        request.request_fingerprint(
+            include_headers=include_headers, keep_fragments=keep_fragments
+        )
+        for request in requests
+    ]
+
+
+def to_scrapy_requests(
+    requests: Iterable[Request],
+    callback: Any,
+    *,
+    priority_fn: Optional[Callable[[Request], int]] = None,
+    **kwargs: Any,
+) -> Iterator[Any]:
+    """Yield each of *requests* converted to :class:`scrapy.Request
+    <scrapy.http.Request>`, as :meth:`Request.to_scrapy` does with
+    *callback* and *kwargs*.
+
+    If *priority_fn* is set, it is called with each request, and its return
+    value is used as the Scrapy priority of the request.
+
+    Requests are converted as they are consumed, so the output can be
+    yielded from a spider callback as is.
+    """
+    if priority_fn is not None and "priority" in kwargs:
+        raise ValueError("priority and priority_fn cannot be used together.")
+    for request in requests:
+        if priority_fn is None:
+            yield request.to_scrapy(callback, **kwargs)
+        else:
+            yield request.to_scrapy(callback, priority=priority_fn(request), **kwargs)
+
+
 @attrs.define(kw_only=True)
 class ProbabilityRequest(Request, ProbabilityMixin):
     """A :class:`Request` that includes a probability value."""
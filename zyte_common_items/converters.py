@@ -46,8 +46,14 @@ class MetadataCaster:
 def to_probability_request_list(request_list):
     """attrs converter to turn lists of :class:`~scrapy.Request` instances, or
     of dicts, into lists of :class:`~.ProbabilityRequest` instances."""
+    from zyte_common_items.base import _LazyItemList
     from zyte_common_items.components import ProbabilityRequest
 
+    if isinstance(request_list, _LazyItemList) and issubclass(
+        request_list._item_cls, ProbabilityRequest
+    ):
+        # Keep lists read with Item.from_dict(..., lazy=True) lazy.
+        return request_list
     return [
         (
             ProbabilityRequest.from_dict(request)
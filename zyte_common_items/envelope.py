@@ -0,0 +1,149 @@
+"""Reading of the items of Zyte API responses.
+
+Zyte API responses, or *envelopes*, put each requested item under a key
+named after its type, e.g. ``product`` or ``productList``.
+:func:`from_envelope` reads all of them at once:
+
+>>> from zyte_common_items.envelope import from_envelope
+>>> items = from_envelope(
+...     {
+...         "url": "https://example.com/a",
+...         "statusCode": 200,
+...         "product": {"url": "https://example.com/a", "name": "A"},
+...         "productNavigation": {"url": "https://example.com/a"},
+...     }
+... )
+>>> sorted(items)
+['product', 'productNavigation']
+>>> items["product"].name
+'A'
+
+The output can be given as is to
+:class:`~zyte_common_items.pipelines.DropLowProbabilityItemPipeline`, which
+supports :class:`dict` objects with items as values.
+
+Each key is read with the item class registered for it, see
+:func:`register_item_type`. Keys without a registered item class are
+ignored.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Type
+
+from .base import Item, _get_guard, is_data_container
+from .items import (
+    Article,
+    ArticleList,
+    ArticleNavigation,
+    BusinessPlace,
+    CustomAttributes,
+    ForumThread,
+    JobPosting,
+    JobPostingNavigation,
+    Product,
+    ProductList,
+    ProductNavigation,
+    RealEstate,
+    Serp,
+    SocialMediaPost,
+)
+from .limits import InputLimits
+
+DEFAULT_ITEM_TYPES: Mapping[str, Type[Item]] = {
+    "article": Article,
+    "articleList": ArticleList,
+    "articleNavigation": ArticleNavigation,
+    "businessPlace": BusinessPlace,
+    "customAttributes": CustomAttributes,
+    "forumThread": ForumThread,
+    "jobPosting": JobPosting,
+    "jobPostingNavigation": JobPostingNavigation,
+    "product": Product,
+    "productList": ProductList,
+    "productNavigation": ProductNavigation,
+    "realEstate": RealEstate,
+    "serp": Serp,
+    "socialMediaPost": SocialMediaPost,
+}
+"""Item classes registered by default, by Zyte API response key."""
+
+_item_types: Dict[str, Type[Item]] = dict(DEFAULT_ITEM_TYPES)
+
+
+def register_item_type(
+    name: str, item_cls: Optional[Type[Item]]
+) -> Optional[Type[Item]]:
+    """Make :func:`from_envelope` read the *name* key of responses with
+    *item_cls*, and return the item class previously registered for *name*,
+    if any.
+
+    Use it to read items with your own item classes, e.g. with a subclass of
+    :class:`~zyte_common_items.Product` that defines additional fields:
+
+    .. code-block:: python
+
+        register_item_type("product", CustomProduct)
+
+    If *item_cls* is ``None``, the *name* key is ignored from then on.
+    """
+    if item_cls is not None and not (
+        isinstance(item_cls, type) and is_data_container(item_cls)
+    ):
+        raise ValueError(f"Expected an item class, got {item_cls!r}.")
+    if item_cls is None:
+        return _item_types.pop(name, None)
+    previous = _item_types.get(name)
+    _item_types[name] = item_cls
+    return previous
+
+
+def get_item_types() -> Dict[str, Type[Item]]:
+    """Return a copy of the item classes that :func:`from_envelope` uses,
+    by response key."""
+    return dict(_item_types)
+
+
+def from_envelope(
+    response: Mapping[str, Any],
+    *,
+    item_types: Optional[Mapping[str, Optional[Type[Item]]]] = None,
+    lazy: bool = False,
+    trusted: bool = False,
+    limits: Optional[InputLimits] = None,
+) -> Dict[str, Item]:
+    """Return the items of the *response* Zyte API response, by response
+    key.
+
+    *item_types* maps response keys to the item classes to use instead of
+    the :func:`registered ones <register_item_type>`, or to ``None`` to
+    ignore those keys.
+
+    *lazy* works as in :meth:`~zyte_common_items.Item.from_dict`. Error
+    messages about invalid input start with the response key, e.g.
+    ``product.price``.
+
+    If *trusted* is ``True``, items are read with
+    :meth:`~zyte_common_items.Item.from_trusted_dict` instead, which is
+    faster, but only safe with valid input.
+
+    *limits* are :class:`~zyte_common_items.limits.InputLimits` to enforce
+    instead of the :func:`globally enabled ones
+    <zyte_common_items.limits.enable_input_limits>`, for all items of the
+    response together, e.g. ``max_nodes`` is the maximum number of values of
+    all items. They do not apply if *trusted* is ``True``.
+    """
+    guard = None if trusted else _get_guard(limits)
+    registry = _item_types
+    if item_types:
+        registry = {**registry, **item_types}  # type: ignore[dict-item]
+    items = {}
+    for name, value in response.items():
+        if value is None:
+            continue
+        item_cls = registry.get(name)
+        if item_cls is None:
+            continue
+        if trusted:
+            items[name] = item_cls.from_trusted_dict(value)
+        else:
+            items[name] = item_cls._from_dict(value, trail=name, lazy=lazy, guard=guard)
+    return items
@@ -1,7 +1,13 @@
-from typing import Callable, List, Optional
+from functools import lru_cache
+from inspect import getattr_static, getclosurevars
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
+from itemadapter import ItemAdapter
 from web_poet import ItemPage, field
 from web_poet.fields import get_fields_dict
+from web_poet.utils import callable_has_parameter
+
+from ._class_cache import _ClassCache
 
 
 def auto_field(
@@ -40,3 +46,73 @@ def is_auto_field(cls: ItemPage, field: str):
     fields_dict = get_fields_dict(cls)
     field_meta = fields_dict[field].meta or {}
     return field_meta.get("auto_field", False)
+
+
+def _get_field_processors(cls: type, name: str) -> List[Callable]:
+    """Return the processors of the field named *name* of the *cls* page
+    object class, i.e. those of its ``out`` parameter or, if not set, those
+    of the ``Processors`` class of *cls*."""
+    field_info = get_fields_dict(cls)[name]
+    if field_info.out is not None:
+        return list(field_info.out)
+    return list(getattr(getattr(cls, "Processors", None), name, []))
+
+
+def _compute_is_cached_field(descriptor_cls: type) -> bool:
+    # web-poet only keeps the cached parameter of @field in the closure of
+    # the descriptor class, which is a different class for every field.
+    get = getattr(descriptor_cls, "__get__", None)
+    if get is None:
+        return False
+    try:
+        return bool(getclosurevars(get).nonlocals.get("cached", False))
+    except (TypeError, ValueError):
+        return False
+
+
+# Caches whether each field descriptor class is that of a cached field.
+_CACHED_FIELD_CLASSES: _ClassCache[bool] = _ClassCache(_compute_is_cached_field)
+
+
+def _get_field_method(cls: type, name: str) -> Optional[Callable]:
+    """Return the undecorated method of the field named *name* of the *cls*
+    page object class, or ``None`` if it cannot be found or if the field is
+    cached, i.e. defined with ``@field(cached=True)``, in which case the
+    field must be read as an attribute for its cache to be used."""
+    descriptor = getattr_static(cls, name, None)
+    if _CACHED_FIELD_CLASSES[type(descriptor)]:
+        return None
+    return getattr(descriptor, "original_method", None)
+
+
+@lru_cache(maxsize=None)
+def _cached_takes_page(processor: Callable) -> bool:
+    return callable_has_parameter(processor, "page")
+
+
+def _takes_page(processor: Callable) -> bool:
+    try:
+        return _cached_takes_page(processor)
+    except TypeError:  # Unhashable.
+        return callable_has_parameter(processor, "page")
+
+
+def _call_processor(processor: Callable, value: Any, page: Any) -> Any:
+    if _takes_page(processor):
+        return processor(value, page=page)
+    return processor(value)
+
+
+async def _item_from_fields(
+    page: Any,
+    get_values: Callable[[Any, List[str]], Awaitable[Dict[str, Any]]],
+) -> Any:
+    """Equivalent of :func:`web_poet.fields.item_from_fields` that gets the
+    values of the fields of *page* from ``await get_values(page, names)``."""
+    item_cls = page.item_cls
+    names = list(get_fields_dict(type(page)))
+    if page._get_skip_nonitem_fields():
+        item_field_names = ItemAdapter.get_field_names_from_class(item_cls)
+        if item_field_names is not None:
+            names = [name for name in names if name in item_field_names]
+    return item_cls(**await get_values(page, names))
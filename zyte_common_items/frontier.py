@@ -0,0 +1,262 @@
+"""Crawl frontier for the requests of navigation items, e.g.
+:class:`~zyte_common_items.ProductNavigation`.
+
+A :class:`RequestFrontier` takes navigation items, and returns the requests
+of their ``items``, ``subCategories`` and ``nextPage`` fields that have not
+been seen before during the crawl, leaving out those with a probability
+lower than *min_probability*, each with a Scrapy priority based on its
+probability:
+
+>>> from zyte_common_items import ProductNavigation
+>>> from zyte_common_items.frontier import RequestFrontier
+>>> frontier = RequestFrontier(min_probability=0.5)
+>>> navigation = ProductNavigation.from_dict(
+...     {
+...         "url": "https://example.com/c",
+...         "items": [
+...             {"url": "https://example.com/1", "metadata": {"probability": 0.9}},
+...             {"url": "https://example.com/2", "metadata": {"probability": 0.1}},
+...             {"url": "https://example.com/1", "metadata": {"probability": 0.9}},
+...         ],
+...         "nextPage": {"url": "https://example.com/c?page=2"},
+...     }
+... )
+>>> requests = frontier.add(navigation)
+>>> [(request.url, priority) for request, priority in requests.items]
+[('https://example.com/1', 90)]
+>>> [(request.url, priority) for request, priority in requests.navigation]
+[('https://example.com/c?page=2', 100)]
+>>> frontier.add(navigation)
+FrontierRequests(items=[], navigation=[])
+>>> frontier.to_stats()
+{'request_frontier/seen': 8, 'request_frontier/accepted': 2, 'request_frontier/dropped': 2, 'request_frontier/duplicates': 4}
+
+The second call returns no requests, because all of them were seen during
+the first call.
+
+Use :meth:`RequestFrontier.to_scrapy` to get Scrapy requests instead:
+
+.. code-block:: python
+
+    def parse_navigation(self, response, navigation: ProductNavigation):
+        yield from self.frontier.to_scrapy(
+            navigation,
+            item_callback=self.parse_product,
+            navigation_callback=self.parse_navigation,
+        )
+"""
+
+import hashlib
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ._dedup import _BloomFilter, _FingerprintSet, _SpillingFingerprintSet
+from .components import Request
+
+DEFAULT_PRIORITY_BUCKETS = 10
+"""Default number of priority buckets of :class:`RequestFrontier`."""
+
+
+class FrontierRequests(NamedTuple):
+    """Requests accepted by :meth:`RequestFrontier.add`, as ``(request,
+    priority)`` tuples."""
+
+    items: List[Tuple[Request, int]]
+    """Requests from the ``items`` field of navigation items, i.e. requests
+    for item pages, e.g. product pages."""
+
+    navigation: List[Tuple[Request, int]]
+    """Requests from the ``subCategories`` and ``nextPage`` fields of
+    navigation items, i.e. requests for further navigation pages."""
+
+
+def _get_probability(request: Request) -> float:
+    # Requests without a probability, e.g. nextPage, are considered certain.
+    metadata = getattr(request, "metadata", None)
+    probability = getattr(metadata, "probability", None)
+    return 1.0 if probability is None else probability
+
+
+class RequestFrontier:
+    """Deduplicates, filters and prioritizes the requests of navigation
+    items.
+
+    Requests are deduplicated across all calls by a 128-bit fingerprint of
+    their method, URL and body. URLs are used as is, unless *normalize_url*
+    is set, e.g. to :func:`~zyte_common_items.urls.canonicalize_url`.
+
+    By default, only 64 bits of each fingerprint are kept in memory. For
+    crawls with hundreds of millions of requests, you can either use a Bloom
+    filter sized for *capacity* requests, which uses a fixed amount of memory
+    at the cost of dropping new requests as duplicates with a probability of
+    about *error_rate*, or move fingerprints to an SQLite database at
+    *spill_path* once *spill_threshold* fingerprints are kept in memory.
+
+    Requests with a probability lower than *min_probability* are dropped.
+    The priority of each accepted request is that of the probability bucket
+    it falls into, with *priority_buckets* buckets of the same size between
+    ``0`` and *max_priority*, e.g. with the defaults, requests with a
+    probability between 0.9 and 1 (exclusive) get priority 90. Requests
+    without a probability, e.g. ``nextPage``, have a probability of 1, unless
+    *next_page_priority* is set, in which case it is the priority of
+    ``nextPage`` requests.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_probability: float = 0.0,
+        priority_buckets: int = DEFAULT_PRIORITY_BUCKETS,
+        max_priority: int = 100,
+        next_page_priority: Optional[int] = None,
+        normalize_url: Optional[Callable[[str], str]] = None,
+        capacity: Optional[int] = None,
+        error_rate: float = 0.001,
+        spill_path: Optional[str] = None,
+        spill_threshold: int = 1_000_000,
+    ):
+        if priority_buckets <= 0:
+            raise ValueError(
+                f"priority_buckets must be a positive integer, got "
+                f"{priority_buckets!r}"
+            )
+        if capacity and spill_path:
+            raise ValueError("capacity and spill_path cannot be used together.")
+        self._min_probability = min_probability
+        self._buckets = priority_buckets
+        # Priority of each bucket, plus one for a probability of exactly 1.
+        self._priorities = tuple(
+            round(max_priority * index / priority_buckets)
+            for index in range(priority_buckets + 1)
+        )
+        self._next_page_priority = next_page_priority
+        self._normalize_url = normalize_url
+        self._fingerprints: Any
+        if capacity:
+            self._fingerprints = _BloomFilter(capacity, error_rate)
+        elif spill_path:
+            self._fingerprints = _SpillingFingerprintSet(spill_path, spill_threshold)
+        else:
+            self._fingerprints = _FingerprintSet()
+
+        self.seen: int = 0
+        """Number of requests processed."""
+
+        self.accepted: int = 0
+        """Number of requests accepted."""
+
+        self.dropped: int = 0
+        """Number of requests dropped for their low probability."""
+
+        self.duplicates: int = 0
+        """Number of requests dropped as duplicates."""
+
+    def get_fingerprint(self, request: Request) -> int:
+        """Return the fingerprint of *request* as an integer."""
+        url = request.url
+        if self._normalize_url is not None:
+            url = self._normalize_url(url)
+        data = f"{request.method or 'GET'} {url} {request.body or ''}".encode()
+        return int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), "big")
+
+    def get_priority(self, probability: float) -> int:
+        """Return the Scrapy priority of a request with *probability*."""
+        if probability <= 0:
+            return self._priorities[0]
+        if probability >= 1:
+            return self._priorities[-1]
+        return self._priorities[int(probability * self._buckets)]
+
+    def _accept(
+        self, requests: Iterable[Request], priority: Optional[int] = None
+    ) -> List[Tuple[Request, int]]:
+        requests = list(requests)
+        self.seen += len(requests)
+        min_probability = self._min_probability
+        kept = [
+            (request, probability)
+            for request in requests
+            if (probability := _get_probability(request)) >= min_probability
+        ]
+        self.dropped += len(requests) - len(kept)
+        add = self._fingerprints.add
+        accepted = [
+            (
+                request,
+                self.get_priority(probability) if priority is None else priority,
+            )
+            for request, probability in kept
+            if add(self.get_fingerprint(request))
+        ]
+        self.duplicates += len(kept) - len(accepted)
+        self.accepted += len(accepted)
+        return accepted
+
+    def add(self, navigation: Any) -> FrontierRequests:
+        """Process the requests of *navigation*, a navigation item, e.g.
+        :class:`~zyte_common_items.ProductNavigation`, or an iterable of
+        navigation items, and return those accepted."""
+        navigations = [navigation] if hasattr(navigation, "url") else navigation
+        item_requests: List[Request] = []
+        navigation_requests: List[Request] = []
+        next_pages: List[Request] = []
+        for item in navigations:
+            item_requests.extend(getattr(item, "items", None) or ())
+            navigation_requests.extend(getattr(item, "subCategories", None) or ())
+            next_page = getattr(item, "nextPage", None)
+            if next_page is not None:
+                next_pages.append(next_page)
+        if self._next_page_priority is None:
+            navigation_requests.extend(next_pages)
+            next_pages = []
+        return FrontierRequests(
+            self._accept(item_requests),
+            self._accept(navigation_requests)
+            + self._accept(next_pages, self._next_page_priority),
+        )
+
+    def to_scrapy(
+        self,
+        navigation: Any,
+        *,
+        item_callback: Callable,
+        navigation_callback: Callable,
+        **kwargs: Any,
+    ) -> List[Any]:
+        """Process the requests of *navigation* with :meth:`add`, and return
+        the accepted requests as :class:`scrapy.Request <scrapy.http.Request>`
+        objects with their priority.
+
+        Requests for item pages get *item_callback* as callback, and requests
+        for navigation pages get *navigation_callback*. *kwargs* are passed to
+        every :class:`scrapy.Request <scrapy.http.Request>`, and cannot
+        include ``priority``, which the frontier sets.
+        """
+        if "priority" in kwargs:
+            raise ValueError(
+                "priority cannot be passed to RequestFrontier.to_scrapy(), "
+                "the frontier sets the priority of each request."
+            )
+        accepted = self.add(navigation)
+        return [
+            request.to_scrapy(callback, priority=priority, **kwargs)
+            for requests, callback in (
+                (accepted.items, item_callback),
+                (accepted.navigation, navigation_callback),
+            )
+            for request, priority in requests
+        ]
+
+    def to_stats(self, prefix: str = "request_frontier") -> Dict[str, int]:
+        """Return frontier statistics as a flat dict suitable for Scrapy
+        stats."""
+        return {
+            f"{prefix}/seen": self.seen,
+            f"{prefix}/accepted": self.accepted,
+            f"{prefix}/dropped": self.dropped,
+            f"{prefix}/duplicates": self.duplicates,
+        }
+
+    def close(self) -> None:
+        """Release the resources of the fingerprint store, e.g. the SQLite
+        database connection if *spill_path* was set."""
+        self._fingerprints.close()
@@ -0,0 +1,275 @@
+"""Indexes to join items that describe the same entity, e.g. entries of
+:attr:`ProductList.products <zyte_common_items.ProductList.products>` and
+the :class:`~zyte_common_items.Product` items of their detail pages."""
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import attrs
+from w3lib.url import canonicalize_url
+
+from .base import Item, _get_trusted_plan
+from .util import convert_to_class
+
+DEFAULT_KEYS = ("url", "canonicalUrl", "productId", "sku", "gtin.value")
+"""Default keys of :class:`ItemIndex`, in order of precedence."""
+
+_ItemT = TypeVar("_ItemT", bound=Item)
+
+_PRECEDENCES = frozenset({"item", "index"})
+# Name of the key namespace shared by all URL keys.
+_URL_NAMESPACE = "url"
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (not value and isinstance(value, (str, list, dict)))
+
+
+def _is_url_key(key: str) -> bool:
+    name = key.rpartition(".")[2]
+    return name == "url" or name.endswith("Url")
+
+
+def _is_key_value(value: Any) -> bool:
+    # bool values are excluded, or True would match 1.
+    return isinstance(value, (str, int)) and not isinstance(value, bool) and value != ""
+
+
+def _iter_values(value: Any, names: Sequence[str]) -> Iterator[Any]:
+    """Yield the values found at the attribute path *names* of *value*,
+    walking into every item of list values."""
+    if isinstance(value, (list, tuple)):
+        for element in value:
+            yield from _iter_values(element, names)
+        return
+    if not names:
+        if _is_key_value(value):
+            yield value
+        return
+    if isinstance(value, dict):
+        child = value.get(names[0])
+    elif isinstance(value, Item):
+        child = getattr(value, names[0], None)
+        if child is None:
+            child = value._unknown_fields_dict.get(names[0])
+    else:
+        return
+    yield from _iter_values(child, names[1:])
+
+
+class ItemIndex:
+    """In-memory index of items by one or more keys.
+
+    *keys* are field paths, with nested fields separated by dots, in order of
+    precedence. Paths into list fields apply to every list item, e.g.
+    ``"gtin.value"`` indexes an item by each of its GTIN values.
+
+    URL keys, i.e. keys whose last field is ``url`` or ends in ``Url``, are
+    normalized with *normalize_url*, w3lib_'s ``canonicalize_url`` by
+    default, and share a namespace, so that the ``url`` of an item matches
+    the ``canonicalUrl`` of another one. Values of other keys only match
+    values of the same key.
+
+    For example, to join product list entries with products:
+
+    >>> from zyte_common_items import Product, ProductFromList
+    >>> index = ItemIndex(
+    ...     [
+    ...         ProductFromList(url="https://example.com/a?x=1&y=2", price="5.00"),
+    ...         ProductFromList(url="https://example.com/b", name="B"),
+    ...     ]
+    ... )
+    >>> product = Product(url="https://example.com/a?y=2&x=1", name="A")
+    >>> index.find(product).url
+    'https://example.com/a?x=1&y=2'
+    >>> merged = index.merge([product])[0]
+    >>> merged.name, merged.price
+    ('A', '5.00')
+
+    .. _w3lib: https://w3lib.readthedocs.io/en/latest/
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any] = (),
+        *,
+        keys: Sequence[str] = DEFAULT_KEYS,
+        normalize_url: Callable[[str], str] = canonicalize_url,
+    ):
+        self._keys: Tuple[Tuple[str, str, Tuple[str, ...], bool], ...] = tuple(
+            (
+                key,
+                _URL_NAMESPACE if _is_url_key(key) else key,
+                tuple(key.split(".")),
+                _is_url_key(key),
+            )
+            for key in keys
+        )
+        self._key_names = {
+            key: (namespace, is_url) for key, namespace, _, is_url in self._keys
+        }
+        self._normalize_url = normalize_url
+        self._items: List[Any] = []
+        # Maps each (namespace, value) key to the position of the matching
+        # item, or to a list of positions if there are many.
+        self._positions: Dict[Tuple[str, Any], Union[int, List[int]]] = {}
+        self.add_many(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def _iter_keys(self, item: Any) -> Iterator[Tuple[str, Any]]:
+        for _, namespace, names, is_url in self._keys:
+            for value in _iter_values(item, names):
+                if is_url:
+                    try:
+                        value = self._normalize_url(value)
+                    except (TypeError, ValueError):
+                        continue
+                yield namespace, value
+
+    def add(self, item: Any) -> None:
+        """Add *item* to the index."""
+        position = len(self._items)
+        self._items.append(item)
+        for key in self._iter_keys(item):
+            positions = self._positions.get(key)
+            if positions is None:
+                self._positions[key] = position
+            elif isinstance(positions, int):
+                if positions != position:
+                    self._positions[key] = [positions, position]
+            elif positions[-1] != position:
+                positions.append(position)
+
+    def add_many(self, items: Iterable[Any]) -> None:
+        """Add *items* to the index."""
+        for item in items:
+            self.add(item)
+
+    def _lookup(self, key: Tuple[str, Any]) -> Iterator[int]:
+        positions = self._positions.get(key)
+        if positions is None:
+            return
+        if isinstance(positions, int):
+            yield positions
+        else:
+            yield from positions
+
+    def get(self, key: str, value: Any) -> List[Any]:
+        """Return the indexed items whose *key* has *value*.
+
+        *key* must be one of the keys of the index.
+        """
+        if key not in self._key_names:
+            raise KeyError(key)
+        namespace, is_url = self._key_names[key]
+        if not _is_key_value(value):
+            return []
+        if is_url:
+            value = self._normalize_url(value)
+        return [self._items[position] for position in self._lookup((namespace, value))]
+
+    def find_all(self, item: Any) -> List[Any]:
+        """Return the indexed items that share any key value with *item*.
+
+        Items are sorted by the precedence of the first key that matches
+        them, and by insertion order.
+        """
+        seen = set()
+        result = []
+        for key in self._iter_keys(item):
+            for position in self._lookup(key):
+                if position not in seen:
+                    seen.add(position)
+                    result.append(self._items[position])
+        return result
+
+    def find(self, item: Any) -> Optional[Any]:
+        """Return the indexed item that best matches *item*, or ``None``.
+
+        The best match is the first indexed item matched by the key with the
+        highest precedence.
+        """
+        for key in self._iter_keys(item):
+            for position in self._lookup(key):
+                return self._items[position]
+        return None
+
+    def merge(
+        self,
+        items: Iterable[_ItemT],
+        *,
+        prefer: str = "item",
+        precedence: Optional[Mapping[str, str]] = None,
+    ) -> List[_ItemT]:
+        """Return a copy of each item of *items* with the fields of its
+        :meth:`best match <find>` in the index merged in.
+
+        For each field that the classes of both items define, *prefer*
+        determines which value wins: ``"item"`` for the value of the item
+        from *items*, ``"index"`` for the value of the indexed item.
+        *precedence* maps field names to ``"item"`` or ``"index"`` to
+        override *prefer* for specific fields. Empty values never win over
+        non-empty ones. ``None``, empty strings and empty
+        lists are empty values.
+
+        Nested items are converted into the class that the field expects,
+        e.g. the :class:`~zyte_common_items.ProbabilityMetadata` of a
+        :class:`~zyte_common_items.ProductFromList` into
+        :class:`~zyte_common_items.ProductMetadata`. Items without a match
+        are returned as is.
+        """
+        precedence = dict(precedence or {})
+        for value in (prefer, *precedence.values()):
+            if value not in _PRECEDENCES:
+                raise ValueError(
+                    f"Expected a precedence of 'item' or 'index', got {value!r}."
+                )
+        return [self._merge(item, prefer, precedence) for item in items]
+
+    def _merge(self, item: _ItemT, prefer: str, precedence: Dict[str, str]) -> _ItemT:
+        match = self.find(item)
+        if match is None:
+            return item
+        match_names = {field.name for field in attrs.fields(type(match))}
+        changes = {}
+        for name, _, item_cls, is_list in _get_trusted_plan(type(item))[1]:
+            if name not in match_names:
+                continue
+            value = getattr(item, name)
+            match_value = getattr(match, name)
+            if _is_empty(match_value):
+                continue
+            if not _is_empty(value) and precedence.get(name, prefer) == "item":
+                continue
+            if item_cls is not None:
+                if is_list:
+                    match_value = [
+                        convert_to_class(element, item_cls) for element in match_value
+                    ]
+                else:
+                    match_value = convert_to_class(match_value, item_cls)
+            changes[name] = match_value
+        if not changes:
+            return item
+        merged = attrs.evolve(item, **changes)
+        merged._unknown_fields_dict = dict(  # type: ignore[misc]
+            item._unknown_fields_dict
+        )
+        return merged
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from base64 import b64encode
+from functools import lru_cache
 from typing import Any, List, Optional
 from urllib.parse import quote_plus
 from warnings import warn
@@ -19,8 +20,15 @@ _TEMPLATE_ENVIRONMENT.filters["quote_plus"] = quote_plus
 _UNSET = object()
 
 
+# Environment.from_string() compiles the template source on every call.
+# lru_cache is thread-safe, and so is rendering a compiled template.
+@lru_cache(maxsize=1024)
+def _get_template(template: str) -> jinja2.Template:
+    return _TEMPLATE_ENVIRONMENT.from_string(template)
+
+
 def _render_query(template: str, query: str) -> str:
-    parsed_template = _TEMPLATE_ENVIRONMENT.from_string(template)
+    parsed_template = _get_template(template)
     try:
         return parsed_template.render(query=query)
     except UndefinedError:
@@ -0,0 +1,76 @@
+"""Limits on the input that :meth:`Item.from_dict()
+<zyte_common_items.Item.from_dict>` and :meth:`Item.from_list()
+<zyte_common_items.Item.from_list>` accept, to bound the CPU and memory that
+reading untrusted input can use.
+
+Pass an :class:`InputLimits` object as the *limits* parameter of those
+methods, or of :func:`~zyte_common_items.envelope.from_envelope`, or call
+:func:`enable_input_limits` to apply limits to every call that does not
+set *limits*:
+
+>>> from zyte_common_items import Product
+>>> from zyte_common_items.limits import InputLimits
+>>> Product.from_dict(
+...     {"url": "https://example.com", "images": [{"url": "https://example.com/1.png"}] * 3},
+...     limits=InputLimits(max_list_length=2),
+... )
+Traceback (most recent call last):
+...
+ValueError: Expected images to have at most 2 items, got 3.
+
+Input that exceeds a limit raises :exc:`ValueError`, with the path of the
+offending field in the error message, like other invalid input.
+
+Limits apply to the whole input, including unknown fields and fields that
+are not items, e.g. :class:`dict` fields. With ``lazy=True``, items in list
+fields are checked when they are built.
+"""
+
+from typing import Optional
+
+import attrs
+
+_limits: Optional["InputLimits"] = None
+
+
+@attrs.define(frozen=True)
+class InputLimits:
+    """Limits on the input of :meth:`Item.from_dict()
+    <zyte_common_items.Item.from_dict>`. ``None`` means no limit."""
+
+    max_depth: Optional[int] = None
+    """Maximum nesting level of dicts and lists, where the input dict is at
+    level 1, e.g. ``Product.variants`` is at level 2, and each variant at level
+    3."""
+
+    max_list_length: Optional[int] = None
+    """Maximum number of values in a list."""
+
+    max_nodes: Optional[int] = None
+    """Maximum number of values, including dicts, lists and their values, in
+    the whole input."""
+
+    max_string_length: Optional[int] = None
+    """Maximum number of characters of a string."""
+
+
+def enable_input_limits(limits: InputLimits) -> InputLimits:
+    """Apply *limits* to every call that does not set its own limits, and
+    return them."""
+    global _limits
+    _limits = limits
+    return _limits
+
+
+def disable_input_limits() -> Optional[InputLimits]:
+    """Stop applying limits by default, and return the limits that were
+    applied, if any."""
+    global _limits
+    limits, _limits = _limits, None
+    return limits
+
+
+def get_input_limits() -> Optional[InputLimits]:
+    """Return the limits applied by default, or ``None`` if there are
+    none."""
+    return _limits
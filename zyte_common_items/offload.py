@@ -0,0 +1,172 @@
+"""Opt-in mode that runs CPU-heavy :ref:`field processors <processors>` in
+an executor, so that they do not block the event loop.
+
+Call :func:`enable_processor_offloading` to enable it. From then on,
+``to_item()`` of :ref:`page objects <page-objects>` computes all fields
+concurrently, and runs :func:`offloadable <mark_offloadable>` processors in
+the configured executor, awaiting their results. Other field processors
+still run in the event loop thread.
+
+:func:`~zyte_common_items.processors.breadcrumbs_processor`,
+:func:`~zyte_common_items.processors.description_html_processor` and
+:func:`~zyte_common_items.processors.description_processor` are offloadable
+by default.
+
+lxml releases the GIL for parts of the work of those processors, so a
+:class:`~concurrent.futures.ThreadPoolExecutor` lets extraction overlap with
+network I/O and with other processors. A
+:class:`~concurrent.futures.ProcessPoolExecutor` can only be used if every
+offloadable processor gets picklable input and does not rely on modifying
+the page object, which is not the case for the built-in processors.
+
+Offloadable processors run in executor threads at the same time as each
+other and as the rest of the page object code, all with the same page
+object. They may read the page object, e.g. its response, and set
+attributes that no other code of the page object reads while fields are
+being computed, e.g. ``page._description_node`` in
+:func:`~zyte_common_items.processors.description_processor`, but they must
+not read or modify any other page object state. Processors that do not
+follow this contract must not be marked as offloadable.
+
+Offloading only applies to page object classes that inherit from the page
+object classes of zyte-common-items and do not override ``to_item()``, and
+only when ``to_item()`` runs in an :mod:`asyncio` event loop (e.g. with the
+asyncio Twisted reactor in Scrapy). Otherwise, processors run normally.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, TypeVar
+
+from web_poet.utils import ensure_awaitable
+
+from .fields import (
+    _call_processor,
+    _get_field_method,
+    _get_field_processors,
+    _item_from_fields,
+)
+from .processors import (
+    breadcrumbs_processor,
+    description_html_processor,
+    description_processor,
+)
+
+ProcessorT = TypeVar("ProcessorT", bound=Callable)
+
+_OFFLOADABLE_PROCESSORS: Set[Callable] = {
+    breadcrumbs_processor,
+    description_html_processor,
+    description_processor,
+}
+_executor: Optional[Executor] = None
+_owns_executor = False
+
+
+def mark_offloadable(processor: ProcessorT) -> ProcessorT:
+    """Mark *processor* as a field processor that can run in the executor
+    configured with :func:`enable_processor_offloading`, and return it.
+
+    *processor* must be thread-safe, and follow the contract on page object
+    access described in :mod:`zyte_common_items.offload`.
+
+    It can be used as a decorator:
+
+    .. code-block:: python
+
+        from zyte_common_items.offload import mark_offloadable
+
+
+        @mark_offloadable
+        def expensive_processor(value, page):
+            ...
+    """
+    _OFFLOADABLE_PROCESSORS.add(processor)
+    return processor
+
+
+def is_offloadable(processor: Callable) -> bool:
+    """Return ``True`` if *processor* has been marked with
+    :func:`mark_offloadable`."""
+    try:
+        return processor in _OFFLOADABLE_PROCESSORS
+    except TypeError:  # Unhashable.
+        return False
+
+
+def enable_processor_offloading(
+    executor: Optional[Executor] = None, *, max_workers: Optional[int] = None
+) -> Executor:
+    """Start running offloadable field processors in *executor*, and return
+    it.
+
+    If *executor* is not specified, a new
+    :class:`~concurrent.futures.ThreadPoolExecutor` with up to *max_workers*
+    threads is used, and it is shut down by
+    :func:`disable_processor_offloading`.
+    """
+    global _executor, _owns_executor
+    disable_processor_offloading()
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="zyte_common_items"
+        )
+        _owns_executor = True
+    _executor = executor
+    return executor
+
+
+def disable_processor_offloading() -> None:
+    """Stop offloading field processors.
+
+    If the executor was created by :func:`enable_processor_offloading`, it is
+    also shut down.
+    """
+    global _executor, _owns_executor
+    executor, _executor = _executor, None
+    if executor is not None and _owns_executor:
+        executor.shutdown(wait=False)
+    _owns_executor = False
+
+
+def _get_running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+async def _offloaded_field(
+    page: Any, name: str, executor: Executor, loop: asyncio.AbstractEventLoop
+) -> Any:
+    page_cls = type(page)
+    method = _get_field_method(page_cls, name)
+    if method is None:
+        return await ensure_awaitable(getattr(page, name))
+    value = await ensure_awaitable(method(page))
+    for processor in _get_field_processors(page_cls, name):
+        if is_offloadable(processor):
+            value = await loop.run_in_executor(
+                executor, _call_processor, processor, value, page
+            )
+        else:
+            value = _call_processor(processor, value, page)
+    return value
+
+
+async def _offloaded_to_item(page: Any, executor: Executor) -> Any:
+    """Equivalent of :func:`web_poet.fields.item_from_fields` that computes
+    all fields concurrently and runs offloadable processors in *executor*.
+
+    Returns ``None`` if there is no running asyncio event loop."""
+    loop = _get_running_loop()
+    if loop is None:
+        return None
+
+    async def get_values(page: Any, names: List[str]) -> Dict[str, Any]:
+        values = await asyncio.gather(
+            *(_offloaded_field(page, name, executor, loop) for name in names)
+        )
+        return dict(zip(names, values))
+
+    return await _item_from_fields(page, get_values)
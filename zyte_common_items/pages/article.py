@@ -32,6 +32,8 @@ class ArticlePage(Page, Returns[Article], HasMetadata[ArticleMetadata]):
 class AutoArticlePage(BaseArticlePage):
     article: Article
 
+    _auto_item_attribute = "article"
+
     @auto_field
     def headline(self) -> Optional[str]:
         return self.article.headline
@@ -32,6 +32,8 @@ class ArticleListPage(Page, Returns[ArticleList], HasMetadata[ArticleListMetadat
 class AutoArticleListPage(BaseArticleListPage):
     article_list: ArticleList
 
+    _auto_item_attribute = "article_list"
+
     @auto_field
     def articles(self) -> Optional[List[ArticleFromList]]:
         return self.article_list.articles
@@ -27,6 +27,8 @@ class ArticleNavigationPage(
 class AutoArticleNavigationPage(BaseArticleNavigationPage):
     article_navigation: ArticleNavigation
 
+    _auto_item_attribute = "article_navigation"
+
     @auto_field
     def categoryName(self) -> Optional[str]:
         return self.article_navigation.categoryName
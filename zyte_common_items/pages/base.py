@@ -1,17 +1,93 @@
+from inspect import getattr_static
+from typing import Any, Optional, Tuple
+
 import attrs
-from web_poet import ItemPage, RequestUrl, WebPage, field
-from web_poet.pages import ItemT
+from web_poet import ItemPage, RequestUrl, WebPage, field, validates_input
+from web_poet.fields import get_fields_dict
+from web_poet.pages import ItemT, get_item_cls
+from web_poet.utils import ensure_awaitable
 
+from .. import cache, offload, timing
+from .._class_cache import _ClassCache
 from .._dateutils import utcnow_formatted
 from ..components import MetadataT
+from ..fields import _get_field_processors
 from ..processors import metadata_processor
 from .mixins import HasMetadata
 
 
+def _find_auto_base(cls: type) -> type:
+    for base in cls.__mro__:
+        if "_auto_item_attribute" in base.__dict__:
+            return base
+    raise AssertionError(f"{cls} has no auto page object class as a base")
+
+
+def _compute_auto_overridden_fields(cls: type) -> Optional[Tuple[str, ...]]:
+    auto_base = _find_auto_base(cls)
+    fields = get_fields_dict(cls)
+    overridden: Optional[Tuple[str, ...]]
+    item_cls = get_item_cls(auto_base, default=None)
+    if (
+        item_cls is None
+        or get_item_cls(cls, default=None) is not item_cls
+        or set(fields) != set(attrs.fields_dict(item_cls))
+    ):
+        overridden = None
+    else:
+        overridden = tuple(
+            name
+            for name in fields
+            if getattr_static(cls, name, None)
+            is not getattr_static(auto_base, name, None)
+            or _get_field_processors(cls, name)
+            != _get_field_processors(auto_base, name)
+        )
+    return overridden
+
+
+# Caches the names of the fields that a subclass of an auto page object class
+# overrides, or None if the subclass cannot build its output item from the
+# input item.
+_AUTO_OVERRIDDEN_FIELDS: _ClassCache[Optional[Tuple[str, ...]]] = _ClassCache(
+    _compute_auto_overridden_fields
+)
+
+
+def _get_auto_overridden_fields(cls: type) -> Optional[Tuple[str, ...]]:
+    return _AUTO_OVERRIDDEN_FIELDS[cls]
+
+
 class _BasePage(ItemPage[ItemT], HasMetadata[MetadataT]):
     class Processors:
         metadata = [metadata_processor]
 
+    # Name of the attribute with the input item of auto page object classes.
+    _auto_item_attribute: Optional[str] = None
+
+    async def _auto_to_item(self) -> Optional[ItemT]:
+        """Return the output item of an auto page object built from its input
+        item, only recomputing the fields that a subclass overrides, or
+        ``None`` if that is not possible."""
+        overridden = _get_auto_overridden_fields(type(self))
+        if overridden is None:
+            return None
+        assert self._auto_item_attribute is not None
+        input_item: Any = getattr(self, self._auto_item_attribute)
+        if input_item.__class__ is not self.item_cls:
+            return None
+        if not overridden:
+            return input_item
+        if timing._timings is not None:
+            changes = await timing._timed_fields(self, overridden, timing._timings)
+        else:
+            changes = {
+                name: await ensure_awaitable(getattr(self, name)) for name in overridden
+            }
+        item = attrs.evolve(input_item, **changes)
+        item._unknown_fields_dict = dict(input_item._unknown_fields_dict)
+        return item
+
     @field
     def metadata(self) -> MetadataT:
         if self.metadata_cls is None:
@@ -24,6 +100,25 @@ class _BasePage(ItemPage[ItemT], HasMetadata[MetadataT]):
             value.probability = 1.0  # type: ignore
         return value
 
+    @validates_input
+    async def to_item(self) -> ItemT:
+        if cache._cache is not None:
+            return await cache._cached_to_item(self, cache._cache, self._to_item)
+        return await self._to_item()
+
+    async def _to_item(self) -> ItemT:
+        if self._auto_item_attribute is not None:
+            item = await self._auto_to_item()
+            if item is not None:
+                return item
+        if offload._executor is not None:
+            item = await offload._offloaded_to_item(self, offload._executor)
+            if item is not None:
+                return item
+        if timing._timings is not None:
+            return await timing._timed_to_item(self, timing._timings)
+        return await super().to_item()
+
     def no_item_found(self) -> ItemT:
         """Return an item with the current url and probability=0,
         indicating that the passed URL doesn't contain the expected item.
@@ -52,6 +52,8 @@ class BusinessPlacePage(
 class AutoBusinessPlacePage(BaseBusinessPlacePage):
     business_place: BusinessPlace
 
+    _auto_item_attribute = "business_place"
+
     @auto_field
     def actions(self) -> Optional[List[NamedLink]]:
         return self.business_place.actions
@@ -25,6 +25,8 @@ class ForumThreadPage(Page, Returns[ForumThread], HasMetadata[ForumThreadMetadat
 class AutoForumThreadPage(BaseForumThreadPage):
     forum_thread: ForumThread
 
+    _auto_item_attribute = "forum_thread"
+
     @auto_field
     def url(self) -> Optional[str]:
         return self.forum_thread.url
@@ -39,6 +39,8 @@ class JobPostingPage(
 class AutoJobPostingPage(BaseJobPostingPage):
     job_posting: JobPosting
 
+    _auto_item_attribute = "job_posting"
+
     @auto_field
     def url(self) -> Optional[str]:
         return self.job_posting.url
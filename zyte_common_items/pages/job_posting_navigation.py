@@ -32,6 +32,8 @@ class JobPostingNavigationPage(
 class AutoJobPostingNavigationPage(BaseJobPostingNavigationPage):
     job_posting_navigation: JobPostingNavigation
 
+    _auto_item_attribute = "job_posting_navigation"
+
     @auto_field
     def items(self) -> Optional[List[ProbabilityRequest]]:
         return self.job_posting_navigation.items
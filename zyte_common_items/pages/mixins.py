@@ -8,6 +8,7 @@ from price_parser import Price
 from web_poet.fields import FieldsMixin, field
 from web_poet.utils import ensure_awaitable, get_generic_param
 
+from zyte_common_items._class_cache import _ClassCache
 from zyte_common_items.components import MetadataT
 
 
@@ -21,8 +22,14 @@ class HasMetadata(Generic[MetadataT]):
         return _get_metadata_class(type(self))
 
 
+# Caches the metadata class of each page object class.
+_METADATA_CLASSES: _ClassCache[Optional[type]] = _ClassCache(
+    lambda cls: get_generic_param(cls, HasMetadata)
+)
+
+
 def _get_metadata_class(cls: type) -> Optional[Type[MetadataT]]:
-    return get_generic_param(cls, HasMetadata)
+    return _METADATA_CLASSES[cls]
 
 
 class PriceMixin(FieldsMixin):
@@ -71,6 +71,8 @@ class ProductPage(
 class AutoProductPage(BaseProductPage):
     product: Product
 
+    _auto_item_attribute = "product"
+
     @auto_field
     def additionalProperties(self) -> Optional[List[AdditionalProperty]]:
         return self.product.additionalProperties
@@ -32,6 +32,8 @@ class ProductListPage(Page, Returns[ProductList], HasMetadata[ProductListMetadat
 class AutoProductListPage(BaseProductListPage):
     product_list: ProductList
 
+    _auto_item_attribute = "product_list"
+
     @auto_field
     def breadcrumbs(self) -> Optional[List[Breadcrumb]]:
         return self.product_list.breadcrumbs
@@ -32,6 +32,8 @@ class ProductNavigationPage(
 class AutoProductNavigationPage(BaseProductNavigationPage):
     product_navigation: ProductNavigation
 
+    _auto_item_attribute = "product_navigation"
+
     @auto_field
     def categoryName(self) -> Optional[str]:
         return self.product_navigation.categoryName
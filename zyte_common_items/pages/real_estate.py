@@ -42,6 +42,8 @@ class RealEstatePage(Page, Returns[RealEstate], HasMetadata[RealEstateMetadata])
 class AutoRealEstatePage(BaseRealEstatePage):
     real_estate: RealEstate
 
+    _auto_item_attribute = "real_estate"
+
     @auto_field
     def additionalProperties(self) -> Optional[List[AdditionalProperty]]:
         return self.real_estate.additionalProperties
@@ -22,6 +22,8 @@ class SerpPage(Page, Returns[Serp], HasMetadata[SerpMetadata]):
 class AutoSerpPage(BaseSerpPage):
     serp: Serp
 
+    _auto_item_attribute = "serp"
+
     @auto_field
     def organicResults(self) -> Optional[List[SerpOrganicResult]]:
         return self.serp.organicResults
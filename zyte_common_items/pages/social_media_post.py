@@ -27,6 +27,8 @@ class SocialMediaPostPage(
 class AutoSocialMediaPostPage(BaseSocialMediaPostPage):
     social_media_post: SocialMediaPost
 
+    _auto_item_attribute = "social_media_post"
+
     @auto_field
     def url(self) -> Optional[str]:
         return self.social_media_post.url
@@ -3,12 +3,36 @@ import scrapy  # isort: skip  # noqa: F401
 
 import logging
 from copy import deepcopy
-
-from .base import ProbabilityMixin
+from hashlib import sha1
+
+import attrs
+
+from ._class_cache import _ClassCache
+from ._dedup import (
+    _BloomFilter,
+    _FieldHashStore,
+    _FingerprintSet,
+    _SpillingFingerprintSet,
+)
+from .adapter import ZyteItemAdapter
+from .base import Item, ProbabilityMixin
 from .log_formatters import InfoDropItem
 
 logger = logging.getLogger(__name__)
 
+# Fingerprint of an item with all fingerprint fields empty.
+_EMPTY_FINGERPRINT = sha1(b"{}").hexdigest()
+
+
+def _compute_salt(item_cls: type) -> int:
+    path = f"{item_cls.__module__}.{item_cls.__qualname__}"
+    return int(sha1(path.encode()).hexdigest(), 16)
+
+
+# Caches the value of each item class that is mixed into item fingerprints,
+# so that items of different classes never match.
+_SALTS: _ClassCache[int] = _ClassCache(_compute_salt)
+
 
 class AEPipeline:
     """Replace standard items with matching items with the old Zyte Automatic
@@ -173,3 +197,397 @@ class DropLowProbabilityItemPipeline:
             f"This item is dropped since the probability ({item.get_probability()}) "
             f"is below the threshold ({threshold}):"
         )
+
+
+class DropDuplicateItemPipeline:
+    """:ref:`Item pipeline <topics-item-pipeline>` that drops
+    :ref:`items <items>` that have already been seen.
+
+    Items are compared by their :meth:`~zyte_common_items.Item.fingerprint`,
+    computed from the fields that the :setting:`DUPLICATE_ITEM_FIELDS`
+    setting defines for their item class. Items of different classes are
+    never considered duplicates of each other.
+
+    Items whose fingerprint fields are all empty are never dropped, and
+    objects that are not :ref:`items <items>` are returned unchanged.
+
+    By default, only 64 bits of each fingerprint are kept in memory. For
+    crawls with hundreds of millions of items, you can either use a Bloom
+    filter with :setting:`DUPLICATE_ITEM_BLOOM_FILTER_CAPACITY`, which uses a
+    fixed amount of memory at the cost of some false positives, or move
+    fingerprints to disk with :setting:`DUPLICATE_ITEM_SPILL_PATH`.
+
+    .. setting:: DUPLICATE_ITEM_FIELDS
+
+    DUPLICATE_ITEM_FIELDS
+    ---------------------
+
+    Default: ``{"default": None}``
+
+    Allows defining, for each item class, the fields that determine whether
+    2 items are duplicates, and the fields to use for any other item class.
+
+    Nested fields can be defined with dot-separated paths (e.g.
+    ``"gtin.value"``). ``None`` means all fields except
+    ``metadata.dateDownloaded``.
+
+    Item classes can be defined using either an import path of the item
+    class or directly using the item class itself.
+
+    For example:
+
+    .. code-block:: python
+
+        from zyte_common_items import Article
+
+        DUPLICATE_ITEM_FIELDS = {
+            Article: ["url"],
+            "zyte_common_items.Product": ["url", "productId"],
+            "default": None,
+        }
+
+    .. setting:: DUPLICATE_ITEM_BLOOM_FILTER_CAPACITY
+
+    DUPLICATE_ITEM_BLOOM_FILTER_CAPACITY
+    ------------------------------------
+
+    Default: ``None``
+
+    If set, a Bloom filter sized for this number of items is used instead of
+    an exact set of fingerprints.
+
+    .. setting:: DUPLICATE_ITEM_BLOOM_FILTER_ERROR_RATE
+
+    DUPLICATE_ITEM_BLOOM_FILTER_ERROR_RATE
+    --------------------------------------
+
+    Default: ``0.001``
+
+    Probability of the Bloom filter dropping an item that is not a duplicate,
+    as long as no more than :setting:`DUPLICATE_ITEM_BLOOM_FILTER_CAPACITY`
+    unique items are processed.
+
+    .. setting:: DUPLICATE_ITEM_SPILL_PATH
+
+    DUPLICATE_ITEM_SPILL_PATH
+    -------------------------
+
+    Default: ``None``
+
+    If set, path to an SQLite database where fingerprints are moved once
+    :setting:`DUPLICATE_ITEM_SPILL_THRESHOLD` fingerprints are kept in memory.
+
+    The database is not removed when the spider closes, so it can also be
+    used to drop duplicates of items from previous crawls.
+
+    .. setting:: DUPLICATE_ITEM_SPILL_THRESHOLD
+
+    DUPLICATE_ITEM_SPILL_THRESHOLD
+    ------------------------------
+
+    Default: ``1000000``
+
+    Maximum number of fingerprints to keep in memory when
+    :setting:`DUPLICATE_ITEM_SPILL_PATH` is set.
+    """
+
+    DEFAULT_FIELDS = None
+    DEFAULT_EXCLUDE = ("metadata.dateDownloaded",)
+
+    def __init__(self, crawler):
+        self.stats = crawler.stats
+        self.fields_for_item = {}
+        self.default_fields = None
+        self.init_fields(crawler.spider)
+        self.fingerprints = self.init_fingerprints(crawler.spider)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def init_fields(self, spider):
+        from scrapy.utils.misc import load_object
+
+        fields_settings = deepcopy(spider.settings.get("DUPLICATE_ITEM_FIELDS", {}))
+
+        self.default_fields = fields_settings.pop("default", self.DEFAULT_FIELDS)
+
+        for item, fields in fields_settings.items():
+            item_type = load_object(item) if isinstance(item, str) else item
+            self.fields_for_item[item_type] = fields
+
+    def init_fingerprints(self, spider):
+        settings = spider.settings
+        capacity = settings.getint("DUPLICATE_ITEM_BLOOM_FILTER_CAPACITY") or None
+        spill_path = settings.get("DUPLICATE_ITEM_SPILL_PATH")
+        if capacity and spill_path:
+            raise ValueError(
+                "The DUPLICATE_ITEM_BLOOM_FILTER_CAPACITY and "
+                "DUPLICATE_ITEM_SPILL_PATH settings cannot be used together."
+            )
+        if capacity:
+            return _BloomFilter(
+                capacity,
+                settings.getfloat("DUPLICATE_ITEM_BLOOM_FILTER_ERROR_RATE", 0.001),
+            )
+        if spill_path:
+            return _SpillingFingerprintSet(
+                spill_path,
+                settings.getint("DUPLICATE_ITEM_SPILL_THRESHOLD", 1_000_000),
+            )
+        return _FingerprintSet()
+
+    def close_spider(self, spider):
+        self.fingerprints.close()
+
+    def get_fields_for_item(self, item, spider):
+        return self.fields_for_item.get(type(item), self.default_fields)
+
+    def get_item_name(self, item):
+        return item.__class__.__name__
+
+    def get_fingerprint(self, item, spider):
+        """Return the fingerprint of *item* as an integer, or ``None`` if all
+        the fingerprint fields of *item* are empty."""
+        fields = self.get_fields_for_item(item, spider)
+        if fields is None:
+            fingerprint = item.fingerprint(exclude=self.DEFAULT_EXCLUDE)
+        else:
+            fingerprint = item.fingerprint(include=fields)
+        if fingerprint == _EMPTY_FINGERPRINT:
+            return None
+        return int(fingerprint, 16) ^ _SALTS[type(item)]
+
+    def process_item(self, item, spider):
+        if not isinstance(item, Item):
+            return item
+        fingerprint = self.get_fingerprint(item, spider)
+        if fingerprint is None:
+            return item
+        item_name = self.get_item_name(item)
+        self.stats.inc_value("drop_duplicate_item/processed")
+        self.stats.inc_value(f"drop_duplicate_item/processed/{item_name}")
+        if self.fingerprints.add(fingerprint):
+            self.stats.inc_value("drop_duplicate_item/kept")
+            self.stats.inc_value(f"drop_duplicate_item/kept/{item_name}")
+            return item
+        self.stats.inc_value("drop_duplicate_item/dropped")
+        self.stats.inc_value(f"drop_duplicate_item/dropped/{item_name}")
+        raise InfoDropItem("This item is dropped since it is a duplicate:")
+
+
+class DropUnchangedItemPipeline:
+    """:ref:`Item pipeline <topics-item-pipeline>` that drops :ref:`items
+    <items>` whose watched fields have not changed since the last time that
+    an item with the same key was seen, e.g. in a previous crawl.
+
+    Items with the same item class and the same values in the fields that
+    the :setting:`CHANGED_ITEM_KEY_FIELDS` setting defines are considered
+    versions of the same item. For each item, a 64-bit hash of each field
+    that the :setting:`CHANGED_ITEM_FIELDS` setting defines is stored. Set
+    :setting:`CHANGED_ITEM_STATE_PATH` to keep those hashes across crawls.
+
+    If :setting:`CHANGED_ITEM_OUTPUT` is ``"diff"``, changed items are
+    replaced with a :class:`dict` that only contains the key fields and the
+    changed fields. Items seen for the first time count as changed in every
+    watched field.
+
+    Items whose key fields are all empty are never dropped, and objects that
+    are not :ref:`items <items>` are returned unchanged.
+
+    .. setting:: CHANGED_ITEM_FIELDS
+
+    CHANGED_ITEM_FIELDS
+    -------------------
+
+    Default: ``{"default": None}``
+
+    Allows defining, for each item class, the fields to watch for changes,
+    and the fields to watch for any other item class.
+
+    Nested fields can be defined with dot-separated paths (e.g.
+    ``"aggregateRating.ratingValue"``). ``None`` means every field of the
+    item class, ignoring ``metadata.dateDownloaded``.
+
+    Item classes can be defined using either an import path of the item
+    class or directly using the item class itself.
+
+    For example:
+
+    .. code-block:: python
+
+        CHANGED_ITEM_FIELDS = {
+            "zyte_common_items.Product": [
+                "price",
+                "regularPrice",
+                "availability",
+                "variants",
+            ],
+        }
+
+    .. setting:: CHANGED_ITEM_KEY_FIELDS
+
+    CHANGED_ITEM_KEY_FIELDS
+    -----------------------
+
+    Default: ``{"default": ["url"]}``
+
+    Allows defining, for each item class, the fields that identify an item,
+    and the fields to use for any other item class, in the same format as
+    :setting:`CHANGED_ITEM_FIELDS`.
+
+    .. setting:: CHANGED_ITEM_OUTPUT
+
+    CHANGED_ITEM_OUTPUT
+    -------------------
+
+    Default: ``"item"``
+
+    Output for changed items: ``"item"`` to keep the whole item, or
+    ``"diff"`` to replace it with a :class:`dict` with the following keys:
+
+    -   ``"key"``: the key fields of the item, e.g.
+        ``{"url": "https://example.com/product"}``.
+
+    -   ``"changed"``: a sorted list of the watched fields that changed.
+
+    -   ``"values"``: the new values of the changed fields, in the format of
+        :meth:`ZyteItemAdapter.asdict()
+        <zyte_common_items.ZyteItemAdapter.asdict>`. Changed fields that
+        are now empty are missing.
+
+    .. setting:: CHANGED_ITEM_STATE_PATH
+
+    CHANGED_ITEM_STATE_PATH
+    -----------------------
+
+    Default: ``None``
+
+    If set, path to an SQLite database where field hashes are stored. The
+    database is not removed when the spider closes, so that the next crawl
+    only outputs items that changed since the previous crawl.
+    """
+
+    DEFAULT_FIELDS = None
+    DEFAULT_KEY_FIELDS = ("url",)
+    DEFAULT_EXCLUDE = ("metadata.dateDownloaded",)
+    OUTPUTS = ("item", "diff")
+
+    def __init__(self, crawler):
+        settings = crawler.spider.settings
+        self.stats = crawler.stats
+        self.fields_for_item, self.default_fields = self._load_item_cls_setting(
+            settings, "CHANGED_ITEM_FIELDS", self.DEFAULT_FIELDS
+        )
+        self.key_fields_for_item, self.default_key_fields = self._load_item_cls_setting(
+            settings, "CHANGED_ITEM_KEY_FIELDS", self.DEFAULT_KEY_FIELDS
+        )
+        self.output = settings.get("CHANGED_ITEM_OUTPUT", "item")
+        if self.output not in self.OUTPUTS:
+            raise ValueError(
+                f"Expected the CHANGED_ITEM_OUTPUT setting to be one of "
+                f"{self.OUTPUTS}, got {self.output!r}."
+            )
+        self._watched_fields = {}
+        self.state = _FieldHashStore(settings.get("CHANGED_ITEM_STATE_PATH"))
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    @staticmethod
+    def _load_item_cls_setting(settings, name, default):
+        from scrapy.utils.misc import load_object
+
+        values = deepcopy(settings.get(name, {}))
+        default = values.pop("default", default)
+        values_for_item = {
+            (load_object(item) if isinstance(item, str) else item): value
+            for item, value in values.items()
+        }
+        return values_for_item, default
+
+    def close_spider(self, spider):
+        self.state.close()
+
+    def get_item_name(self, item):
+        return item.__class__.__name__
+
+    def get_fields_for_item(self, item, spider):
+        """Return the sorted watched fields of *item*, and whether the
+        default exclusions apply."""
+        item_cls = type(item)
+        try:
+            return self._watched_fields[item_cls]
+        except KeyError:
+            pass
+        fields = self.fields_for_item.get(item_cls, self.default_fields)
+        if fields is None:
+            watched = (tuple(sorted(f.name for f in attrs.fields(item_cls))), True)
+        else:
+            watched = (tuple(sorted(fields)), False)
+        self._watched_fields[item_cls] = watched
+        return watched
+
+    def get_key_fields_for_item(self, item, spider):
+        return self.key_fields_for_item.get(type(item), self.default_key_fields)
+
+    def get_key(self, item, spider):
+        """Return the key of *item* as an integer, or ``None`` if all the
+        key fields of *item* are empty."""
+        fingerprint = item.fingerprint(
+            include=self.get_key_fields_for_item(item, spider)
+        )
+        if fingerprint == _EMPTY_FINGERPRINT:
+            return None
+        return int(fingerprint, 16) ^ _SALTS[type(item)]
+
+    def get_field_hashes(self, item, spider):
+        """Return the concatenated 64-bit hashes of the watched fields of
+        *item*, preceded by a hash of the watched field names."""
+        fields, use_exclude = self.get_fields_for_item(item, spider)
+        exclude = self.DEFAULT_EXCLUDE if use_exclude else None
+        parts = [sha1("\0".join(fields).encode()).digest()[:8]]
+        for field in fields:
+            fingerprint = item.fingerprint(include=field, exclude=exclude)
+            parts.append(bytes.fromhex(fingerprint)[:8])
+        return b"".join(parts)
+
+    def _get_changed_fields(self, fields, old_hashes, new_hashes):
+        if old_hashes is None or old_hashes[:8] != new_hashes[:8]:
+            return list(fields)
+        changed = []
+        for index, field in enumerate(fields, start=1):
+            start, end = index * 8, (index + 1) * 8
+            if old_hashes[start:end] != new_hashes[start:end]:
+                changed.append(field)
+        return changed
+
+    def process_item(self, item, spider):
+        if not isinstance(item, Item):
+            return item
+        key = self.get_key(item, spider)
+        if key is None:
+            return item
+        item_name = self.get_item_name(item)
+        self.stats.inc_value("drop_unchanged_item/processed")
+        self.stats.inc_value(f"drop_unchanged_item/processed/{item_name}")
+        hashes = self.get_field_hashes(item, spider)
+        old_hashes = self.state.get(key)
+        if old_hashes == hashes:
+            self.stats.inc_value("drop_unchanged_item/dropped")
+            self.stats.inc_value(f"drop_unchanged_item/dropped/{item_name}")
+            raise InfoDropItem("This item is dropped since it has not changed:")
+        self.state.set(key, hashes)
+        self.stats.inc_value("drop_unchanged_item/kept")
+        self.stats.inc_value(f"drop_unchanged_item/kept/{item_name}")
+        if self.output == "item":
+            return item
+        fields = self.get_fields_for_item(item, spider)[0]
+        changed = self._get_changed_fields(fields, old_hashes, hashes)
+        adapter = ZyteItemAdapter(item)
+        return {
+            "key": adapter.asdict(fields=self.get_key_fields_for_item(item, spider)),
+            "changed": changed,
+            "values": adapter.asdict(fields=changed),
+        }
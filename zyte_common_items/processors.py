@@ -3,11 +3,12 @@ from functools import wraps
 from numbers import Real
 from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 
+import attrs
 from clear_html import clean_node, cleaned_node_to_html, cleaned_node_to_text
 from lxml.html import HtmlElement
 from parsel import Selector, SelectorList
 from price_parser import Price
-from web_poet.mixins import ResponseShortcutsMixin
+from web_poet.page_inputs.url import RequestUrl, ResponseUrl
 from zyte_parsers import Breadcrumb as zp_Breadcrumb
 from zyte_parsers import Gtin as zp_Gtin
 from zyte_parsers import (
@@ -30,12 +31,11 @@ from .components import (
     Request,
 )
 from .converters import MetadataCaster, to_probability_request_list
+from .urls import get_url_resolver
 
 
 def _get_base_url(page: Any) -> Optional[str]:
-    if isinstance(page, ResponseShortcutsMixin):
-        return page.base_url
-    return getattr(page, "url", None)
+    return get_url_resolver(page).base_url
 
 
 def _handle_selectorlist(value: Any) -> Any:
@@ -369,24 +369,44 @@ def images_processor(value: Any, page: Any) -> Any:
     If the input is a string, it's used as a url for returning image object.
 
     If input is either an iterable of strings or mappings with "url" key, they are
-    used to populate image objects.
+    used to populate image objects. Mappings whose "url" value is not a string,
+    :class:`~web_poet.page_inputs.url.RequestUrl` or
+    :class:`~web_poet.page_inputs.url.ResponseUrl` are skipped.
+
+    Image URLs are resolved with the :func:`URL resolver
+    <zyte_common_items.urls.get_url_resolver>` of the page, so relative URLs
+    are made absolute, and images with the same resolved URL as a previous
+    image are removed.
 
     Other inputs are returned unchanged.
     """
+    resolve = get_url_resolver(page).resolve
 
     if isinstance(value, str):
-        return [Image(url=value)]
+        return [Image(url=resolve(value))]
 
     if isinstance(value, Iterable):
         results: List[Any] = []
+        seen = set()
         for item in value:
             if isinstance(item, Image):
-                results.append(item)
+                resolved = resolve(item.url)
+                if resolved != item.url:
+                    item = attrs.evolve(item, url=resolved)
             elif isinstance(item, Mapping):
-                if url := item.get("url"):
-                    results.append(Image(url=url))
+                url = item.get("url")
+                if isinstance(url, (RequestUrl, ResponseUrl)):
+                    url = str(url)
+                if not url or not isinstance(url, str):
+                    continue
+                item = Image(url=resolve(url))
             elif isinstance(item, str):
-                results.append(Image(url=item))
+                item = Image(url=resolve(item))
+            else:
+                continue
+            if item.url not in seen:
+                seen.add(item.url)
+                results.append(item)
 
         return results
 
@@ -0,0 +1,310 @@
+"""Synthetic Zyte API data for tests and load tests.
+
+:func:`generate_item_data` builds the data of an item of any :ref:`item
+class <items>` from its field definitions. The data is deterministic, i.e.
+the same for the same item class and URL, and valid, i.e. it can be read
+with :meth:`~zyte_common_items.Item.from_dict` and passes
+:func:`~zyte_common_items.validation.validate`:
+
+>>> from zyte_common_items import Product
+>>> from zyte_common_items.testing import generate_item_data
+>>> url, sizes = "https://example.com/a", {"variants": 3}
+>>> data = generate_item_data(Product, url=url, sizes=sizes)
+>>> data["url"], len(data["variants"]), len(data["images"])
+('https://example.com/a', 3, 2)
+>>> data == generate_item_data(Product, url=url, sizes=sizes)
+True
+
+:func:`fake_zyte_api_response` builds a whole Zyte API response for a Zyte
+API request, and :class:`FakeZyteAPIServer` serves those responses over HTTP
+on a local port, e.g. to point scrapy-zyte-api to it with its
+``ZYTE_API_URL`` setting instead of paying for Zyte API requests.
+"""
+
+import json
+import random
+from base64 import b64encode
+from hashlib import sha1
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+from urllib.parse import urlsplit
+
+import attrs
+
+from ._class_cache import _ClassCache
+from .base import _UNION_ORIGINS, _get_import_path, is_data_container
+from .components import Gtin
+from .envelope import get_item_types
+from .validation import _AVAILABILITY_VALUES, _DATE_FIELDS, _PRICE_FIELDS, _URL_FIELDS
+
+DEFAULT_LIST_SIZE = 2
+"""Default number of values of list fields, e.g. images or product
+variants."""
+
+# Nested items deeper than this only get their required fields.
+_MAX_DEPTH = 3
+_DATE = "2024-01-01T00:00:00Z"
+_HTML = "<!DOCTYPE html><html><body><h1>{url}</h1></body></html>"
+
+# (field name, annotation, whether it is a list, whether it is required)
+_GeneratedField = Tuple[str, Any, bool, bool]
+
+
+def _compute_plan(item_cls: Any) -> Tuple[_GeneratedField, ...]:
+    hints = get_type_hints(item_cls)
+    fields = []
+    for field in attrs.fields(item_cls):
+        annotation = hints.get(field.name, Any)
+        if get_origin(annotation) in _UNION_ORIGINS:
+            args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            annotation = args[0] if len(args) == 1 else Any
+        is_list = get_origin(annotation) is list
+        if is_list:
+            annotation = (get_args(annotation) or (Any,))[0]
+        required = field.default is attrs.NOTHING
+        fields.append((field.name, annotation, is_list, required))
+    return tuple(fields)
+
+
+# Caches the fields that generate_item_data() fills for each item class.
+_PLANS: _ClassCache[Tuple[_GeneratedField, ...]] = _ClassCache(_compute_plan)
+
+
+def _generate_gtin(rng: random.Random) -> Dict[str, str]:
+    """Return data for a :class:`~zyte_common_items.Gtin` with a random gtin13
+    value and its check digit."""
+    digits = [rng.randrange(10) for _ in range(12)]
+    weighted = sum(digits[-1::-2]) * 3 + sum(digits[-2::-2])
+    value = "".join(map(str, digits)) + str(-weighted % 10)
+    return {"type": "gtin13", "value": value}
+
+
+def _generate_value(
+    name: str,
+    annotation: Any,
+    rng: random.Random,
+    base_url: str,
+    sizes: Mapping[str, int],
+    depth: int,
+) -> Any:
+    if annotation is Gtin:
+        return _generate_gtin(rng)
+    if isinstance(annotation, type) and is_data_container(annotation):
+        return _generate(annotation, rng, base_url, sizes, depth + 1)
+    if isinstance(annotation, type) and issubclass(annotation, dict):
+        return annotation()
+    if annotation is str:
+        if name in _URL_FIELDS or name.endswith("Url"):
+            return f"{base_url}/{name.lower()}/{rng.randrange(10**6)}"
+        if name in _DATE_FIELDS:
+            return _DATE
+        if name in _PRICE_FIELDS:
+            return f"{rng.randrange(100, 100_000) / 100:.2f}"
+        if name == "availability":
+            return rng.choice(sorted(_AVAILABILITY_VALUES))
+        if name == "currency":
+            return "USD"
+        return f"{name} {rng.randrange(10**6)}"
+    if annotation is float:
+        if name == "probability":
+            return round(rng.uniform(0.5, 1.0), 3)
+        return round(rng.uniform(0.0, 100.0), 2)
+    if annotation is bool:
+        return rng.random() < 0.5
+    if annotation is int:
+        return rng.randrange(1, 1000)
+    return None
+
+
+def _generate(
+    item_cls: Any,
+    rng: random.Random,
+    base_url: str,
+    sizes: Mapping[str, int],
+    depth: int,
+) -> Dict[str, Any]:
+    data: Dict[str, Any] = {}
+    for name, annotation, is_list, required in _PLANS[item_cls]:
+        if depth >= _MAX_DEPTH and not required:
+            continue
+        if is_list:
+            values: List[Any] = []
+            for _ in range(sizes.get(name, DEFAULT_LIST_SIZE)):
+                value = _generate_value(name, annotation, rng, base_url, sizes, depth)
+                if value is not None:
+                    values.append(value)
+            if values or required:
+                data[name] = values
+            continue
+        value = _generate_value(name, annotation, rng, base_url, sizes, depth)
+        if value is not None:
+            data[name] = value
+    return data
+
+
+def generate_item_data(
+    item_cls: type,
+    *,
+    url: str = "https://example.com",
+    sizes: Optional[Mapping[str, int]] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Return synthetic data for an item of *item_cls* with *url* as URL.
+
+    *sizes* maps field names to the number of values of list fields with
+    that name, at any depth, e.g. ``{"variants": 10, "products": 50}``.
+    Other list fields get :data:`DEFAULT_LIST_SIZE` values.
+
+    Other URLs in the data, e.g. those of product list entries, are URLs of
+    the same domain as *url*.
+
+    The data is generated from a pseudo-random number generator seeded with
+    *seed*, by default a hash of the item class and *url*.
+    """
+    if not (isinstance(item_cls, type) and is_data_container(item_cls)):
+        raise ValueError(f"Expected an item class, got {item_cls!r}.")
+    if seed is None:
+        key = f"{_get_import_path(item_cls)}\0{url}".encode()
+        seed = int(sha1(key).hexdigest()[:16], 16)
+    parts = urlsplit(url)
+    base_url = f"{parts.scheme}://{parts.netloc}"
+    data = _generate(item_cls, random.Random(seed), base_url, sizes or {}, 0)
+    if any(name == "url" for name, *_ in _PLANS[item_cls]):
+        data["url"] = url
+    return data
+
+
+def fake_zyte_api_response(
+    request: Mapping[str, Any], *, sizes: Optional[Mapping[str, int]] = None
+) -> Dict[str, Any]:
+    """Return a Zyte API response for the *request* Zyte API request
+    parameters.
+
+    The response has an item generated with :func:`generate_item_data` for
+    each requested item type that
+    :func:`~zyte_common_items.envelope.from_envelope` supports, e.g.
+    ``product``, and a minimal HTML document for ``browserHtml`` and
+    ``httpResponseBody`` requests.
+    """
+    url = request.get("url")
+    if not isinstance(url, str) or not url:
+        raise ValueError(f"Expected a URL as the url request field, got {url!r}.")
+    response: Dict[str, Any] = {"url": url, "statusCode": 200}
+    html = _HTML.format(url=url)
+    if request.get("browserHtml"):
+        response["browserHtml"] = html
+    if request.get("httpResponseBody"):
+        response["httpResponseBody"] = b64encode(html.encode()).decode()
+    for name, item_cls in get_item_types().items():
+        if request.get(name):
+            response[name] = generate_item_data(item_cls, url=url, sizes=sizes)
+    return response
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep connections alive, as HTTP clients like Scrapy expect.
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def do_POST(self) -> None:
+        size = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(size))
+            if not isinstance(request, dict):
+                raise ValueError(f"Expected a JSON object, got {request!r}.")
+            response = fake_zyte_api_response(request, sizes=self.server.sizes)
+        except ValueError as exception:
+            status = 400
+            response = {
+                "type": "/request/invalid",
+                "title": "Invalid Request",
+                "status": status,
+                "detail": str(exception),
+            }
+        else:
+            status = 200
+        self.server.request_count += 1
+        body = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+    sizes: Optional[Mapping[str, int]] = None
+    request_count = 0
+
+
+class FakeZyteAPIServer:
+    """Local HTTP server that answers Zyte API requests with
+    :func:`fake_zyte_api_response`.
+
+    Use it as a context manager, or call :meth:`start` and :meth:`stop`:
+
+    .. code-block:: python
+
+        with FakeZyteAPIServer(sizes={"variants": 10}) as server:
+            settings["ZYTE_API_URL"] = server.url
+            ...
+
+    *sizes* is passed to :func:`fake_zyte_api_response`. *port* defaults to
+    a free port.
+    """
+
+    def __init__(
+        self,
+        *,
+        sizes: Optional[Mapping[str, int]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self._server = _Server((host, port), _Handler)
+        self._server.sizes = sizes
+        self._thread: Optional[Thread] = None
+
+        self.url: str = f"http://{host}:{self._server.server_port}/v1/"
+        """Base URL of the server API. Requests are accepted on any path, e.g.
+        on ``extract``, the Zyte API endpoint."""
+
+    @property
+    def request_count(self) -> int:
+        """Number of requests answered so far."""
+        return self._server.request_count
+
+    def start(self) -> None:
+        """Start serving requests in a background thread."""
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving requests and close the server socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeZyteAPIServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
@@ -0,0 +1,187 @@
+"""Opt-in instrumentation that measures how long each field and each field
+processor of :ref:`page objects <page-objects>` takes.
+
+Call :func:`enable_field_timing` to start collecting timings, and read them
+from the returned :class:`FieldTimings` object. When using Scrapy, you can
+instead enable the :setting:`ZYTE_COMMON_ITEMS_FIELD_TIMING` setting of the
+:ref:`add-on <scrapy-config>` to get timings as Scrapy stats.
+
+Timings are only collected for page object classes that inherit from the
+page object classes of zyte-common-items and do not override ``to_item()``,
+and only for fields that are computed, e.g. not for the fields of :ref:`auto
+page object classes <auto>` that are taken as is from their input item. No
+timings are collected while :func:`processor offloading
+<zyte_common_items.offload.enable_processor_offloading>` is enabled. When
+disabled, the only overhead is a global variable check per ``to_item()``
+call.
+"""
+
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from web_poet.utils import ensure_awaitable
+
+from .fields import (
+    _call_processor,
+    _get_field_method,
+    _get_field_processors,
+    _item_from_fields,
+)
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.0001, 0.001, 0.01, 0.1, 1.0)
+"""Default upper bounds, in seconds, of the histogram buckets of
+:class:`FieldTimings`."""
+
+_timings: Optional["FieldTimings"] = None
+
+
+class FieldTiming:
+    """Aggregated wall times of a field or field processor."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._buckets = buckets
+
+        self.count: int = 0
+        """Number of recorded calls."""
+
+        self.total: float = 0.0
+        """Total wall time, in seconds."""
+
+        self.max: float = 0.0
+        """Maximum wall time, in seconds."""
+
+        self.histogram: List[int] = [0] * (len(buckets) + 1)
+        """Number of calls per histogram bucket. The last bucket counts calls
+        slower than the upper bound of every other bucket."""
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram[bisect_left(self._buckets, seconds)] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        histogram = {
+            f"<={bound}": count for bound, count in zip(self._buckets, self.histogram)
+        }
+        histogram[f">{self._buckets[-1]}"] = self.histogram[-1]
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "histogram": histogram,
+        }
+
+
+class FieldTimings:
+    """Collection of :class:`FieldTiming` objects per page object class.
+
+    Field timings use the field name as key (e.g. ``"price"``), and field
+    processor timings use the field name and the processor name separated by
+    a colon (e.g. ``"price:price_processor"``).
+
+    Field timings include the time of their processors, and the time of any
+    other field that they read.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._timings: Dict[str, Dict[str, FieldTiming]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, page_cls: type, key: str, seconds: float) -> None:
+        """Record that *key* took *seconds* for a page of class
+        *page_cls*."""
+        path = f"{page_cls.__module__}.{page_cls.__qualname__}"
+        with self._lock:
+            page_timings = self._timings.setdefault(path, {})
+            if key not in page_timings:
+                page_timings[key] = FieldTiming(self.buckets)
+            page_timings[key].record(seconds)
+
+    def get(self, page_cls: type) -> Dict[str, FieldTiming]:
+        """Return the timings recorded for *page_cls*."""
+        path = f"{page_cls.__module__}.{page_cls.__qualname__}"
+        with self._lock:
+            return dict(self._timings.get(path, {}))
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Return all timings as nested dicts, with the import path of page
+        object classes as top-level keys."""
+        with self._lock:
+            return {
+                path: {key: timing.to_dict() for key, timing in timings.items()}
+                for path, timings in self._timings.items()
+            }
+
+    def to_stats(self, prefix: str = "field_timing") -> Dict[str, Any]:
+        """Return all timings as a flat dict suitable for Scrapy stats."""
+        stats = {}
+        for path, timings in self.to_dict().items():
+            for key, timing in timings.items():
+                for name, value in timing.items():
+                    stats[f"{prefix}/{path}/{key}/{name}"] = value
+        return stats
+
+
+def enable_field_timing(timings: Optional[FieldTimings] = None) -> FieldTimings:
+    """Start recording field timings into *timings*, or into a new
+    :class:`FieldTimings` object, and return it."""
+    global _timings
+    _timings = timings if timings is not None else FieldTimings()
+    return _timings
+
+
+def disable_field_timing() -> Optional[FieldTimings]:
+    """Stop recording field timings, and return the :class:`FieldTimings`
+    object where they were recorded, if any."""
+    global _timings
+    timings, _timings = _timings, None
+    return timings
+
+
+def get_field_timings() -> Optional[FieldTimings]:
+    """Return the :class:`FieldTimings` object where field timings are being
+    recorded, or ``None`` if field timing is disabled."""
+    return _timings
+
+
+async def _timed_field(page: Any, name: str, timings: FieldTimings) -> Any:
+    page_cls = type(page)
+    method = _get_field_method(page_cls, name)
+    if method is None:
+        return await ensure_awaitable(getattr(page, name))
+    value = await ensure_awaitable(method(page))
+    for processor in _get_field_processors(page_cls, name):
+        processor_name = getattr(processor, "__name__", repr(processor))
+        start = perf_counter()
+        value = _call_processor(processor, value, page)
+        timings.record(page_cls, f"{name}:{processor_name}", perf_counter() - start)
+    return value
+
+
+async def _timed_to_item(page: Any, timings: FieldTimings) -> Any:
+    """Equivalent of :func:`web_poet.fields.item_from_fields` that records
+    field and field processor timings into *timings*."""
+
+    async def get_values(page: Any, names: List[str]) -> Dict[str, Any]:
+        return await _timed_fields(page, names, timings)
+
+    return await _item_from_fields(page, get_values)
+
+
+async def _timed_fields(
+    page: Any, names: Iterable[str], timings: FieldTimings
+) -> Dict[str, Any]:
+    """Return the values of the *names* fields of *page*, recording their
+    timings into *timings*."""
+    page_cls = type(page)
+    values = {}
+    for name in names:
+        start = perf_counter()
+        values[name] = await _timed_field(page, name, timings)
+        timings.record(page_cls, name, perf_counter() - start)
+    return values
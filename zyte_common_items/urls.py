@@ -0,0 +1,156 @@
+"""Page-scoped resolution of the URLs that :ref:`field processors
+<processors>` output.
+
+:func:`get_url_resolver` returns the :class:`URLResolver` of a page object,
+created the first time that it is needed and reused by every processor of
+the same page object afterwards, so that the base URL of the page is only
+determined once and each distinct URL is only resolved once:
+
+>>> from zyte_common_items.urls import URLResolver
+>>> resolver = URLResolver("https://example.com/a/b")
+>>> resolver.resolve("../c.png#top")
+'https://example.com/c.png#top'
+
+Call :func:`enable_url_canonicalization` to also :func:`canonicalize
+<canonicalize_url>` every resolved URL, e.g. so that
+:func:`~zyte_common_items.processors.images_processor` detects duplicate
+images whose URLs only differ in their fragment, in the order of their query
+parameters, or in their tracking parameters.
+"""
+
+from typing import Any, Collection, Dict, Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from w3lib.url import canonicalize_url as _w3lib_canonicalize_url
+from web_poet.mixins import ResponseShortcutsMixin
+
+DEFAULT_TRACKING_PARAMETERS = frozenset(
+    {
+        "_ga",
+        "dclid",
+        "fbclid",
+        "gbraid",
+        "gclid",
+        "gclsrc",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "msclkid",
+        "wbraid",
+        "yclid",
+    }
+)
+"""Query parameters that :func:`canonicalize_url` removes by default, in
+addition to those starting with ``utm_``."""
+
+_canonicalize = False
+
+
+def canonicalize_url(
+    url: str, *, remove_parameters: Collection[str] = DEFAULT_TRACKING_PARAMETERS
+) -> str:
+    """Return a canonical form of *url*.
+
+    The fragment is removed, query parameters are sorted, and the
+    *remove_parameters* query parameters, as well as those starting with
+    ``utm_`` if *remove_parameters* is :data:`DEFAULT_TRACKING_PARAMETERS`,
+    are removed. Other normalization, e.g. percent-encoding, works as in
+    w3lib's ``canonicalize_url``:
+
+    >>> from zyte_common_items.urls import canonicalize_url
+    >>> canonicalize_url("https://example.com/a?b=2&utm_source=x&a=1#top")
+    'https://example.com/a?a=1&b=2'
+    """
+    url = _w3lib_canonicalize_url(url)
+    if not remove_parameters:
+        return url
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    strip_utm = remove_parameters is DEFAULT_TRACKING_PARAMETERS
+    query = "&".join(
+        parameter
+        for parameter in parts.query.split("&")
+        if (name := parameter.partition("=")[0]) not in remove_parameters
+        and not (strip_utm and name.startswith("utm_"))
+    )
+    return urlunsplit(parts._replace(query=query))
+
+
+class URLResolver:
+    """Resolves URLs relative to *base_url*, caching the result of each
+    distinct URL.
+
+    If *canonicalize* is ``True``, resolved URLs are also passed through
+    :func:`canonicalize_url`.
+
+    If *base_url* is ``None``, URLs are only stripped of surrounding
+    whitespace and, if enabled, canonicalized.
+    """
+
+    __slots__ = ("_base_url", "_cache", "_canonicalize")
+
+    def __init__(self, base_url: Optional[str], *, canonicalize: bool = False):
+        self._base_url = base_url
+        self._canonicalize = canonicalize
+        self._cache: Dict[str, str] = {}
+
+    @property
+    def base_url(self) -> Optional[str]:
+        """Base URL that URLs are resolved against."""
+        return self._base_url
+
+    def resolve(self, url: str) -> str:
+        """Return *url* as an absolute URL."""
+        try:
+            return self._cache[url]
+        except KeyError:
+            pass
+        resolved = url.strip()
+        if self._base_url is not None:
+            resolved = urljoin(self._base_url, resolved)
+        if self._canonicalize:
+            resolved = canonicalize_url(resolved)
+        self._cache[url] = resolved
+        return resolved
+
+
+def _get_page_base_url(page: Any) -> Optional[str]:
+    if isinstance(page, ResponseShortcutsMixin):
+        return page.base_url
+    url = getattr(page, "url", None)
+    return None if url is None else str(url)
+
+
+def get_url_resolver(page: Any) -> URLResolver:
+    """Return the :class:`URLResolver` of *page*, a page object, which
+    resolves URLs against the base URL of its response, if it has one, or
+    else against its URL.
+
+    The resolver is stored in *page* and reused by later calls. For page
+    object classes whose instances do not support new attributes, a new
+    resolver is returned every time.
+    """
+    resolver = getattr(page, "_url_resolver", None)
+    if isinstance(resolver, URLResolver):
+        return resolver
+    resolver = URLResolver(_get_page_base_url(page), canonicalize=_canonicalize)
+    try:
+        page._url_resolver = resolver
+    except AttributeError:  # Slotted or None.
+        pass
+    return resolver
+
+
+def enable_url_canonicalization() -> None:
+    """Make the resolvers that :func:`get_url_resolver` creates from then on
+    canonicalize URLs with :func:`canonicalize_url`."""
+    global _canonicalize
+    _canonicalize = True
+
+
+def disable_url_canonicalization() -> None:
+    """Stop canonicalizing URLs in resolvers that :func:`get_url_resolver`
+    creates from then on."""
+    global _canonicalize
+    _canonicalize = False
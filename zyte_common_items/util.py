@@ -1,17 +1,19 @@
 import warnings
-from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple, Type, TypeVar
 from warnings import warn
-from weakref import WeakKeyDictionary
 
 import attrs
 
 # backwards compatibility imports
+from ._class_cache import _ClassCache
 from ._dateutils import format_datetime as format_datetime  # noqa: F401
 from .converters import MetadataCaster  # noqa: F401
 from .converters import url_to_str as url_to_str  # noqa: F401
 
 # Caches the attribute names for attr.s classes.
-_CLASS_ATTRS: WeakKeyDictionary = WeakKeyDictionary()
+_CLASS_ATTRS: _ClassCache[FrozenSet[str]] = _ClassCache(
+    lambda cls: frozenset(field.name for field in attrs.fields(cls))
+)
 
 
 def split_in_unknown_and_known_fields(
@@ -25,9 +27,8 @@ def split_in_unknown_and_known_fields(
     data = data or {}
     if not attrs.has(item_cls):
         raise ValueError(f"The cls {item_cls} is not attrs class")
-    if item_cls not in _CLASS_ATTRS:
-        _CLASS_ATTRS[item_cls] = {field.name for field in attrs.fields(item_cls)}
-    unknown, known = split_dict(data, lambda k: k in _CLASS_ATTRS[item_cls])
+    names = _CLASS_ATTRS[item_cls]
+    unknown, known = split_dict(data, names.__contains__)
     return unknown, known
 
 
@@ -0,0 +1,316 @@
+"""Validation of :ref:`items <items>` that reports issues in
+``metadata.validationMessages``.
+
+The following issues are reported:
+
+-   Required fields that are ``None`` or an empty string.
+
+-   URL fields, e.g. :attr:`Product.url <zyte_common_items.Product.url>` or
+    :attr:`Product.canonicalUrl <zyte_common_items.Product.canonicalUrl>`,
+    that are not absolute HTTP(S) URLs. `Data URIs`_ are reported with a
+    specific message, since they are not allowed in media URLs, e.g.
+    :attr:`Image.url <zyte_common_items.Image.url>`, either.
+
+-   Date fields, e.g. :attr:`Article.datePublished
+    <zyte_common_items.Article.datePublished>` or ``metadata.dateDownloaded``,
+    that are not in ISO 8601 format, i.e. ``YYYY-MM-DDThh:mm:ss``, optionally
+    followed by ``Z`` or a UTC offset.
+
+-   :attr:`Product.availability <zyte_common_items.Product.availability>`
+    values other than ``"InStock"`` and ``"OutOfStock"``.
+
+-   ``probability`` values outside the ``[0, 1]`` range.
+
+-   :class:`~zyte_common_items.Gtin` values with an unknown type, or with a
+    wrong length or check digit for their type.
+
+-   Price fields, e.g. :attr:`Product.price <zyte_common_items.Product.price>`,
+    that are not a non-negative decimal number with ``.`` as decimal
+    separator, e.g. ``"1234.56"``.
+
+The checks to run for each item class are determined once from its field
+definitions, and reused afterwards.
+
+.. _Data URIs: https://en.wikipedia.org/wiki/Data_URI_scheme
+"""
+
+import re
+import types
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+from urllib.parse import urlsplit
+
+import attrs
+
+from ._class_cache import _ClassCache
+from .base import Item, _extend_trail, _Trail, is_data_container
+from .components import Gtin
+from .items import SearchRequestTemplate
+
+_Messages = Dict[str, List[str]]
+_Check = Callable[[Any], Optional[str]]
+# (field name, whether the field is required, checks for the field value or
+# for each element of a list field, whether the field is a list, whether the
+# field holds items)
+_Rule = Tuple[str, bool, Tuple[_Check, ...], bool, bool]
+
+_UNION_ORIGINS = (Union, types.UnionType)
+_AVAILABILITY_VALUES = frozenset({"InStock", "OutOfStock"})
+_DATE_FIELDS = frozenset(
+    {
+        "dateAccountCreated",
+        "dateDownloaded",
+        "dateModified",
+        "datePublished",
+        "jobStartDate",
+        "validThrough",
+    }
+)
+_DATE_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?\Z"
+)
+_PRICE_FIELDS = frozenset({"price", "regularPrice"})
+_PRICE_RE = re.compile(r"\d+(?:\.\d+)?\Z")
+_URL_FIELDS = frozenset({"url", "website"})
+# Classes whose fields do not hold extracted data, and are not validated.
+_SKIPPED_CLASSES = (SearchRequestTemplate,)
+
+
+def _check_url(value: Any) -> Optional[str]:
+    if isinstance(value, str) and value[:5].lower() == "data:":
+        return f"Expected an HTTP(S) URL, got a data URI ({value[:32]!r}...)."
+    try:
+        parts = urlsplit(value)
+    except (TypeError, ValueError):
+        parts = None
+    if parts is None or parts.scheme not in {"http", "https"} or not parts.netloc:
+        return f"Expected an absolute HTTP(S) URL, got {value!r}."
+    return None
+
+
+def _check_date(value: Any) -> Optional[str]:
+    if isinstance(value, str) and _DATE_RE.match(value):
+        try:
+            datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+        else:
+            return None
+    return f"Expected an ISO 8601 date and time, got {value!r}."
+
+
+def _check_availability(value: Any) -> Optional[str]:
+    if value in _AVAILABILITY_VALUES:
+        return None
+    expected = ", ".join(repr(value) for value in sorted(_AVAILABILITY_VALUES))
+    return f"Expected one of {expected}, got {value!r}."
+
+
+def _check_probability(value: Any) -> Optional[str]:
+    if (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and 0 <= value <= 1
+    ):
+        return None
+    return f"Expected a number from 0 to 1, got {value!r}."
+
+
+def _check_price(value: Any) -> Optional[str]:
+    if isinstance(value, str) and _PRICE_RE.match(value):
+        return None
+    return f"Expected a decimal number like '1234.56', got {value!r}."
+
+
+def _is_valid_ean(value: str) -> bool:
+    """Return ``True`` if the last digit of *value* is a valid GS1 check
+    digit.
+
+    >>> _is_valid_ean("9780201379624")
+    True
+    >>> _is_valid_ean("9780201379625")
+    False
+    """
+    digits = [int(digit) for digit in reversed(value)]
+    return (digits[0] + sum(3 * d for d in digits[1::2]) + sum(digits[2::2])) % 10 == 0
+
+
+def _is_valid_mod11(value: str) -> bool:
+    """Return ``True`` if the last character of *value*, a digit or ``X``,
+    is a valid ISBN-10 or ISSN check digit.
+
+    >>> _is_valid_mod11("0201379627"), _is_valid_mod11("0378-5954")
+    (True, False)
+    """
+    value = value.replace("-", "")
+    check = 10 if value[-1] in "xX" else int(value[-1])
+    weighted = sum(
+        weight * int(digit)
+        for weight, digit in zip(range(len(value), 1, -1), value[:-1])
+    )
+    return (weighted + check) % 11 == 0
+
+
+# Pattern and check digit validator of each Gtin.type value.
+_GTIN_FORMATS: Dict[str, Tuple[str, Callable[[str], bool]]] = {
+    "gtin8": (r"\d{8}", _is_valid_ean),
+    "gtin13": (r"\d{13}", _is_valid_ean),
+    "gtin14": (r"\d{14}", _is_valid_ean),
+    "isbn10": (r"\d{9}[\dXx]", _is_valid_mod11),
+    "isbn13": (r"97[89]\d{10}", _is_valid_ean),
+    "ismn": (r"9790\d{9}", _is_valid_ean),
+    "issn": (r"\d{4}-?\d{3}[\dXx]", _is_valid_mod11),
+    "upc": (r"\d{12}", _is_valid_ean),
+}
+
+
+def _check_gtin(gtin: Any) -> Optional[Tuple[str, str]]:
+    """Return the name of the invalid field of *gtin* and an issue
+    description, or ``None`` if *gtin* is valid."""
+    if gtin.type is None or gtin.type == "":
+        return None  # Reported as a missing required field.
+    gtin_format = _GTIN_FORMATS.get(gtin.type) if isinstance(gtin.type, str) else None
+    if gtin_format is None:
+        expected = ", ".join(repr(type) for type in sorted(_GTIN_FORMATS))
+        return "type", f"Expected one of {expected}, got {gtin.type!r}."
+    if not isinstance(gtin.value, str):
+        return None
+    pattern, is_valid = gtin_format
+    if not re.fullmatch(pattern, gtin.value):
+        return "value", f"{gtin.value!r} is not a valid {gtin.type} value."
+    if not is_valid(gtin.value):
+        return "value", f"{gtin.value!r} has an invalid {gtin.type} check digit."
+    return None
+
+
+def _get_checks(name: str, annotation: Any) -> Tuple[_Check, ...]:
+    if annotation is str:
+        if name in _URL_FIELDS or name.endswith("Url"):
+            return (_check_url,)
+        if name in _DATE_FIELDS:
+            return (_check_date,)
+        if name in _PRICE_FIELDS:
+            return (_check_price,)
+        if name == "availability":
+            return (_check_availability,)
+    elif annotation is float and name == "probability":
+        return (_check_probability,)
+    return ()
+
+
+def _compile(item_cls: Any) -> Tuple[_Rule, ...]:
+    if issubclass(item_cls, _SKIPPED_CLASSES):
+        return ()
+    rules = []
+    hints = get_type_hints(item_cls)
+    for field in attrs.fields(item_cls):
+        annotation = hints.get(field.name, Any)
+        if get_origin(annotation) in _UNION_ORIGINS:
+            args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            annotation = args[0] if len(args) == 1 else Any
+        is_list = get_origin(annotation) is list
+        if is_list:
+            annotation = (get_args(annotation) or (Any,))[0]
+        required = field.default is attrs.NOTHING
+        checks = _get_checks(field.name, annotation)
+        is_item = isinstance(annotation, type) and is_data_container(annotation)
+        if required or checks or is_item:
+            rules.append((field.name, required, checks, is_list, is_item))
+    return tuple(rules)
+
+
+# Caches the rules of each item class.
+_RULES: _ClassCache[Tuple[_Rule, ...]] = _ClassCache(_compile)
+
+
+def _get_rules(item_cls: type) -> Tuple[_Rule, ...]:
+    return _RULES[item_cls]
+
+
+def _add_message(messages: _Messages, trail: _Trail, message: str) -> None:
+    messages.setdefault(trail or "", []).append(message)
+
+
+def _collect_messages(item: Any, trail: _Trail, messages: _Messages) -> None:
+    if isinstance(item, Gtin):
+        issue = _check_gtin(item)
+        if issue is not None:
+            _add_message(messages, _extend_trail(trail, issue[0]), issue[1])
+    for name, required, checks, is_list, is_item in _get_rules(type(item)):
+        value = getattr(item, name)
+        field_trail = _extend_trail(trail, name)
+        if value is None or value == "":
+            if required:
+                _add_message(messages, field_trail, "Missing required field.")
+            continue
+        if is_list:
+            if not isinstance(value, list):
+                continue
+            values: Iterable[Tuple[_Trail, Any]] = (
+                (_extend_trail(field_trail, index), element)
+                for index, element in enumerate(value)
+            )
+        else:
+            values = ((field_trail, value),)
+        for value_trail, element in values:
+            if is_item and is_data_container(element):
+                _collect_messages(element, value_trail, messages)
+            for check in checks:
+                message = check(element)
+                if message is not None:
+                    _add_message(messages, value_trail, message)
+
+
+def get_validation_messages(item: Item) -> Dict[str, List[str]]:
+    """Return a dictionary that maps the path of each invalid field of
+    *item*, e.g. ``"brand.name"`` or ``"gtin[0].value"``, to a list of
+    issue descriptions.
+
+    >>> from zyte_common_items import Product
+    >>> get_validation_messages(Product(url="https://example.com", price="1,5"))
+    {'price': ["Expected a decimal number like '1234.56', got '1,5'."]}
+    """
+    messages: _Messages = {}
+    _collect_messages(item, None, messages)
+    return messages
+
+
+def validate(item: Item) -> Dict[str, List[str]]:
+    """Add the issues found in *item* to its ``metadata.validationMessages``
+    and return them.
+
+    See :func:`get_validation_messages`. Messages already in
+    ``metadata.validationMessages`` are kept. If *item* has no metadata,
+    issues are only returned.
+    """
+    messages = get_validation_messages(item)
+    metadata = getattr(item, "metadata", None)
+    if messages and hasattr(metadata, "validationMessages"):
+        assert metadata is not None
+        validation_messages = metadata.validationMessages
+        if validation_messages is None:
+            validation_messages = metadata.validationMessages = {}
+        for path, path_messages in messages.items():
+            existing = validation_messages.setdefault(path, [])
+            existing.extend(
+                message for message in path_messages if message not in existing
+            )
+    return messages
+
+
+def validate_items(items: Iterable[Item]) -> List[Dict[str, List[str]]]:
+    """Call :func:`validate` on every item of *items*, and return a list with
+    the issues found in each item."""
+    return [validate(item) for item in items]